@@ -0,0 +1,198 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import src.llm_client as llm_client
+from src.llm_client import CassetteBackend, FakeBackend, GeminiBackend, LLMClient
+from src.paper_parser import IncludeResolver, PaperParser
+from src.pipeline import PaperToProdPipeline
+from tests.replay_fixtures import pipeline_responder
+
+
+SAMPLES = [
+    "samples/lec21.tex",
+    "samples/tr804.tex",
+    "samples/second_paper_main-arxiv-010526.tex",
+]
+DEFAULT_CASSETTES = os.path.join("benchmarks", "cassettes")
+
+
+def make_backend(cassette_dir: str, mode: str, replay_latency: bool) -> CassetteBackend:
+    return CassetteBackend(
+        cassette_dir,
+        mode=mode,
+        backend=GeminiBackend() if mode != "replay" else None,
+        fallback=FakeBackend(responder=pipeline_responder) if mode == "replay" else None,
+        replay_latency=replay_latency,
+    )
+
+
+def measure_parse(path: str, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        parser = PaperParser(resolver=IncludeResolver())
+        start = time.perf_counter()
+        parsed = parser.parse(path)
+        samples.append(time.perf_counter() - start)
+
+    return {
+        "median_seconds": statistics.median(samples),
+        "min_seconds": min(samples),
+        "sections": len(parsed),
+        "chars": sum(len(section["text"]) for section in parsed.values()),
+    }
+
+
+def run_pipeline(path: str, workdir: str) -> PaperToProdPipeline:
+    pipeline = PaperToProdPipeline(
+        output_root=os.path.join(workdir, "codes"),
+        runs_dir=os.path.join(workdir, "runs"),
+        lineage_dir=os.path.join(workdir, "lineage"),
+        index_dir=os.path.join(workdir, "index"),
+    )
+    pipeline.run(path)
+    return pipeline
+
+
+def measure_run(path: str, repeat: int) -> dict:
+    totals, stages, prompts = [], {}, {}
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as workdir:
+            start = time.perf_counter()
+            pipeline = run_pipeline(path, workdir)
+            totals.append(time.perf_counter() - start)
+
+            for name, seconds in pipeline.last_run["stage_seconds"].items():
+                stages.setdefault(name, []).append(seconds)
+            with open(pipeline.last_run["telemetry_path"], encoding="utf-8") as f:
+                events = [json.loads(line) for line in f]
+
+    for event in events:
+        if event["cat"] == "llm":
+            stage = prompts.setdefault(event["parent"], {"calls": 0, "chars": 0, "tokens": 0})
+            stage["calls"] += 1
+            stage["chars"] += event["prompt_chars"]
+            stage["tokens"] += event["prompt_tokens"]
+
+    return {
+        "median_seconds": statistics.median(totals),
+        "stage_seconds": {name: statistics.median(values) for name, values in stages.items()},
+        "critical_path": pipeline.last_run["critical_path"]["path"],
+        "prompts": prompts,
+    }
+
+
+def measure_memory(path: str) -> dict:
+    with tempfile.TemporaryDirectory() as workdir:
+        tracemalloc.start()
+        try:
+            run_pipeline(path, workdir)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {"peak_bytes": peak}
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(papers: list, backend: CassetteBackend, repeat: int) -> dict:
+    llm_client.set_client(LLMClient(backend=backend))
+    try:
+        results = {}
+        for path in papers:
+            name = os.path.splitext(os.path.basename(path))[0]
+            results[name] = {
+                "parse": measure_parse(path, repeat),
+                "pipeline": measure_run(path, repeat),
+                "memory": measure_memory(path),
+            }
+    finally:
+        llm_client.set_client(None)
+
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+        "repeat": repeat,
+        "cassettes": {"hits": backend.hits, "misses": backend.misses, "recorded": backend.recorded},
+        "papers": results,
+    }
+
+
+def flatten(results: dict) -> dict:
+    metrics = {}
+    for name, paper in results["papers"].items():
+        metrics[f"{name}.parse"] = paper["parse"]["median_seconds"]
+        metrics[f"{name}.pipeline"] = paper["pipeline"]["median_seconds"]
+        metrics[f"{name}.peak_bytes"] = paper["memory"]["peak_bytes"]
+        for stage, seconds in paper["pipeline"]["stage_seconds"].items():
+            metrics[f"{name}.stage.{stage}"] = seconds
+        for stage, prompt in paper["pipeline"]["prompts"].items():
+            metrics[f"{name}.prompt_tokens.{stage}"] = prompt["tokens"]
+    return metrics
+
+
+def compare(baseline: dict, current: dict) -> list:
+    before, after = flatten(baseline), flatten(current)
+    lines = [f"{'metric':<56} {'before':>12} {'after':>12} {'change':>8}"]
+    for metric in sorted(set(before) & set(after)):
+        old, new = before[metric], after[metric]
+        change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+        lines.append(f"{metric:<56} {old:>12.4g} {new:>12.4g} {change:>8}")
+    return lines
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline against recorded LLM responses.")
+    parser.add_argument("papers", nargs="*", default=SAMPLES)
+    parser.add_argument("--cassettes", default=DEFAULT_CASSETTES, help="cassette directory")
+    parser.add_argument("--mode", choices=CassetteBackend.MODES, default="replay",
+                        help="replay recorded responses, or record them from Gemini")
+    parser.add_argument("--replay-latency", action="store_true",
+                        help="sleep for the recorded latency of each response")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=None, help="results JSON path")
+    parser.add_argument("--compare", default=None, help="baseline results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    backend = make_backend(args.cassettes, args.mode, args.replay_latency)
+    results = run(args.papers, backend, args.repeat)
+
+    output = args.output or os.path.join("benchmarks", "results", f"{results['commit'] or 'local'}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    for name, paper in results["papers"].items():
+        print(
+            f"{name:<40} parse {paper['parse']['median_seconds'] * 1000:8.2f}ms  "
+            f"pipeline {paper['pipeline']['median_seconds'] * 1000:8.2f}ms  "
+            f"peak {paper['memory']['peak_bytes'] / 1e6:7.2f}MB"
+        )
+    cassettes = results["cassettes"]
+    print(f"cassettes: {cassettes['hits']} replayed, {cassettes['misses']} missing, "
+          f"{cassettes['recorded']} recorded")
+    print(f"results written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print("\n".join(compare(json.load(f), results)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
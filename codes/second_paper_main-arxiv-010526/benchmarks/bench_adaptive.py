@@ -0,0 +1,66 @@
+"""Compares matvecs and time to reach epsilon for the fixed-step and adaptive solvers on ill-conditioned games.
+Run from the codebase root: PYTHONPATH=src python benchmarks/bench_adaptive.py"""
+
+import argparse
+import sys
+import time
+import numpy as np
+
+from matrix_game_solver.adaptive import solve_adaptive
+from matrix_game_solver.solver import solve_epsilon_matrix_game
+
+
+def ill_conditioned(m: int, n: int, condition: float, rng: np.random.Generator) -> np.ndarray:
+    """Random payoff matrix with singular values spread geometrically over 'condition', scaled to max |a_ij| = 1."""
+    U, _ = np.linalg.qr(rng.standard_normal((m, m)))
+    V, _ = np.linalg.qr(rng.standard_normal((n, n)))
+    s = np.geomspace(1.0, 1.0 / condition, min(m, n))
+    A = (U[:, :s.size] * s) @ V[:s.size]
+    return A / np.abs(A).max()
+
+
+def fixed_step(A: np.ndarray, epsilon: float, game_type: str, max_iterations: int) -> tuple:
+    """Runs the fixed-step solver and returns (matvecs, seconds, gap), counting every product with A or A^T."""
+    count = [0]
+
+    def counted(product):
+        def matvec(v):
+            count[0] += 1
+            return product(v)
+        return matvec
+
+    m, n = A.shape
+    start = time.perf_counter()
+    x, y = solve_epsilon_matrix_game(counted(lambda x: A @ x), counted(lambda y: A.T @ y), n, m, epsilon,
+                                     game_type=game_type, max_iterations=max_iterations)
+    seconds = time.perf_counter() - start
+    gap = np.max(A @ x) - (np.min(A.T @ y) if game_type == 'L1-L1' else -np.linalg.norm(A.T @ y))
+    return count[0], seconds, gap
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the adaptive matrix game solver.")
+    parser.add_argument("--m", type=int, default=200)
+    parser.add_argument("--n", type=int, default=100)
+    parser.add_argument("--condition", type=float, default=1e3)
+    parser.add_argument("--epsilon", type=float, default=1e-4)
+    parser.add_argument("--max-iterations", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    A = ill_conditioned(args.m, args.n, args.condition, np.random.default_rng(args.seed))
+    print(f"{args.m}x{args.n}, condition {args.condition:g}, epsilon {args.epsilon:g}")
+    print(f"{'game':<7} {'solver':<9} {'matvecs':>8} {'time':>8} {'gap':>10} {'restarts':>9}")
+    for game_type in ['L1-L1', 'L2-L1']:
+        matvecs, seconds, gap = fixed_step(A, args.epsilon, game_type, args.max_iterations)
+        print(f"{game_type:<7} {'fixed':<9} {matvecs:>8} {seconds:>7.2f}s {gap:>10.2e} {'-':>9}")
+        start = time.perf_counter()
+        result = solve_adaptive(A, args.epsilon, game_type, max_iterations=args.max_iterations)
+        seconds = time.perf_counter() - start
+        print(f"{game_type:<7} {'adaptive':<9} {result.matvecs:>8} {seconds:>7.2f}s {result.gap:>10.2e} "
+              f"{result.restarts:>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""Compares solving many small games one at a time against the batched solver.
+Run from the codebase root: PYTHONPATH=src python benchmarks/bench_batched.py"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+from matrix_game_solver.batched import solve_matrix_games, solve_stacked
+from matrix_game_solver.solver import solve_epsilon_matrix_game
+
+
+def solve_each(A: np.ndarray, epsilon: float, max_iterations: int) -> None:
+    """Solves every game in the stack with its own call to the single-game solver."""
+    for game in A:
+        solve_epsilon_matrix_game(lambda x: game @ x, lambda y: game.T @ y, game.shape[1], game.shape[0],
+                                  epsilon, max_iterations=max_iterations)
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the batched matrix game solver.")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--m", type=int, default=8)
+    parser.add_argument("--n", type=int, default=8)
+    parser.add_argument("--epsilon", type=float, default=1e-3)
+    parser.add_argument("--max-iterations", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    A = rng.uniform(-1, 1, size=(args.games, args.m, args.n)) / args.n
+    mixed = [rng.uniform(-1, 1, size=(args.m + i % 4, args.n)) / args.n for i in range(args.games)]
+
+    one_by_one = timed(lambda: solve_each(A, args.epsilon, args.max_iterations))
+    stacked = timed(lambda: solve_stacked(A, args.epsilon, max_iterations=args.max_iterations))
+    pooled = timed(lambda: solve_matrix_games(mixed, args.epsilon, max_iterations=args.max_iterations,
+                                              workers=args.workers))
+    iterations = solve_stacked(A, args.epsilon, max_iterations=args.max_iterations)[2]
+
+    print(f"{args.games} games of {args.m}x{args.n}, epsilon {args.epsilon:g}, "
+          f"median {int(np.median(iterations))} iterations")
+    print(f"one call per game   {one_by_one:8.2f}s")
+    print(f"batched             {stacked:8.2f}s  {one_by_one / stacked:6.1f}x")
+    print(f"{'4 shapes, ' + str(args.workers) + ' workers':<20}{pooled:8.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
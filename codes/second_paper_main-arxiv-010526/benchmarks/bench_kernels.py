@@ -0,0 +1,76 @@
+"""Micro-benchmarks for the projection kernels against the previous sort-based projection.
+Run from the codebase root: PYTHONPATH=src python benchmarks/bench_kernels.py"""
+
+import argparse
+import sys
+import time
+import numpy as np
+
+from matrix_game_solver.kernels import project_onto_simplex, project_rows_onto_simplex
+
+SIZES = [10 ** k for k in range(2, 8)]
+
+
+def sort_projection(v: np.ndarray) -> np.ndarray:
+    """The sort-based projection the kernels replaced."""
+    n = v.shape[0]
+    u = np.sort(v)[::-1]
+    css = np.cumsum(u)
+    rho = np.where(u * np.arange(1, n + 1) > (css - 1))[0][-1]
+    theta = (css[rho] - 1) / (rho + 1)
+    return np.maximum(0, v - theta)
+
+
+def best_time(fn, repeat: int) -> float:
+    """Returns the fastest of several timed calls."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run(sizes, rows: int, seed: int) -> list:
+    """Times single-vector and row-batched projections for each size."""
+    rng = np.random.default_rng(seed)
+    results = []
+    for n in sizes:
+        v = rng.standard_normal(n)
+        out = np.empty_like(v)
+        repeat = max(3, min(200, 10 ** 6 // n))
+        sort_seconds = best_time(lambda: sort_projection(v), repeat)
+        kernel_seconds = best_time(lambda: project_onto_simplex(v), repeat)
+        out_seconds = best_time(lambda: project_onto_simplex(v, out=out), repeat)
+        np.testing.assert_allclose(project_onto_simplex(v), sort_projection(v), atol=1e-12)
+
+        batch = None
+        if n * rows <= 10 ** 7:
+            V = rng.standard_normal((rows, n))
+            loop_seconds = best_time(lambda: [sort_projection(row) for row in V], 3)
+            batched_seconds = best_time(lambda: project_rows_onto_simplex(V), 3)
+            batch = (loop_seconds, batched_seconds)
+        results.append((n, sort_seconds, kernel_seconds, out_seconds, batch))
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark simplex projection kernels.")
+    parser.add_argument("--sizes", type=int, nargs="*", default=SIZES)
+    parser.add_argument("--rows", type=int, default=256, help="rows in the batched comparison")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'n':>10} {'sort':>10} {'pivot':>10} {'pivot+out':>10} {'speedup':>8} "
+          f"{'rows loop':>11} {'rows batch':>11} {'speedup':>8}")
+    for n, sort_seconds, kernel_seconds, out_seconds, batch in run(args.sizes, args.rows, args.seed):
+        line = (f"{n:>10} {sort_seconds * 1e3:>8.3f}ms {kernel_seconds * 1e3:>8.3f}ms "
+                f"{out_seconds * 1e3:>8.3f}ms {sort_seconds / out_seconds:>7.2f}x")
+        if batch:
+            line += f" {batch[0] * 1e3:>9.3f}ms {batch[1] * 1e3:>9.3f}ms {batch[0] / batch[1]:>7.2f}x"
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""Times A x and A^T y for each linear-operator backend, as two separate products and as one fused pass.
+Run from the codebase root: PYTHONPATH=src python benchmarks/bench_operators.py"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import scipy.sparse as sp
+
+from matrix_game_solver.operators import DenseOperator, MemmapOperator, SparseOperator, ThreadedOperator
+
+
+def best_time(fn, repeat: int) -> float:
+    """Returns the fastest of several timed calls."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def measure(operator, x: np.ndarray, y: np.ndarray, repeat: int) -> tuple:
+    """Returns the seconds for separate matvec + rmatvec and for matvec_pair."""
+    out, rout = np.empty(operator.shape[0]), np.empty(operator.shape[1])
+    separate = best_time(lambda: (operator.matvec(x, out), operator.rmatvec(y, rout)), repeat)
+    fused = best_time(lambda: operator.matvec_pair(x, y, out, rout), repeat)
+    return separate, fused
+
+
+def run(m: int, n: int, density: float, workers: int, repeat: int, seed: int) -> list:
+    """Benchmarks every backend on the same m x n payoff matrix."""
+    rng = np.random.default_rng(seed)
+    A = rng.uniform(-1, 1, size=(m, n))
+    x, y = rng.standard_normal(n), rng.standard_normal(m)
+    results = []
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "payoff.npy")
+        np.save(path, A)
+        cases = [
+            ("dense", DenseOperator(A)),
+            (f"threaded x{workers}", ThreadedOperator(A, workers=workers)),
+            ("memmap", MemmapOperator.open(path)),
+            (f"csr {density:g}", SparseOperator(sp.random(m, n, density=density, format="csr", random_state=seed))),
+        ]
+        for name, operator in cases:
+            with operator:
+                results.append((name, *measure(operator, x, y, repeat)))
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark linear-operator backends.")
+    parser.add_argument("--m", type=int, default=8000)
+    parser.add_argument("--n", type=int, default=4000)
+    parser.add_argument("--density", type=float, default=0.01)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'backend':<16} {'separate':>10} {'fused':>10} {'speedup':>8}")
+    for name, separate, fused in run(args.m, args.n, args.density, args.workers, args.repeat, args.seed):
+        print(f"{name:<16} {separate * 1e3:>8.2f}ms {fused * 1e3:>8.2f}ms {separate / fused:>7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
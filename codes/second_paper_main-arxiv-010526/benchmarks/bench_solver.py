@@ -0,0 +1,110 @@
+"""Iterations per second and peak memory of the original extragradient loop and the in-place workspace loop.
+Run from the codebase root: PYTHONPATH=src python benchmarks/bench_solver.py"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+from matrix_game_solver.solver import SolverWorkspace, solve_epsilon_matrix_game
+
+CASES = [
+    ("dense", 8, 8),
+    ("dense", 100, 100),
+    ("dense", 500, 500),
+    ("dense", 2000, 2000),
+    ("diagonal", 10 ** 5, 10 ** 5),
+    ("diagonal", 10 ** 6, 10 ** 6),
+]
+
+
+def sort_projection(v):
+    """The sort-based simplex projection the solver shipped with before the shared kernels."""
+    u = np.sort(v)[::-1]
+    css = np.cumsum(u)
+    rho = np.where(u * np.arange(1, v.shape[0] + 1) > (css - 1))[0][-1]
+    return np.maximum(v - (css[rho] - 1) / (rho + 1), 0)
+
+
+def allocating_solve(matvec_A, matvec_AT, n, m, iterations):
+    """The original L1-L1 loop, with fresh arrays for every intermediate and the sort-based projection."""
+    x = sort_projection(np.ones(n) / n)
+    y = sort_projection(np.ones(m) / m)
+    x_avg, y_avg = np.copy(x), np.copy(y)
+    gamma = 1.0
+    for k in range(1, iterations + 1):
+        grad_x = matvec_AT(y)
+        grad_y = -matvec_A(x)
+        x_tilde = sort_projection(x - gamma * grad_x)
+        y_tilde = sort_projection(y - gamma * grad_y)
+        grad_x_tilde = matvec_AT(y_tilde)
+        grad_y_tilde = -matvec_A(x_tilde)
+        x_next = sort_projection(x - gamma * grad_x_tilde)
+        y_next = sort_projection(y - gamma * grad_y_tilde)
+        x_avg = (k * x_avg + x_next) / (k + 1)
+        y_avg = (k * y_avg + y_next) / (k + 1)
+        x, y = x_next, y_next
+        if k % 100 == 0 and np.max(matvec_A(x_avg)) - np.min(matvec_AT(y_avg)) <= -1.0:
+            break
+    return x_avg, y_avg
+
+
+def operators(kind: str, m: int, n: int, rng):
+    """Returns allocating and out= matvec pairs for a dense or diagonal payoff matrix."""
+    if kind == "dense":
+        A = rng.uniform(-1, 1, size=(m, n)) / n
+        AT = A.T
+        return (lambda x: A @ x, lambda y: AT @ y,
+                lambda x, out: np.matmul(A, x, out=out), lambda y, out: np.matmul(AT, y, out=out))
+    d = rng.uniform(-1, 1, size=n)
+    return (lambda x: d * x, lambda y: d * y,
+            lambda x, out: np.multiply(d, x, out=out), lambda y, out: np.multiply(d, y, out=out))
+
+
+def measure(fn, iterations: int) -> tuple:
+    """Returns iterations per second and the traced peak memory of one call."""
+    start = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return iterations / seconds, peak
+
+
+def run(cases, iterations: int, seed: int) -> list:
+    """Benchmarks the allocating loop against the workspace loop for each case."""
+    rng = np.random.default_rng(seed)
+    results = []
+    for kind, m, n in cases:
+        matvec_A, matvec_AT, into_A, into_AT = operators(kind, m, n, rng)
+        workspace = SolverWorkspace(n, m)
+        before = measure(lambda: allocating_solve(matvec_A, matvec_AT, n, m, iterations), iterations)
+        after = measure(lambda: solve_epsilon_matrix_game(
+            into_A, into_AT, n, m, -1.0, max_iterations=iterations, workspace=workspace, matvec_out=True
+        ), iterations)
+        results.append((kind, m, n, before, after))
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the extragradient inner loop.")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'case':<10} {'m':>8} {'n':>8} {'before it/s':>12} {'after it/s':>12} {'speedup':>8} "
+          f"{'before peak':>12} {'after peak':>12}")
+    for kind, m, n, before, after in run(CASES, args.iterations, args.seed):
+        print(f"{kind:<10} {m:>8} {n:>8} {before[0]:>12.1f} {after[0]:>12.1f} {after[0] / before[0]:>7.2f}x "
+              f"{before[1] / 1e6:>10.2f}MB {after[1] / 1e6:>10.2f}MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""Adaptive extragradient (Euclidean mirror-prox) with line-search steps, restarts and matvec-free gap certificates.
+Returns the best certified strategies together with a convergence trace of iterations, matvecs, gap and time."""
+
+import time
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Optional
+from .kernels import _gap, _projections, _running_mean, _step
+from .operators import aslinearoperator
+
+
+@dataclass
+class AdaptiveResult:
+    """Best strategies found, their duality gap and how the run got there."""
+    x: np.ndarray
+    y: np.ndarray
+    gap: float
+    iterations: int
+    matvecs: int
+    restarts: int
+    converged: bool
+    trace: dict = field(default_factory=dict)
+
+
+def _sq_dist(a: np.ndarray, b: np.ndarray, scratch: np.ndarray) -> float:
+    """Returns ||a - b||^2 using scratch as the only temporary."""
+    np.subtract(a, b, out=scratch)
+    return float(np.dot(scratch, scratch))
+
+
+def solve_adaptive(
+    A,
+    epsilon: float,
+    game_type: str = 'L1-L1',
+    max_iterations: int = 10000,
+    gamma: float = 1.0,
+    shrink: float = 0.5,
+    grow: float = 1.05,
+    theta: float = 0.9,
+    sufficient_decay: float = 0.2,
+    necessary_decay: float = 0.8,
+    plateau_window: int = 50,
+    trace_every: int = 1,
+    initial_x: Optional[np.ndarray] = None,
+    initial_y: Optional[np.ndarray] = None
+) -> AdaptiveResult:
+    """
+    Computes an epsilon-approximate Nash equilibrium of the m x n payoff matrix A (any backend accepted
+    by aslinearoperator) with adaptive extragradient.
+    Each step size is backtracked by 'shrink' until gamma * ||F(w) - F(z)|| <= theta * ||w - z||, and grown
+    by 'grow' after every accepted step. The ergodic average is weighted by the accepted steps.
+    Because A is linear, A x_avg and A^T y_avg are running averages of products the iteration already computes,
+    so the gaps of both the current iterate and the average are exact and cost no extra matvecs.
+    The method restarts from the better of the two when its gap falls below 'sufficient_decay' times the gap
+    at the last restart, or below 'necessary_decay' times it after 'plateau_window' iterations without a
+    1% improvement.
+    """
+    project_x, project_y = _projections(game_type)
+    if not 0 < shrink < 1 or grow < 1 or not 0 < theta < 1:
+        raise ValueError("Expected 0 < shrink < 1, grow >= 1 and 0 < theta < 1.")
+
+    operator = aslinearoperator(A)
+    m, n = operator.shape
+    start = time.perf_counter()
+
+    x, x_w, x_avg, aty, aty_w, aty_avg, x_best, scratch_n = np.empty((8, n))
+    y, y_w, y_avg, ax, ax_w, ax_avg, y_best, scratch_m = np.empty((8, m))
+    if initial_x is not None:
+        np.copyto(x, initial_x)
+    else:
+        x.fill(1.0 / n)
+        project_x(x, out=x)
+    if initial_y is not None:
+        np.copyto(y, initial_y)
+    else:
+        y.fill(1.0 / m)
+        project_y(y, out=y)
+
+    operator.matvec_pair(x, y, ax, aty)
+    matvecs = 2
+    best_gap = restart_gap = epoch_best = float(_gap(ax, aty, game_type))
+    np.copyto(x_best, x)
+    np.copyto(y_best, y)
+    weight, restarts, last_improvement = 0.0, 0, 0
+    trace = {"iteration": [0], "matvecs": [matvecs], "gap": [best_gap], "seconds": [0.0],
+             "gamma": [gamma], "restarted": [False]}
+
+    k = 0
+    while k < max_iterations and best_gap > epsilon:
+        k += 1
+
+        # Predictor w = P(z - gamma F(z)), backtracking until the local Lipschitz test holds.
+        while True:
+            _step(x, aty, gamma, project_x, scratch_n, x_w)
+            _step(y, ax, -gamma, project_y, scratch_m, y_w)
+            operator.matvec_pair(x_w, y_w, ax_w, aty_w)
+            matvecs += 2
+            moved = _sq_dist(x_w, x, scratch_n) + _sq_dist(y_w, y, scratch_m)
+            changed = _sq_dist(aty_w, aty, scratch_n) + _sq_dist(ax_w, ax, scratch_m)
+            if gamma * gamma * changed <= theta * theta * moved or moved == 0.0:
+                break
+            gamma *= shrink
+
+        # Step-weighted ergodic averages of the predictors and of their products with A.
+        weight += gamma
+        share = gamma / weight
+        for average, value, scratch in ((x_avg, x_w, scratch_n), (y_avg, y_w, scratch_m),
+                                        (ax_avg, ax_w, scratch_m), (aty_avg, aty_w, scratch_n)):
+            _running_mean(average, value, share, scratch)
+
+        # Corrector z+ = P(z - gamma F(w)), then F(z+) for the next predictor and the current gap.
+        _step(x, aty_w, gamma, project_x, scratch_n, x)
+        _step(y, ax_w, -gamma, project_y, scratch_m, y)
+        operator.matvec_pair(x, y, ax, aty)
+        matvecs += 2
+        gamma *= grow
+
+        current_gap = float(_gap(ax, aty, game_type))
+        average_gap = float(_gap(ax_avg, aty_avg, game_type))
+        use_average = average_gap < current_gap
+        candidate_gap = min(current_gap, average_gap)
+        if candidate_gap < best_gap:
+            best_gap = candidate_gap
+            np.copyto(x_best, x_avg if use_average else x)
+            np.copyto(y_best, y_avg if use_average else y)
+        if candidate_gap < 0.99 * epoch_best:
+            epoch_best, last_improvement = candidate_gap, k
+
+        restarted = candidate_gap <= sufficient_decay * restart_gap or (
+            candidate_gap <= necessary_decay * restart_gap and k - last_improvement >= plateau_window
+        )
+        if restarted:
+            if use_average:
+                np.copyto(x, x_avg)
+                np.copyto(y, y_avg)
+                np.copyto(ax, ax_avg)
+                np.copyto(aty, aty_avg)
+            restart_gap = epoch_best = candidate_gap
+            weight, last_improvement = 0.0, k
+            restarts += 1
+
+        if k % trace_every == 0 or restarted or best_gap <= epsilon:
+            trace["iteration"].append(k)
+            trace["matvecs"].append(matvecs)
+            trace["gap"].append(best_gap)
+            trace["seconds"].append(time.perf_counter() - start)
+            trace["gamma"].append(gamma)
+            trace["restarted"].append(restarted)
+
+    return AdaptiveResult(x_best.copy(), y_best.copy(), best_gap, k, matvecs, restarts,
+                          best_gap <= epsilon, trace)
@@ -0,0 +1,134 @@
+"""Batched extragradient for stacks of independent matrix games.
+Games of one shape advance together with batched matmuls and row projections; mixed shapes fan out to processes."""
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+from .kernels import _gap, _projections, _running_mean, _step
+
+
+@dataclass
+class GameSolution:
+    """Approximate equilibrium of one game with the iteration and duality gap it stopped at."""
+    x: np.ndarray
+    y: np.ndarray
+    iterations: int
+    gap: float
+    converged: bool
+
+
+def _pair(A: np.ndarray, X: np.ndarray, Y: np.ndarray, AX: np.ndarray, ATY: np.ndarray) -> None:
+    """Writes A_b x_b into AX and A_b^T y_b into ATY for every game b."""
+    np.matmul(A, X[:, :, None], out=AX[:, :, None])
+    np.matmul(Y[:, None, :], A, out=ATY[:, None, :])
+
+
+def solve_stacked(
+    A: np.ndarray,
+    epsilon: float,
+    game_type: str = 'L1-L1',
+    max_iterations: int = 10000,
+    check_every: int = 100
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Runs extragradient on a B x m x n stack of payoff matrices at once.
+    Every 'check_every' iterations the duality gaps of the active games are computed in one batch,
+    and games whose gap is at most epsilon are retired from the active set.
+    Returns the averaged strategies (B x n, B x m), the iterations each game ran and its final gap.
+    """
+    project_x, project_y = _projections(game_type, rows=True)
+    A = np.asarray(A, dtype=float)
+    if A.ndim != 3:
+        raise ValueError("Expected a B x m x n stack of payoff matrices.")
+    B, m, n = A.shape
+    if B == 0:
+        return np.empty((0, n)), np.empty((0, m)), np.empty(0, dtype=int), np.empty(0)
+
+    gamma = 1.0 / (np.sqrt(m) if game_type == 'L2-L1' else 1.0)
+
+    X = project_x(np.full((B, n), 1.0 / n))
+    Y = project_y(np.full((B, m), 1.0 / m))
+    X_avg, Y_avg = X.copy(), Y.copy()
+    X_tilde, GX, SX = np.empty((3, B, n))
+    Y_tilde, GY, SY = np.empty((3, B, m))
+
+    x_hat, y_hat = np.empty((B, n)), np.empty((B, m))
+    iterations = np.full(B, max_iterations)
+    gaps = np.full(B, np.inf)
+    active = np.arange(B)
+
+    for k in range(1, max_iterations + 1):
+        _pair(A, X, Y, GY, GX)
+        _step(X, GX, gamma, project_x, SX, X_tilde)
+        _step(Y, GY, -gamma, project_y, SY, Y_tilde)
+
+        _pair(A, X_tilde, Y_tilde, GY, GX)
+        _step(X, GX, gamma, project_x, SX, X)
+        _step(Y, GY, -gamma, project_y, SY, Y)
+
+        _running_mean(X_avg, X, 1.0 / (k + 1), SX)
+        _running_mean(Y_avg, Y, 1.0 / (k + 1), SY)
+
+        if k % check_every and k < max_iterations:
+            continue
+
+        _pair(A, X_avg, Y_avg, GY, GX)
+        gap = _gap(GY, GX, game_type)
+        done = (gap <= epsilon) | (k == max_iterations)
+        if not done.any():
+            continue
+
+        retired = active[done]
+        x_hat[retired], y_hat[retired] = X_avg[done], Y_avg[done]
+        iterations[retired], gaps[retired] = k, gap[done]
+        keep = ~done
+        active = active[keep]
+        if active.size == 0:
+            break
+        A, X, Y, X_avg, Y_avg = A[keep], X[keep], Y[keep], X_avg[keep], Y_avg[keep]
+        X_tilde, GX, SX = X_tilde[keep], GX[keep], SX[keep]
+        Y_tilde, GY, SY = Y_tilde[keep], GY[keep], SY[keep]
+
+    return x_hat, y_hat, iterations, gaps
+
+
+def solve_matrix_games(
+    games: Sequence[np.ndarray],
+    epsilon: float,
+    game_type: str = 'L1-L1',
+    max_iterations: int = 10000,
+    check_every: int = 100,
+    workers: Optional[int] = None
+) -> List[GameSolution]:
+    """
+    Solves many independent games and returns one GameSolution per game, in input order.
+    'games' is a B x m x n array or a list of 2-D payoff matrices. Games of the same shape are
+    stacked and solved together; when several shapes are present, each shape group runs in its
+    own process ('workers' processes, or inline when workers is 1).
+    """
+    if isinstance(games, np.ndarray) and games.ndim == 3:
+        groups = {games.shape[1:]: (list(range(games.shape[0])), games)}
+    else:
+        matrices = [np.asarray(game, dtype=float) for game in games]
+        indices = {}
+        for i, matrix in enumerate(matrices):
+            if matrix.ndim != 2:
+                raise ValueError(f"Game {i} is not a 2-D payoff matrix.")
+            indices.setdefault(matrix.shape, []).append(i)
+        groups = {shape: (idx, np.stack([matrices[i] for i in idx])) for shape, idx in indices.items()}
+
+    args = (epsilon, game_type, max_iterations, check_every)
+    if len(groups) <= 1 or workers == 1:
+        results = [solve_stacked(stack, *args) for _, stack in groups.values()]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(solve_stacked, stack, *args) for _, stack in groups.values()]
+            results = [future.result() for future in futures]
+
+    solutions = [None] * sum(len(idx) for idx, _ in groups.values())
+    for (idx, _), (x_hat, y_hat, iterations, gaps) in zip(groups.values(), results):
+        for row, i in enumerate(idx):
+            solutions[i] = GameSolution(x_hat[row], y_hat[row], int(iterations[row]), float(gaps[row]),
+                                        bool(gaps[row] <= epsilon))
+    return solutions
@@ -1,8 +1,9 @@
 """Defines callable types for matrix-vector products A @ v and A.T @ u.
-Allows solvers to work with various matrix representations."""
+Allows solvers to work with various matrix representations; MatvecInto callbacks also accept out=."""
 
 import numpy as np
 from typing import Callable
 
 MatvecA = Callable[[np.ndarray], np.ndarray]
-MatvecAT = Callable[[np.ndarray], np.ndarray]
\ No newline at end of file
+MatvecAT = Callable[[np.ndarray], np.ndarray]
+MatvecInto = Callable[..., np.ndarray]
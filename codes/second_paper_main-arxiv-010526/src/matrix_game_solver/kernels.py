@@ -0,0 +1,163 @@
+"""Canonical projection kernels shared by the matrix game solvers.
+Simplex and L2-ball projections for single vectors and row batches, with optional output buffers,
+plus the projected step, running average and duality gap every extragradient loop is built from."""
+
+import math
+import numpy as np
+from typing import Callable, Optional, Tuple
+
+SORT_CUTOFF = 1024
+_RANKS = np.arange(1.0, SORT_CUTOFF + 1)
+GAME_TYPES = ('L1-L1', 'L2-L1')
+
+
+def _sorted_threshold(candidates: np.ndarray, total: float, count: int, radius: float) -> float:
+    """Finishes a simplex threshold search by sorting the remaining candidates in place."""
+    candidates.sort()
+    u = candidates[::-1]
+    css = total + np.cumsum(u)
+    counts = count + np.arange(1, u.size + 1)
+    support = np.flatnonzero(u * counts > css - radius)
+    if support.size:
+        last = support[-1]
+        return (css[last] - radius) / counts[last]
+    return (total - radius) / count if count else np.nan
+
+
+def simplex_threshold(v: np.ndarray, radius: float = 1.0, *, scratch: Optional[np.ndarray] = None) -> float:
+    """Returns theta such that max(v - theta, 0) sums to radius, in expected linear time.
+    Vectors of up to SORT_CUTOFF entries are sorted directly; longer ones are partitioned in a copy of v,
+    in scratch when one is given."""
+    if not radius > 0:
+        raise ValueError("The simplex radius must be positive.")
+    size = np.size(v)
+    if size == 0:
+        raise ValueError("Cannot project an empty vector onto the simplex.")
+
+    if size <= SORT_CUTOFF:
+        u = np.asarray(v, dtype=float).flatten()
+        u.sort()
+        u = u[::-1]
+        css = u.cumsum()
+        css -= radius
+        support = (u * _RANKS[:size] > css).nonzero()[0]
+        theta = css[support[-1]] / (support[-1] + 1) if support.size else np.nan
+    else:
+        with np.errstate(invalid="ignore"):
+            theta = _partitioned_threshold(v, radius, scratch)
+    if not math.isfinite(theta):
+        raise ValueError("Cannot project a vector with NaN or infinite entries onto the simplex.")
+    return theta
+
+
+def _partitioned_threshold(v: np.ndarray, radius: float, scratch: Optional[np.ndarray]) -> float:
+    """Narrows the simplex threshold search by quickselect until SORT_CUTOFF candidates remain."""
+    if scratch is None:
+        candidates = np.array(v, dtype=float).ravel()
+    else:
+        candidates = scratch.ravel()
+        np.copyto(candidates, np.ravel(v))
+
+    total, count = 0.0, 0
+    while candidates.size > SORT_CUTOFF:
+        k = candidates.size // 2
+        candidates.partition(k)
+        pivot = candidates[k]
+        upper = candidates[k:]
+        upper_total = upper.sum()
+        if total + upper_total - (count + upper.size) * pivot < radius:
+            total += upper_total
+            count += upper.size
+            candidates = candidates[:k]
+        else:
+            candidates = upper[1:]
+    return _sorted_threshold(candidates, total, count, radius)
+
+
+def project_onto_simplex(v: np.ndarray, radius: float = 1.0, *, out: Optional[np.ndarray] = None,
+                         scratch: Optional[np.ndarray] = None) -> np.ndarray:
+    """Projects a given vector onto the probability simplex scaled to radius.
+    A separate out buffer doubles as scratch space for long vectors, so the projection allocates nothing."""
+    if scratch is None and out is not None and out.size > SORT_CUTOFF and not np.may_share_memory(out, v):
+        scratch = out
+    theta = simplex_threshold(v, radius, scratch=scratch)
+    out = np.subtract(v, theta, out=out)
+    return np.maximum(out, 0.0, out=out)
+
+
+def project_rows_onto_simplex(V: np.ndarray, radius: float = 1.0, *,
+                              out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Projects every row of a 2-D array onto the probability simplex scaled to radius."""
+    V = np.asarray(V, dtype=float)
+    if V.ndim != 2:
+        raise ValueError("Expected a 2-D array of rows.")
+    if not radius > 0:
+        raise ValueError("The simplex radius must be positive.")
+
+    u = -np.sort(-V, axis=1)
+    css = np.cumsum(u, axis=1)
+    support = u * np.arange(1, V.shape[1] + 1) > css - radius
+    rho = V.shape[1] - 1 - np.argmax(support[:, ::-1], axis=1)
+    theta = (css[np.arange(V.shape[0]), rho] - radius) / (rho + 1)
+    out = np.subtract(V, theta[:, None], out=out)
+    return np.maximum(out, 0.0, out=out)
+
+
+def project_onto_l2_ball(v: np.ndarray, radius: float = 1.0, *, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Projects a given vector onto the Euclidean ball of the given radius."""
+    norm_v = np.linalg.norm(v)
+    return np.multiply(v, radius / norm_v if norm_v > radius else 1.0, out=out)
+
+
+def project_rows_onto_l2_ball(V: np.ndarray, radius: float = 1.0, *,
+                              out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Projects every row of a 2-D array onto the Euclidean ball of the given radius."""
+    V = np.asarray(V, dtype=float)
+    if V.ndim != 2:
+        raise ValueError("Expected a 2-D array of rows.")
+
+    norms = np.linalg.norm(V, axis=1)
+    scale = np.divide(radius, norms, out=np.ones_like(norms), where=norms > radius)
+    return np.multiply(V, scale[:, None], out=out)
+
+
+def _check_game_type(game_type: str) -> None:
+    """Raises ValueError unless game_type names a supported pair of strategy sets."""
+    if game_type not in GAME_TYPES:
+        raise ValueError("Unsupported game_type. Must be 'L1-L1' or 'L2-L1'.")
+
+
+def _projections(game_type: str, rows: bool = False) -> Tuple[Callable, Callable]:
+    """Returns the (x, y) projections for game_type, in their row-batched form when rows is set."""
+    _check_game_type(game_type)
+    if rows:
+        return (project_rows_onto_simplex if game_type == 'L1-L1' else project_rows_onto_l2_ball,
+                project_rows_onto_simplex)
+    return project_onto_simplex if game_type == 'L1-L1' else project_onto_l2_ball, project_onto_simplex
+
+
+def _step(point: np.ndarray, grad: np.ndarray, gamma: float, project: Callable,
+          step: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Writes project(point - gamma * grad) into out using step as the only temporary; out may alias point."""
+    np.multiply(grad, -gamma, out=step)
+    step += point
+    return project(step, out=out)
+
+
+def _running_mean(average: np.ndarray, value: np.ndarray, weight: float, scratch: np.ndarray) -> None:
+    """Moves average towards value in place: average += weight * (value - average)."""
+    if weight == 1.0:
+        np.copyto(average, value)
+        return
+    np.subtract(value, average, out=scratch)
+    scratch *= weight
+    average += scratch
+
+
+def _gap(ax: np.ndarray, aty: np.ndarray, game_type: str):
+    """Duality gap of (x, y) from A x and A^T y along the last axis.
+    The max player's best response gives max(A x); the min player's gives min(A^T y) over the simplex
+    and -||A^T y||_2 over the unit ball."""
+    if game_type == 'L1-L1':
+        return np.max(ax, axis=-1) - np.min(aty, axis=-1)
+    return np.max(ax, axis=-1) + np.linalg.norm(aty, axis=-1)
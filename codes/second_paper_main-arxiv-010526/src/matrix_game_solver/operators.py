@@ -0,0 +1,196 @@
+"""Linear-operator backends for payoff matrices: dense, sparse, memory-mapped and thread-parallel blocked.
+Each operator computes A x and A^T y, and both together in a single pass over A where the layout allows."""
+
+import os
+import threading
+import numpy as np
+import scipy.sparse as sp
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+
+class LinearOperator(ABC):
+    """An m x n payoff matrix A exposed only through products with vectors."""
+
+    shape: Tuple[int, int]
+
+    @abstractmethod
+    def matvec(self, x: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Returns A x, written into out when given."""
+
+    @abstractmethod
+    def rmatvec(self, y: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Returns A^T y, written into out when given."""
+
+    def matvec_pair(self, x: np.ndarray, y: np.ndarray, out: Optional[np.ndarray] = None,
+                    rout: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns (A x, A^T y), written into out and rout when given."""
+        return self.matvec(x, out), self.rmatvec(y, rout)
+
+    def close(self) -> None:
+        """Releases any worker threads held by the operator."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class BlockedOperator(LinearOperator):
+    """Streams A in row blocks, so A x and A^T y can share one read of each block.
+    With several workers, contiguous groups of blocks are processed in parallel threads.
+    Accumulators are kept per calling thread, so one operator can serve concurrent solves."""
+
+    def __init__(self, matrix, block_rows: Optional[int] = None, workers: int = 1, block_bytes: int = 1 << 20):
+        if matrix.ndim != 2:
+            raise ValueError("Expected a 2-D payoff matrix.")
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.matrix = matrix
+        self.shape = matrix.shape
+        m, n = matrix.shape
+        self.block_rows = block_rows or max(1, block_bytes // max(1, n * matrix.dtype.itemsize))
+        blocks = [(start, min(start + self.block_rows, m)) for start in range(0, m, self.block_rows)] or [(0, 0)]
+        per_worker = -(-len(blocks) // workers)
+        self.groups = [blocks[i:i + per_worker] for i in range(0, len(blocks), per_worker)]
+        self.workers = len(self.groups)
+        self._scratch = threading.local()
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def matvec(self, x: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        out = np.empty(self.shape[0]) if out is None else out
+
+        def work(worker: int, blocks: list) -> None:
+            for start, stop in blocks:
+                np.matmul(self.matrix[start:stop], x, out=out[start:stop])
+
+        self._run(work)
+        return out
+
+    def rmatvec(self, y: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        return self.matvec_pair(None, y, rout=out)[1]
+
+    def matvec_pair(self, x: Optional[np.ndarray], y: np.ndarray, out: Optional[np.ndarray] = None,
+                    rout: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        if x is not None and out is None:
+            out = np.empty(self.shape[0])
+        rout = np.empty(self.shape[1]) if rout is None else rout
+        partial, tmp_rows = self._buffers()
+
+        def work(worker: int, blocks: list) -> None:
+            acc = rout if self.workers == 1 else partial[worker]
+            tmp = tmp_rows[worker]
+            acc.fill(0.0)
+            for start, stop in blocks:
+                block = self.matrix[start:stop]
+                if x is not None:
+                    np.matmul(block, x, out=out[start:stop])
+                acc += np.matmul(block.T, y[start:stop], out=tmp)
+
+        self._run(work)
+        if self.workers > 1:
+            np.sum(partial, axis=0, out=rout)
+        return out, rout
+
+    def close(self) -> None:
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    def _buffers(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the calling thread's per-worker partial sums and product scratch, allocated on first use."""
+        scratch = self._scratch
+        if not hasattr(scratch, "partial"):
+            scratch.partial, scratch.tmp = np.empty((2, self.workers, self.shape[1]))
+        return scratch.partial, scratch.tmp
+
+    def _run(self, work) -> None:
+        if self.workers == 1:
+            work(0, self.groups[0])
+            return
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="matvec")
+            pool = self._pool
+        for future in [pool.submit(work, i, group) for i, group in enumerate(self.groups)]:
+            future.result()
+
+
+class DenseOperator(BlockedOperator):
+    """In-memory ndarray; single products go straight to BLAS, pairs use the fused blocked pass."""
+
+    def __init__(self, matrix: np.ndarray, block_rows: Optional[int] = None, block_bytes: int = 1 << 20):
+        super().__init__(np.asarray(matrix), block_rows=block_rows, workers=1, block_bytes=block_bytes)
+
+    def matvec(self, x: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        return np.matmul(self.matrix, x, out=out)
+
+    def rmatvec(self, y: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        return np.matmul(self.matrix.T, y, out=out)
+
+
+class MemmapOperator(BlockedOperator):
+    """On-disk matrix read through np.memmap one row block at a time, so it never has to fit in RAM."""
+
+    def __init__(self, matrix: np.ndarray, block_rows: Optional[int] = None, workers: int = 1,
+                 block_bytes: int = 1 << 22):
+        super().__init__(matrix, block_rows=block_rows, workers=workers, block_bytes=block_bytes)
+
+    @classmethod
+    def open(cls, path: str, shape: Optional[Tuple[int, int]] = None, dtype=np.float64,
+             offset: int = 0, **kwargs) -> "MemmapOperator":
+        """Maps a .npy file, or a raw row-major file of the given shape and dtype, read-only."""
+        if path.endswith(".npy"):
+            matrix = np.load(path, mmap_mode="r")
+        else:
+            if shape is None:
+                raise ValueError("shape is required for raw matrix files.")
+            matrix = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=tuple(shape))
+        return cls(matrix, **kwargs)
+
+
+class ThreadedOperator(BlockedOperator):
+    """Row-blocked products split across a pool of threads; NumPy releases the GIL inside matmul."""
+
+    def __init__(self, matrix: np.ndarray, workers: Optional[int] = None, block_rows: Optional[int] = None,
+                 block_bytes: int = 1 << 20):
+        super().__init__(matrix, block_rows=block_rows, workers=workers or os.cpu_count() or 1,
+                         block_bytes=block_bytes)
+
+
+class SparseOperator(LinearOperator):
+    """SciPy CSR or CSC matrix with its transpose converted to CSR once and cached."""
+
+    def __init__(self, matrix):
+        if not sp.issparse(matrix):
+            raise TypeError("SparseOperator expects a scipy.sparse matrix.")
+        self.matrix = matrix if matrix.format in ("csr", "csc") else matrix.tocsr()
+        self.transpose = self.matrix.T.tocsr()
+        self.shape = self.matrix.shape
+
+    def matvec(self, x: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        return self._into(self.matrix @ x, out)
+
+    def rmatvec(self, y: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        return self._into(self.transpose @ y, out)
+
+    def _into(self, result: np.ndarray, out: Optional[np.ndarray]) -> np.ndarray:
+        if out is None:
+            return result
+        np.copyto(out, result)
+        return out
+
+
+def aslinearoperator(A) -> LinearOperator:
+    """Wraps a payoff matrix in the matching backend: sparse, memory-mapped or dense."""
+    if isinstance(A, LinearOperator):
+        return A
+    if sp.issparse(A):
+        return SparseOperator(A)
+    if isinstance(A, np.memmap):
+        return MemmapOperator(A)
+    return DenseOperator(np.asarray(A, dtype=float))
@@ -1,28 +1,39 @@
 import numpy as np
 from scipy.optimize import lsq_linear
 from typing import Callable, Optional, Tuple
+from .kernels import _gap, _projections, _running_mean, _step
+from .operators import aslinearoperator
 
 """
 Implements an iterative algorithm for finding epsilon-approximate Nash equilibria in matrix games.
 Supports different strategy space constraints for various game types.
 """
 
-def project_onto_simplex(v: np.ndarray) -> np.ndarray:
-    """Projects a given vector onto the probability simplex."""
-    n_features = v.shape[0]
-    u = np.sort(v)[::-1]
-    css = np.cumsum(u)
-    ind = np.arange(1, n_features + 1)
-    rho = np.where(u * ind > (css - 1))[0][-1]
-    theta = (css[rho] - 1) / (rho + 1)
-    return np.maximum(v - theta, 0)
-
-def project_onto_l2_ball(v: np.ndarray) -> np.ndarray:
-    """Projects a given vector onto the unit L2 Euclidean ball."""
-    norm_v = np.linalg.norm(v)
-    if norm_v > 1.0:
-        return v / norm_v
-    return v
+class SolverWorkspace:
+    """Preallocated iterates, gradients and running averages for the extragradient loop.
+    Reusing one workspace across solves of the same size avoids every per-iteration allocation."""
+
+    def __init__(self, n: int, m: int, dtype=np.float64):
+        self.n = n
+        self.m = m
+        self.x, self.x_tilde, self.x_avg, self.grad_x, self.step_x = np.empty((5, n), dtype=dtype)
+        self.y, self.y_tilde, self.y_avg, self.grad_y, self.step_y = np.empty((5, m), dtype=dtype)
+
+    def fits(self, n: int, m: int) -> bool:
+        """Returns True if the workspace has buffers for an n x m game."""
+        return self.n == n and self.m == m
+
+
+def _into(matvec: Callable, matvec_out: bool) -> Callable[[np.ndarray, np.ndarray], np.ndarray]:
+    """Adapts a matvec callback to write its result into a given buffer."""
+    if matvec_out:
+        return lambda v, out: matvec(v, out=out)
+
+    def call(v: np.ndarray, out: np.ndarray) -> np.ndarray:
+        np.copyto(out, matvec(v))
+        return out
+    return call
+
 
 def solve_epsilon_matrix_game(
     matvec_A: Callable[[np.ndarray], np.ndarray],
@@ -33,25 +44,72 @@ def solve_epsilon_matrix_game(
     game_type: str = 'L1-L1',
     max_iterations: int = 10000,
     initial_x: Optional[np.ndarray] = None,
-    initial_y: Optional[np.ndarray] = None
+    initial_y: Optional[np.ndarray] = None,
+    workspace: Optional[SolverWorkspace] = None,
+    matvec_out: bool = False
 ) -> Tuple[np.ndarray, np.ndarray]:
     """
     Computes an epsilon-approximate Nash equilibrium (x_hat, y_hat) for a zero-sum matrix game.
     'game_type' specifies the strategy spaces: 'L1-L1' for n-dimensional probability simplex (X_set)
     and m-dimensional probability simplex (Y_set); 'L2-L1' for n-dimensional unit Euclidean ball (X_set)
     and m-dimensional probability simplex (Y_set). Returns the approximate optimal strategies x_hat and y_hat.
+    All iterates live in 'workspace' and are updated in place; with 'matvec_out' the callbacks are
+    called as matvec(v, out=buffer) so that no array is allocated per iteration.
     """
-    if game_type not in ['L1-L1', 'L2-L1']:
-        raise ValueError("Unsupported game_type. Must be 'L1-L1' or 'L2-L1'.")
+    A_into = _into(matvec_A, matvec_out)
+    AT_into = _into(matvec_AT, matvec_out)
 
-    project_x = project_onto_simplex if game_type == 'L1-L1' else project_onto_l2_ball
-    project_y = project_onto_simplex
+    def pair(x: np.ndarray, y: np.ndarray, out: np.ndarray, rout: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return A_into(x, out), AT_into(y, rout)
 
-    x = initial_x if initial_x is not None else project_x(np.ones(n) / n)
-    y = initial_y if initial_y is not None else project_y(np.ones(m) / m)
+    return _extragradient(pair, n, m, epsilon, game_type, max_iterations, initial_x, initial_y, workspace)
 
-    x_avg = np.copy(x)
-    y_avg = np.copy(y)
+
+def solve_matrix_game(
+    A,
+    epsilon: float,
+    game_type: str = 'L1-L1',
+    max_iterations: int = 10000,
+    initial_x: Optional[np.ndarray] = None,
+    initial_y: Optional[np.ndarray] = None,
+    workspace: Optional[SolverWorkspace] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Computes an epsilon-approximate Nash equilibrium for the m x n payoff matrix A.
+    'A' may be a LinearOperator, a dense ndarray, an np.memmap or a scipy.sparse matrix;
+    each extragradient half-step computes A x and A^T y together with the operator's fused matvec_pair.
+    """
+    operator = aslinearoperator(A)
+    m, n = operator.shape
+    return _extragradient(operator.matvec_pair, n, m, epsilon, game_type, max_iterations,
+                          initial_x, initial_y, workspace)
+
+
+def _extragradient(pair: Callable, n: int, m: int, epsilon: float, game_type: str, max_iterations: int,
+                   initial_x: Optional[np.ndarray], initial_y: Optional[np.ndarray],
+                   workspace: Optional[SolverWorkspace]) -> Tuple[np.ndarray, np.ndarray]:
+    """Runs the in-place extragradient loop, with pair(x, y, out, rout) writing A x and A^T y."""
+    project_x, project_y = _projections(game_type)
+    if workspace is None:
+        workspace = SolverWorkspace(n, m)
+    elif not workspace.fits(n, m):
+        raise ValueError(f"Workspace is sized for n={workspace.n}, m={workspace.m}, not n={n}, m={m}.")
+
+    ws = workspace
+
+    if initial_x is not None:
+        np.copyto(ws.x, initial_x)
+    else:
+        ws.x.fill(1.0 / n)
+        project_x(ws.x, out=ws.x)
+    if initial_y is not None:
+        np.copyto(ws.y, initial_y)
+    else:
+        ws.y.fill(1.0 / m)
+        project_y(ws.y, out=ws.y)
+
+    np.copyto(ws.x_avg, ws.x)
+    np.copyto(ws.y_avg, ws.y)
 
     # Step size parameter (gamma) for extragradient method
     # For L1-L1 games, A_ij <= 1, so ||A||_op <= 1.
@@ -64,50 +122,29 @@ def solve_epsilon_matrix_game(
     gamma = 1.0 / (np.sqrt(m) if game_type == 'L2-L1' else 1.0)
 
     for k in range(1, max_iterations + 1):
-        # Extragradient step 1: Compute a "predictor" point (x_tilde, y_tilde)
-        grad_x = matvec_AT(y)
-        grad_y = -matvec_A(x)
-
-        x_tilde = project_x(x - gamma * grad_x)
-        y_tilde = project_y(y - gamma * grad_y)
-
-        # Extragradient step 2: Compute the actual update using gradients at (x_tilde, y_tilde)
-        grad_x_tilde = matvec_AT(y_tilde)
-        grad_y_tilde = -matvec_A(x_tilde)
-
-        x_next = project_x(x - gamma * grad_x_tilde)
-        y_next = project_y(y - gamma * grad_y_tilde)
+        # Extragradient step 1: predictor (x_tilde, y_tilde) from the gradients at (x, y).
+        # grad_y holds A x, so the y step ascends with -gamma * (-A x).
+        pair(ws.x, ws.y, ws.grad_y, ws.grad_x)
+        _step(ws.x, ws.grad_x, gamma, project_x, ws.step_x, ws.x_tilde)
+        _step(ws.y, ws.grad_y, -gamma, project_y, ws.step_y, ws.y_tilde)
 
-        # Update running averages
-        x_avg = (k * x_avg + x_next) / (k + 1)
-        y_avg = (k * y_avg + y_next) / (k + 1)
+        # Extragradient step 2: update (x, y) in place using the gradients at the predictor.
+        pair(ws.x_tilde, ws.y_tilde, ws.grad_y, ws.grad_x)
+        _step(ws.x, ws.grad_x, gamma, project_x, ws.step_x, ws.x)
+        _step(ws.y, ws.grad_y, -gamma, project_y, ws.step_y, ws.y)
 
-        x = x_next
-        y = y_next
+        # Incremental running averages: avg += (next - avg) / (k + 1)
+        _running_mean(ws.x_avg, ws.x, 1.0 / (k + 1), ws.step_x)
+        _running_mean(ws.y_avg, ws.y, 1.0 / (k + 1), ws.step_y)
 
         # Check for convergence (duality gap)
-        # The duality gap for a zero-sum game is max_y (x_avg^T A y) - min_x (x^T A y_avg)
-        # This requires solving two auxiliary optimization problems.
-        # For L1-L1 games, max_y (x_avg^T A y) is max_j (x_avg^T A_j)
-        # and min_x (x^T A y_avg) is min_i (A_i^T y_avg).
-        # For L2-L1 games, max_y (x_avg^T A y) is max_j (x_avg^T A_j)
-        # and min_x (x^T A y_avg) is -||A y_avg||_2.
-
-        if k % 100 == 0: # Check convergence periodically
-            # Calculate max_y x_avg^T A y
-            val_x_avg_A = matvec_A(x_avg) # This is A x_avg
-            max_val_x_avg_A_y = np.max(val_x_avg_A) # For L1-L1 and L2-L1, max over simplex is max component
-
-            # Calculate min_x x^T A y_avg
-            val_A_y_avg = matvec_AT(y_avg) # This is A^T y_avg
-            if game_type == 'L1-L1':
-                min_val_x_A_y_avg = np.min(val_A_y_avg) # For L1-L1, min over simplex is min component
-            else: # L2-L1
-                min_val_x_A_y_avg = -np.linalg.norm(val_A_y_avg) # For L2 ball, min x^T v is -||v||_2
-
-            duality_gap = max_val_x_avg_A_y - min_val_x_A_y_avg
-
-            if duality_gap <= epsilon:
-                return x_avg, y_avg
-
-    return x_avg, y_avg
\ No newline at end of file
+        # The duality gap for a zero-sum game is max_y (y^T A x_avg) - min_x (y_avg^T A x).
+        # For L1-L1 and L2-L1 games the first term is the largest component of A x_avg.
+        # For L1-L1 the second term is the smallest component of A^T y_avg,
+        # and for L2-L1 it is -||A^T y_avg||_2.
+        if k % 100 == 0:
+            val_A_x_avg, val_A_y_avg = pair(ws.x_avg, ws.y_avg, ws.grad_y, ws.grad_x)
+            if _gap(val_A_x_avg, val_A_y_avg, game_type) <= epsilon:
+                break
+
+    return ws.x_avg.copy(), ws.y_avg.copy()
@@ -1,33 +1,12 @@
 import numpy as np
 from scipy.optimize import linprog
 from typing import Callable, Optional, Tuple
+from .kernels import project_onto_l2_ball, project_onto_simplex
 
 """
 Provides utility functions for matrix game solvers, including projection operations.
 """
 
-def project_onto_simplex(v: np.ndarray) -> np.ndarray:
-    """
-    Projects a given vector onto the probability simplex.
-    """
-    n_features = v.shape[0]
-    u = np.sort(v)[::-1]
-    css = np.cumsum(u)
-    ind = np.arange(1, n_features + 1)
-    rho = np.where(u + (1 - css) / ind > 0)[0][-1]
-    theta = (1 - css[rho]) / (rho + 1)
-    return np.maximum(0, v + theta)
-
-def project_onto_l2_ball(v: np.ndarray) -> np.ndarray:
-    """
-    Projects a given vector onto the unit L2 Euclidean ball.
-    """
-    norm_v = np.linalg.norm(v)
-    if norm_v <= 1:
-        return v
-    else:
-        return v / norm_v
-
 def solve_epsilon_matrix_game(
     matvec_A: Callable[[np.ndarray], np.ndarray],
     matvec_AT: Callable[[np.ndarray], np.ndarray],
@@ -0,0 +1,72 @@
+"""Unit tests for the adaptive extragradient solver."""
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from matrix_game_solver import solve_adaptive, solve_matrix_game
+
+
+def duality_gap(A, x, y, game_type="L1-L1"):
+    if game_type == "L1-L1":
+        return np.max(A @ x) - np.min(A.T @ y)
+    return np.max(A @ x) + np.linalg.norm(A.T @ y)
+
+
+def ill_conditioned(m, n, condition, seed):
+    rng = np.random.default_rng(seed)
+    U, _ = np.linalg.qr(rng.standard_normal((m, m)))
+    V, _ = np.linalg.qr(rng.standard_normal((n, n)))
+    s = np.geomspace(1.0, 1.0 / condition, min(m, n))
+    A = (U[:, :s.size] * s) @ V[:s.size]
+    return A / np.abs(A).max()
+
+
+@pytest.mark.parametrize("game_type", ["L1-L1", "L2-L1"])
+def test_reported_gap_is_the_exact_gap_of_the_returned_point(game_type):
+    A = np.random.default_rng(0).uniform(-1, 1, size=(30, 20))
+
+    result = solve_adaptive(A, 1e-4, game_type=game_type, max_iterations=20000)
+
+    assert result.converged
+    assert result.gap == pytest.approx(duality_gap(A, result.x, result.y, game_type), abs=1e-9)
+    assert result.gap <= 1e-4
+    assert np.isclose(result.y.sum(), 1.0)
+    if game_type == "L1-L1":
+        assert np.isclose(result.x.sum(), 1.0)
+    else:
+        assert np.linalg.norm(result.x) <= 1.0 + 1e-9
+
+
+def test_trace_is_monotone_and_counts_matvecs():
+    A = ill_conditioned(60, 40, 1e3, 1)
+
+    result = solve_adaptive(A, 1e-3, trace_every=10)
+    trace = result.trace
+
+    assert trace["iteration"][0] == 0 and trace["iteration"][-1] == result.iterations
+    assert trace["matvecs"][-1] == result.matvecs
+    assert np.all(np.diff(trace["gap"]) <= 0)
+    assert np.all(np.diff(trace["seconds"]) >= 0)
+    assert sum(trace["restarted"]) == result.restarts > 0
+
+
+def test_needs_fewer_matvecs_than_fixed_step_on_ill_conditioned_game():
+    A = ill_conditioned(80, 50, 1e3, 2)
+
+    result = solve_adaptive(A, 1e-4, max_iterations=20000)
+    x, y = solve_matrix_game(A, 1e-4, max_iterations=result.matvecs // 4)
+
+    assert result.converged
+    assert duality_gap(A, x, y) > 1e-4
+
+
+def test_accepts_sparse_payoffs_and_validates_parameters():
+    A = sp.random(40, 30, density=0.3, format="csr", random_state=3)
+
+    result = solve_adaptive(A, 1e-3)
+
+    assert result.gap == pytest.approx(duality_gap(A.toarray(), result.x, result.y), abs=1e-9)
+    with pytest.raises(ValueError):
+        solve_adaptive(A, 1e-3, game_type="L3")
+    with pytest.raises(ValueError):
+        solve_adaptive(A, 1e-3, shrink=1.5)
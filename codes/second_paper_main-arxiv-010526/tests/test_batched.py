@@ -0,0 +1,49 @@
+"""Unit tests for the batched matrix game solver."""
+
+import numpy as np
+import pytest
+from matrix_game_solver import solve_epsilon_matrix_game, solve_matrix_games, solve_stacked
+
+
+def single(A, epsilon, game_type="L1-L1", max_iterations=10000):
+    m, n = A.shape
+    return solve_epsilon_matrix_game(lambda x: A @ x, lambda y: A.T @ y, n, m, epsilon,
+                                     game_type=game_type, max_iterations=max_iterations)
+
+
+@pytest.mark.parametrize("game_type", ["L1-L1", "L2-L1"])
+def test_stacked_games_match_individual_solves(game_type):
+    rng = np.random.default_rng(0)
+    A = rng.uniform(-1, 1, size=(6, 5, 4)) / 4
+
+    X, Y, iterations, gaps = solve_stacked(A, 1e-3, game_type=game_type, max_iterations=800)
+
+    for b in range(6):
+        x, y = single(A[b], 1e-3, game_type, max_iterations=800)
+        np.testing.assert_allclose(X[b], x, atol=1e-9)
+        np.testing.assert_allclose(Y[b], y, atol=1e-9)
+    assert np.all(iterations % 100 == 0)
+
+
+def test_converged_games_retire_early():
+    easy = np.array([[0.5, -0.5], [-0.5, 0.5]])
+    hard = np.array([[0.9, -0.1], [-0.3, 0.2]])
+
+    _, _, iterations, gaps = solve_stacked(np.stack([easy, hard, easy]), 1e-9, max_iterations=300,
+                                           check_every=10)
+
+    assert iterations[0] == iterations[2] < 300
+    assert gaps[0] <= 1e-9
+
+
+def test_mixed_shapes_run_in_worker_processes():
+    rng = np.random.default_rng(1)
+    games = [rng.uniform(-1, 1, size=shape) / 4 for shape in [(3, 4), (5, 2), (3, 4), (2, 2)]]
+
+    solutions = solve_matrix_games(games, 1e-2, workers=2)
+
+    for A, solution in zip(games, solutions):
+        x, y = single(A, 1e-2)
+        assert solution.x.shape == (A.shape[1],) and solution.y.shape == (A.shape[0],)
+        np.testing.assert_allclose(solution.x, x, atol=1e-9)
+        assert solution.converged and solution.gap <= 1e-2
@@ -0,0 +1,112 @@
+"""Unit tests for the linear-operator backends."""
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from concurrent.futures import ThreadPoolExecutor
+from matrix_game_solver import (
+    DenseOperator,
+    LinearOperator,
+    MemmapOperator,
+    SparseOperator,
+    ThreadedOperator,
+    aslinearoperator,
+    solve_epsilon_matrix_game,
+    solve_matrix_game,
+)
+
+
+@pytest.fixture
+def game():
+    rng = np.random.default_rng(0)
+    A = rng.uniform(-1, 1, size=(37, 23)) / 23
+    return A, rng.standard_normal(23), rng.standard_normal(37)
+
+
+def backends(A, tmp_path):
+    path = str(tmp_path / "payoff.npy")
+    np.save(path, A)
+    raw = str(tmp_path / "payoff.bin")
+    A.astype(np.float64).tofile(raw)
+    return [
+        DenseOperator(A),
+        DenseOperator(A, block_rows=5),
+        SparseOperator(sp.csr_matrix(A)),
+        SparseOperator(sp.csc_matrix(A)),
+        MemmapOperator.open(path, block_rows=4),
+        MemmapOperator.open(raw, shape=A.shape, block_rows=6, workers=2),
+        ThreadedOperator(A, workers=3, block_rows=2),
+    ]
+
+
+def test_backends_agree_with_numpy(game, tmp_path):
+    A, x, y = game
+    for operator in backends(A, tmp_path):
+        with operator:
+            out, rout = np.empty(37), np.empty(23)
+            np.testing.assert_allclose(operator.matvec(x), A @ x)
+            np.testing.assert_allclose(operator.rmatvec(y), A.T @ y)
+            ax, aty = operator.matvec_pair(x, y, out, rout)
+            assert ax is out and aty is rout
+            np.testing.assert_allclose(ax, A @ x)
+            np.testing.assert_allclose(aty, A.T @ y)
+
+
+def test_aslinearoperator_picks_backend(game, tmp_path):
+    A, _, _ = game
+    path = str(tmp_path / "payoff.npy")
+    np.save(path, A)
+
+    assert isinstance(aslinearoperator(A), DenseOperator)
+    assert isinstance(aslinearoperator(sp.coo_matrix(A)), SparseOperator)
+    assert isinstance(aslinearoperator(np.load(path, mmap_mode="r")), MemmapOperator)
+    operator = ThreadedOperator(A, workers=2)
+    assert aslinearoperator(operator) is operator
+    operator.close()
+
+
+def test_solve_matrix_game_matches_callback_solver(game, tmp_path):
+    A, _, _ = game
+    expected = solve_epsilon_matrix_game(lambda x: A @ x, lambda y: A.T @ y, 23, 37, 1e-3, max_iterations=300)
+
+    for operator in backends(A, tmp_path):
+        with operator:
+            x, y = solve_matrix_game(operator, 1e-3, max_iterations=300)
+        np.testing.assert_allclose(x, expected[0], atol=1e-10)
+        np.testing.assert_allclose(y, expected[1], atol=1e-10)
+
+
+def test_raw_memmap_requires_shape(tmp_path):
+    path = tmp_path / "payoff.bin"
+    np.zeros(4).tofile(path)
+
+    with pytest.raises(ValueError):
+        MemmapOperator.open(str(path))
+
+
+def test_operator_without_rmatvec_cannot_be_created():
+    class RowsOnly(LinearOperator):
+        shape = (2, 2)
+
+        def matvec(self, x, out=None):
+            return x
+
+    with pytest.raises(TypeError):
+        RowsOnly()
+
+
+def test_concurrent_pairs_on_one_operator_do_not_share_accumulators(game):
+    A, _, _ = game
+    rng = np.random.default_rng(1)
+    ys = rng.standard_normal((2, 37))
+
+    with ThreadedOperator(A, workers=3, block_rows=4) as operator:
+        def products(y):
+            return [operator.matvec_pair(None, y)[1] for _ in range(200)]
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(products, ys))
+
+    for y, rows in zip(ys, results):
+        for rout in rows:
+            np.testing.assert_allclose(rout, A.T @ y)
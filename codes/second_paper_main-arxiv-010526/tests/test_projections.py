@@ -1,20 +1,84 @@
+"""Unit tests for the projection kernels."""
+
 import numpy as np
-from scipy.optimize import lsq_linear
-
-def project_onto_simplex(v: np.ndarray) -> np.ndarray:
-    """Projects a given vector onto the probability simplex."""
-    n = v.shape[0]
-    u = np.sort(v)[::-1]
-    cssv = np.cumsum(u)
-    ind = np.arange(1, n + 1)
-    rho = np.where(u * ind > (cssv - 1))[0][-1]
-    theta = (cssv[rho] - 1) / (rho + 1)
-    return np.maximum(v - theta, 0)
-
-def project_onto_l2_ball(v: np.ndarray) -> np.ndarray:
-    """Projects a given vector onto the unit L2 Euclidean ball."""
-    norm_v = np.linalg.norm(v)
-    if norm_v <= 1:
-        return v
-    else:
-        return v / norm_v
\ No newline at end of file
+import pytest
+from matrix_game_solver.kernels import (
+    SORT_CUTOFF,
+    project_onto_l2_ball,
+    project_onto_simplex,
+    project_rows_onto_l2_ball,
+    project_rows_onto_simplex,
+    simplex_threshold,
+)
+
+
+@pytest.mark.parametrize("n", [1, 7, SORT_CUTOFF + 1, 50_000])
+def test_simplex_projection_matches_batched_sort(n):
+    rng = np.random.default_rng(n)
+    v = rng.standard_normal(n) * 3
+
+    x = project_onto_simplex(v)
+
+    assert np.all(x >= 0)
+    assert x.sum() == pytest.approx(1.0)
+    np.testing.assert_allclose(x, project_rows_onto_simplex(v[None, :])[0], atol=1e-12)
+
+
+def test_simplex_projection_handles_ties_and_radius():
+    v = np.concatenate([np.full(3000, 0.25), np.zeros(3000)])
+
+    x = project_onto_simplex(v, radius=2.0)
+
+    assert x.sum() == pytest.approx(2.0)
+    np.testing.assert_allclose(x[:3000], x[0])
+    assert simplex_threshold(np.array([0.3, 0.3, 0.4])) == pytest.approx(0.0)
+
+
+def test_points_on_the_simplex_are_fixed():
+    v = np.array([0.2, 0.5, 0.3])
+
+    np.testing.assert_allclose(project_onto_simplex(v), v)
+
+
+def test_out_buffer_is_reused():
+    v = np.random.default_rng(0).standard_normal(5000)
+    out = np.empty_like(v)
+
+    assert project_onto_simplex(v, out=out) is out
+    assert project_onto_l2_ball(v, out=out) is out
+    assert project_rows_onto_simplex(v.reshape(50, 100), out=out.reshape(50, 100)).base is out
+
+
+def test_batched_rows_are_projected_independently():
+    rng = np.random.default_rng(1)
+    V = rng.standard_normal((20, 30))
+
+    X = project_rows_onto_simplex(V)
+
+    for row, x in zip(V, X):
+        np.testing.assert_allclose(x, project_onto_simplex(row), atol=1e-12)
+
+
+def test_l2_ball_projection():
+    v = np.array([3.0, 4.0])
+
+    np.testing.assert_allclose(project_onto_l2_ball(v), [0.6, 0.8])
+    np.testing.assert_allclose(project_onto_l2_ball(v * 0.1), v * 0.1)
+    np.testing.assert_allclose(
+        project_rows_onto_l2_ball(np.array([[3.0, 4.0], [0.0, 0.0], [0.3, 0.4]])),
+        [[0.6, 0.8], [0.0, 0.0], [0.3, 0.4]],
+    )
+
+
+def test_empty_vector_is_rejected():
+    with pytest.raises(ValueError):
+        project_onto_simplex(np.array([]))
+
+
+@pytest.mark.parametrize("radius, v", [(0.0, [0.5, 0.5]), (-1.0, [0.5, 0.5]), (1.0, [np.nan, 0.5]),
+                                      (1.0, [np.inf, 0.5])])
+def test_invalid_radius_and_entries_are_rejected(radius, v):
+    with pytest.raises(ValueError):
+        simplex_threshold(np.array(v), radius)
+    with pytest.raises(ValueError):
+        project_onto_simplex(np.array(v * 600), radius)
@@ -1,30 +1,89 @@
 """Unit and integration tests for the main solver function."""
 
+import tracemalloc
 import numpy as np
 import pytest
-from typing import Callable, Tuple, Optional
-
-# Assume these functions are in a module named 'src.solver'.
-# For the purpose of this exercise, they are defined here to make the test file
-# self-contained and runnable without creating a full 'src' directory structure.
-# In a real project, these would be imported from 'src.solver'.
-
-def project_onto_simplex(v: np.ndarray) -> np.ndarray:
-    """Projects a given vector onto the probability simplex."""
-    n_features = v.shape[0]
-    u = np.sort(v)[::-1]
-    cssv = np.cumsum(u)
-    ind = np.arange(1, n_features + 1)
-    rho = np.where(u - (cssv - 1) / ind > 0)[0][-1]
-    theta = (cssv[rho] - 1) / (rho + 1)
-    return np.maximum(v - theta, 0)
-
-def project_onto_l2_ball(v: np.ndarray) -> np.ndarray:
-    """Projects a given vector onto the unit L2 Euclidean ball."""
-    norm_v = np.linalg.norm(v)
-    if norm_v > 1:
-        return v / norm_v
-    return v
-
-def solve_epsilon_matrix_game(
-    mat
\ No newline at end of file
+from matrix_game_solver import SolverWorkspace, solve_epsilon_matrix_game
+
+
+def duality_gap(A, x, y, game_type="L1-L1"):
+    """Returns max_y y^T A x minus min_x y^T A x for the given strategies."""
+    best_response_x = np.min(A.T @ y) if game_type == "L1-L1" else -np.linalg.norm(A.T @ y)
+    return np.max(A @ x) - best_response_x
+
+
+def solve(A, epsilon, game_type="L1-L1", **kwargs):
+    m, n = A.shape
+    return solve_epsilon_matrix_game(lambda x: A @ x, lambda y: A.T @ y, n, m, epsilon,
+                                     game_type=game_type, **kwargs)
+
+
+def test_matching_pennies_converges_to_uniform_strategies():
+    A = np.array([[0.5, -0.5], [-0.5, 0.5]])
+
+    x, y = solve(A, 1e-3)
+
+    np.testing.assert_allclose(x, [0.5, 0.5], atol=1e-2)
+    np.testing.assert_allclose(y, [0.5, 0.5], atol=1e-2)
+
+
+def test_random_l1_game_reaches_epsilon():
+    rng = np.random.default_rng(0)
+    A = rng.uniform(-1, 1, size=(12, 8)) / 8
+
+    x, y = solve(A, 1e-2)
+
+    assert x.sum() == pytest.approx(1.0) and y.sum() == pytest.approx(1.0)
+    assert duality_gap(A, x, y) <= 1e-2
+
+
+def test_l2_l1_strategies_stay_feasible():
+    rng = np.random.default_rng(1)
+    A = rng.standard_normal((6, 4))
+    A /= np.linalg.norm(A, axis=1, keepdims=True)
+
+    x, y = solve(A, 1e-2, game_type="L2-L1", max_iterations=2000)
+
+    assert np.linalg.norm(x) <= 1 + 1e-9
+    assert np.all(y >= 0) and y.sum() == pytest.approx(1.0)
+
+
+def test_unknown_game_type_is_rejected():
+    with pytest.raises(ValueError):
+        solve(np.eye(2), 1e-2, game_type="L2-L2")
+
+
+def test_workspace_and_out_matvecs_match_the_default_path():
+    rng = np.random.default_rng(2)
+    A = rng.uniform(-1, 1, size=(9, 7)) / 7
+    workspace = SolverWorkspace(7, 9)
+
+    expected = solve(A, 1e-3, max_iterations=500)
+    first = solve_epsilon_matrix_game(lambda x, out: np.matmul(A, x, out=out),
+                                      lambda y, out: np.matmul(A.T, y, out=out),
+                                      7, 9, 1e-3, max_iterations=500, workspace=workspace, matvec_out=True)
+    second = solve(A, 1e-3, max_iterations=500, workspace=workspace)
+
+    for actual in (first, second):
+        np.testing.assert_allclose(actual[0], expected[0])
+        np.testing.assert_allclose(actual[1], expected[1])
+
+    with pytest.raises(ValueError):
+        solve(A.T, 1e-3, workspace=workspace)
+
+
+def test_inner_loop_does_not_allocate_iterates():
+    n = 20_000
+    d = np.random.default_rng(3).uniform(-1, 1, n)
+    workspace = SolverWorkspace(n, n)
+    matvec = lambda v, out: np.multiply(d, v, out=out)
+
+    tracemalloc.start()
+    try:
+        solve_epsilon_matrix_game(matvec, matvec, n, n, 0.0, max_iterations=50,
+                                  workspace=workspace, matvec_out=True)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak < 4 * n * 8
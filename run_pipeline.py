@@ -1,6 +1,55 @@
+import argparse
+import os
 from src.pipeline import PaperToProdPipeline
+from src.batch import BatchRunner
+from src.service import PaperService, make_server
+from src.spec_index import DEFAULT_INDEX_DIR
 from dotenv import load_dotenv
-load_dotenv() 
+load_dotenv()
 if __name__ == "__main__":
-    pipeline = PaperToProdPipeline()
-    pipeline.run("samples/second_paper_main-arxiv-010526.tex")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Turn research papers into codebases.")
+    parser.add_argument("papers", nargs="*", default=["samples/second_paper_main-arxiv-010526.tex"],
+                        help="paper files, directories or glob patterns")
+    parser.add_argument("--workers", type=int, default=4, help="papers processed in parallel")
+    parser.add_argument("--max-workers", type=int, default=4, help="files generated in parallel per paper")
+    parser.add_argument("--output", default="codes", help="output root directory")
+    parser.add_argument("--manifest", default=None, help="batch manifest path")
+    parser.add_argument("--resume", action="store_true", help="reuse completed stages from a previous run")
+    parser.add_argument("--trace", action="store_true", help="also export a Chrome trace of each run")
+    parser.add_argument("--no-validate", action="store_true", help="skip sandboxed validation of generated code")
+    parser.add_argument("--repair-rounds", type=int, default=2, help="times a failing file is regenerated")
+    parser.add_argument("--no-reuse", action="store_true", help="do not reuse plans from similar papers")
+    parser.add_argument("--serve", action="store_true", help="run as a resident service that accepts paper jobs")
+    parser.add_argument("--host", default="127.0.0.1", help="service host")
+    parser.add_argument("--port", type=int, default=8765, help="service port")
+    parser.add_argument("--socket", default=None, help="serve on this Unix socket instead of TCP")
+    args = parser.parse_args()
+    index_dir = None if args.no_reuse else DEFAULT_INDEX_DIR
+
+    if args.serve:
+        service = PaperService(workers=args.workers, max_workers=args.max_workers, output_root=args.output,
+                               trace=args.trace, validate=not args.no_validate,
+                               repair_rounds=args.repair_rounds, index_dir=index_dir).start()
+        server = make_server(service, args.host, args.port, args.socket)
+        print(f"Serving on {args.socket or f'http://{args.host}:{server.server_port}'}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            service.stop()
+    elif len(args.papers) == 1 and os.path.isfile(args.papers[0]):
+        pipeline = PaperToProdPipeline(max_workers=args.max_workers, output_root=args.output,
+                                       resume=args.resume, trace=args.trace, validate=not args.no_validate,
+                                       repair_rounds=args.repair_rounds, index_dir=index_dir)
+        print(pipeline.run(args.papers[0]))
+        print(pipeline.last_run["summary"])
+    else:
+        runner = BatchRunner(workers=args.workers, max_workers=args.max_workers, output_root=args.output,
+                             resume=args.resume, trace=args.trace, validate=not args.no_validate,
+                             repair_rounds=args.repair_rounds, index_dir=index_dir)
+        manifest = runner.run(*args.papers, manifest_path=args.manifest)
+        for paper in manifest["papers"]:
+            print(f"{paper['status']:6} {paper['seconds']:8.1f}s  {paper['paper']}")
+        print(f"{manifest['succeeded']} succeeded, {manifest['failed']} failed")
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import secrets
+import stat
+import tempfile
+import threading
+from src.telemetry import record_bytes
+
+
+MANIFEST_NAME = ".paper2prod-manifest.json"
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _create_temp(directory: str) -> tuple:
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        path = os.path.join(directory, f".{secrets.token_hex(8)}.tmp")
+        try:
+            return os.open(path, flags, 0o666), path
+        except FileExistsError:
+            continue
+
+
+class ArtifactWriter:
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        self.manifest = self._load()
+        self.written = []
+        self.unchanged = []
+        self._dirs = set()
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def prepare(self, paths) -> None:
+        dirs = {os.path.dirname(os.path.join(self.output_dir, path)) for path in paths}
+        dirs.add(self.output_dir)
+        with self._lock:
+            missing = sorted(dirs - self._dirs)
+            self._dirs.update(missing)
+        for directory in missing:
+            os.makedirs(directory, exist_ok=True)
+
+    def write(self, path: str, content: str) -> bool:
+        data = content.encode("utf-8")
+        digest = hash_bytes(data)
+        target = os.path.join(self.output_dir, path)
+
+        if self._matches(path, target, digest, len(data)):
+            with self._lock:
+                self.unchanged.append(path)
+                self._record(path, target, digest, len(data))
+            return False
+
+        self.prepare([path])
+        fd, tmp_path = _create_temp(os.path.dirname(target))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                self._keep_mode(f.fileno(), target)
+            os.replace(tmp_path, target)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        record_bytes(content)
+
+        with self._lock:
+            self.written.append(path)
+            self._record(path, target, digest, len(data))
+        return True
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            manifest = dict(sorted(self.manifest.items()))
+            self._dirty = False
+        os.makedirs(self.output_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.output_dir, prefix=".", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"files": manifest}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def _matches(self, path: str, target: str, digest: str, size: int) -> bool:
+        try:
+            stat = os.stat(target)
+        except OSError:
+            return False
+        if stat.st_size != size:
+            return False
+
+        entry = self.manifest.get(path) or {}
+        if entry.get("sha256") == digest and entry.get("mtime_ns") == stat.st_mtime_ns:
+            return True
+        with open(target, "rb") as f:
+            return hash_bytes(f.read()) == digest
+
+    def _keep_mode(self, fd: int, target: str) -> None:
+        try:
+            mode = stat.S_IMODE(os.stat(target).st_mode)
+        except OSError:
+            return
+        if hasattr(os, "fchmod"):
+            os.fchmod(fd, mode)
+
+    def _record(self, path: str, target: str, digest: str, size: int) -> None:
+        entry = {"sha256": digest, "bytes": size, "mtime_ns": os.stat(target).st_mtime_ns}
+        if self.manifest.get(path) != entry:
+            self.manifest[path] = entry
+            self._dirty = True
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f).get("files", {})
+        except (OSError, json.JSONDecodeError, AttributeError):
+            return {}
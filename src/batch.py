@@ -0,0 +1,89 @@
+import glob
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.llm_client import get_client
+from src.paper_parser import PaperParser
+from src.pipeline import PaperToProdPipeline
+from src.spec_index import DEFAULT_INDEX_DIR
+
+
+class BatchRunner:
+    def __init__(self, workers: int = 4, max_workers: int = 4, output_root: str = "codes",
+                 resume: bool = False, trace: bool = False, validate: bool = True,
+                 repair_rounds: int = 2, index_dir: str | None = DEFAULT_INDEX_DIR, pipeline_factory=None):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+        self.output_root = output_root
+        self.pipeline_factory = pipeline_factory or (
+            lambda: PaperToProdPipeline(max_workers=max_workers, output_root=output_root, resume=resume,
+                                        trace=trace, validate=validate,
+                                        repair_rounds=repair_rounds, index_dir=index_dir)
+        )
+
+    def discover(self, *patterns: str) -> list:
+        papers = []
+        for pattern in patterns:
+            if os.path.isdir(pattern):
+                candidates = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+            else:
+                candidates = glob.glob(pattern, recursive=True)
+
+            papers.extend(
+                path for path in candidates
+                if os.path.isfile(path)
+                and os.path.splitext(path)[1].lower() in PaperParser.SUPPORTED_EXTENSIONS
+            )
+
+        return sorted(dict.fromkeys(papers))
+
+    def run(self, *patterns: str, manifest_path: str | None = None) -> dict:
+        papers = self.discover(*patterns)
+        if not papers:
+            raise ValueError(f"No supported papers found for {list(patterns)}")
+
+        started_at = time.time()
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            results = list(pool.map(self._run_one, papers))
+
+        manifest = {
+            "started_at": started_at,
+            "total_seconds": time.perf_counter() - start,
+            "workers": self.workers,
+            "succeeded": sum(1 for r in results if r["status"] == "ok"),
+            "failed": sum(1 for r in results if r["status"] == "failed"),
+            "cache": get_client().cache.stats(),
+            "papers": results,
+        }
+
+        manifest_path = manifest_path or os.path.join(self.output_root, "batch_manifest.json")
+        os.makedirs(os.path.dirname(manifest_path) or ".", exist_ok=True)
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+        return manifest
+
+    def _run_one(self, paper: str) -> dict:
+        start = time.perf_counter()
+        try:
+            output_dir = self.pipeline_factory().run(paper)
+        except Exception as e:
+            return {
+                "paper": paper,
+                "status": "failed",
+                "output_dir": None,
+                "seconds": time.perf_counter() - start,
+                "error": f"{type(e).__name__}: {e}",
+            }
+
+        return {
+            "paper": paper,
+            "status": "ok",
+            "output_dir": output_dir,
+            "seconds": time.perf_counter() - start,
+            "error": None,
+        }
@@ -0,0 +1,81 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from src.telemetry import record_bytes
+
+
+DEFAULT_RUNS_DIR = os.path.join(".paper2prod", "runs")
+
+
+def hash_file(fileName: str, *extra_files: str) -> str:
+    digest = hashlib.sha256()
+    for path in (fileName,) + extra_files:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+class RunStore:
+    def __init__(self, fileName: str, root: str = DEFAULT_RUNS_DIR, resume: bool = False,
+                 dependencies=()):
+        main = os.path.realpath(fileName)
+        self.input_hash = hash_file(fileName, *[d for d in dependencies if os.path.realpath(d) != main])
+        self.run_dir = os.path.join(root, self.input_hash[:16])
+        self.resume = resume
+        self.skipped = []
+
+        os.makedirs(self.run_dir, exist_ok=True)
+        self._write(
+            os.path.join(self.run_dir, "run.json"),
+            json.dumps({"paper": fileName, "input_hash": self.input_hash, "updated_at": time.time()}, indent=2)
+        )
+
+    def stage(self, name: str, fn):
+        if self.resume and self.has(name):
+            self.skipped.append(name)
+            return self.load(name)
+
+        data = fn()
+        self.save(name, data)
+        return data
+
+    def has(self, name: str) -> bool:
+        return os.path.exists(self._stage_path(name))
+
+    def load(self, name: str):
+        with open(self._stage_path(name), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, name: str, data) -> None:
+        self._write(self._stage_path(name), json.dumps(data, indent=2, ensure_ascii=False))
+
+    def artifact(self, path: str, fn) -> str:
+        target = self._artifact_path(path)
+        if self.resume and os.path.exists(target):
+            self.skipped.append(path)
+            with open(target, "r", encoding="utf-8") as f:
+                return f.read()
+
+        content = fn()
+        self._write(target, content)
+        return content
+
+    def _stage_path(self, name: str) -> str:
+        return os.path.join(self.run_dir, f"{name}.json")
+
+    def _artifact_path(self, path: str) -> str:
+        normalized = os.path.normpath(path)
+        if os.path.isabs(normalized) or normalized.startswith(".."):
+            raise ValueError(f"Artifact path escapes run directory: {path}")
+        return os.path.join(self.run_dir, "artifacts", normalized)
+
+    def _write(self, path: str, content: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        record_bytes(content)
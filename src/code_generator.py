@@ -1,6 +1,13 @@
+import contextvars
+import hashlib
 import os
 import re
-from src.problem_extractor import call_gemini
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from src.artifact_writer import ArtifactWriter
+from src.llm_client import call_gemini
+from src.telemetry import span
 
 
 class CodeGenerator:
@@ -14,44 +21,164 @@ class CodeGenerator:
     - No inline comments (No #)
     - Minimal docstrings only
 """
-    def generate(self, problem_spec:dict, code_plan:dict, paper_name:str, output_dir="codes") -> str:
-        paper_dir = os.path.join(output_dir, self._sanitize_name(paper_name))
-        os.makedirs(paper_dir, exist_ok=True)
+    def __init__(self, max_workers: int = 4):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.file_timings = {}
+        self.repair_timings = {}
+        self._writers = {}
+        self._writers_lock = threading.Lock()
 
-        init_file = os.path.join(paper_dir, "__init__.py")
-        if not os.path.exists(init_file):
-            open(init_file, "w").close()
+    def generate(self, problem_spec:dict, code_plan:dict, paper_name:str, output_dir="codes",
+                 store=None, skip=(), readme=True) -> str:
+        paper_dir = self.paper_dir(paper_name, output_dir)
+        writer = self.writer(paper_dir)
+        writer.prepare(file["path"] for file in code_plan["files"])
+        if not os.path.exists(os.path.join(paper_dir, "__init__.py")):
+            writer.write("__init__.py", "")
 
+        self.file_timings = {}
 
-        for file in code_plan["files"]:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [
+                pool.submit(contextvars.copy_context().run, self._generate_file,
+                            problem_spec, file, code_plan, paper_dir, store)
+                for file in code_plan["files"]
+                if file["path"] not in skip
+            ]
+            if readme and "README.md" not in skip:
+                futures.append(
+                    pool.submit(contextvars.copy_context().run, self._generate_readme,
+                                problem_spec, paper_name, paper_dir, store)
+                )
+
+            try:
+                for future in as_completed(futures):
+                    path, seconds = future.result()
+                    self.file_timings[path] = seconds
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+            finally:
+                writer.save()
+
+        return paper_dir
+
+    def repair(self, problem_spec: dict, code_plan: dict, paper_dir: str, feedback: dict,
+               attempt: int = 1, store=None) -> list:
+        files = {file["path"]: file for file in code_plan["files"]}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [
+                pool.submit(contextvars.copy_context().run, self._repair_file,
+                            problem_spec, files[path], code_plan, paper_dir, error, attempt, store)
+                for path, error in sorted(feedback.items())
+                if path in files
+            ]
+
+            repaired = []
+            try:
+                for future in as_completed(futures):
+                    path, seconds = future.result()
+                    self.repair_timings[path] = self.repair_timings.get(path, 0.0) + seconds
+                    repaired.append(path)
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+            finally:
+                self.writer(paper_dir).save()
+
+        return sorted(repaired)
+
+    def paper_dir(self, paper_name: str, output_dir="codes") -> str:
+        return os.path.join(output_dir, self._sanitize_name(paper_name))
+
+    def writer(self, paper_dir: str) -> ArtifactWriter:
+        with self._writers_lock:
+            key = os.path.abspath(paper_dir)
+            if key not in self._writers:
+                self._writers[key] = ArtifactWriter(paper_dir)
+            return self._writers[key]
+
+    def fingerprints(self, problem_spec: dict, code_plan: dict, paper_name: str, readme=True) -> dict:
+        prompts = {
+            file["path"]: self._build_prompt(problem_spec, file, code_plan)
+            for file in code_plan["files"]
+        }
+        if readme:
+            prompts["README.md"] = CodeGenerator.build_paper_readme_prompt(paper_name, [problem_spec])
+        return {
+            path: hashlib.sha256((self.SYSTEM_PROMPT + prompt).encode("utf-8")).hexdigest()
+            for path, prompt in prompts.items()
+        }
+
+    def _generate_file(self, problem_spec, file, code_plan, paper_dir, store=None):
+        with span(file["path"], "file"):
+            return self._write_file(problem_spec, file, code_plan, paper_dir, store)
+
+    def _write_file(self, problem_spec, file, code_plan, paper_dir, store=None):
+        start = time.perf_counter()
+        prompt = self._build_prompt(
+            problem_spec,
+            file,
+            code_plan
+        )
+
+        code = self._complete(
+            store,
+            os.path.join("files", file["path"]),
+            lambda: self._clean_code(call_gemini(self.SYSTEM_PROMPT, prompt))
+        )
+        self.writer(paper_dir).write(file["path"], code)
+
+        return file["path"], time.perf_counter() - start
+
+    def _repair_file(self, problem_spec, file, code_plan, paper_dir, error, attempt, store=None):
+        with span(file["path"], "repair", attempt=attempt):
+            start = time.perf_counter()
             path = os.path.join(paper_dir, file["path"])
-            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "r", encoding="utf-8") as f:
+                current = f.read()
 
-            prompt = self._build_prompt(
-                problem_spec,
-                file,
-                code_plan
+            prompt = self._build_repair_prompt(problem_spec, file, code_plan, current, error)
+            key = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+            code = self._complete(
+                store,
+                os.path.join("repairs", str(attempt), key, file["path"]),
+                lambda: self._clean_code(call_gemini(self.SYSTEM_PROMPT, prompt))
             )
+            self.writer(paper_dir).write(file["path"], code)
 
-            code = call_gemini(self.SYSTEM_PROMPT, prompt)
-            code = self._clean_code(code)
-
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(code)
+            return file["path"], time.perf_counter() - start
 
+    def _generate_readme(self, problem_spec, paper_name, paper_dir, store=None):
+        with span("README.md", "file"):
+            return self._write_readme(problem_spec, paper_name, paper_dir, store)
 
+    def _write_readme(self, problem_spec, paper_name, paper_dir, store=None):
+        start = time.perf_counter()
         readme_prompt = CodeGenerator.build_paper_readme_prompt(
             paper_name,
             [problem_spec]   # wrap in list
         )
 
-        readme = call_gemini(self.SYSTEM_PROMPT, readme_prompt)
+        readme = self._complete(
+            store,
+            os.path.join("files", "README.md"),
+            lambda: call_gemini(self.SYSTEM_PROMPT, readme_prompt).strip()
+        )
 
-        with open(os.path.join(paper_dir, "README.md"), "w", encoding="utf-8") as f:
-            f.write(readme.strip())
+        self.writer(paper_dir).write("README.md", readme)
 
-        return paper_dir
-    
+        return "README.md", time.perf_counter() - start
+
+    def _complete(self, store, artifact, fn):
+        if store is None:
+            return fn()
+        return store.artifact(artifact, fn)
 
     def _build_prompt(self, problem_spec, file, plan):
         return f"""
@@ -80,6 +207,18 @@ class CodeGenerator:
         {plan.get("dependencies", [])}
         """
     
+    def _build_repair_prompt(self, problem_spec, file, plan, current, error):
+        return self._build_prompt(problem_spec, file, plan) + f"""
+        The current version of this file fails validation.
+        Fix it and return the COMPLETE corrected file.
+
+        VALIDATION ERROR:
+        {error}
+
+        CURRENT CODE:
+        {current}
+        """
+
     def _clean_code(self, text: str) -> str:
         text = re.sub(r"```[\w]*", "", text)
         return text.strip()
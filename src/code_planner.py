@@ -1,6 +1,7 @@
 import json
-import re
-from src.problem_extractor import call_gemini
+from dataclasses import asdict
+from src.models.code_plan import CodePlan
+from src.structured_output import request_structured
 
 
 class CodePlanner:
@@ -40,18 +41,4 @@ class CodePlanner:
         {json.dumps(problem_spec, indent=2)}
 """
              
-        response = call_gemini(self.SYSTEM_PROMPT, prompt)
-        response = self._clean_json(response)
-        try:
-            return json.loads(response)
-        except json.JSONDecodeError as e:
-            raise RuntimeError(
-                f"Invalid JSON from CodePlanner\nRAW RESPONSE:\n{response}"
-            ) from e
-    
-    def _clean_json(self, text: str) -> str:
-        return (
-            text.strip()
-            .replace("```json", "")
-            .replace("```", "")
-        )
\ No newline at end of file
+        return asdict(request_structured(self.SYSTEM_PROMPT, prompt, CodePlan))
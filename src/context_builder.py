@@ -0,0 +1,133 @@
+import math
+import re
+from collections import Counter
+
+
+TOKEN_PATTERN = re.compile(r"[A-Za-z]{1,6}|\d{1,3}|[^\sA-Za-z\d]")
+TERM_PATTERN = re.compile(r"[a-z][a-z0-9]+")
+
+EXTRACTION_QUERY = """
+problem goal objective minimize maximize minimization maximization optimize optimization
+solve solution equilibrium feasibility find compute approximate exact epsilon accuracy tolerance
+input inputs output outputs given matrix vector function oracle access query
+constraint constraints subject assumption assumptions assume suppose convex smooth bounded
+error loss regret gap duality guarantee complexity runtime iterations
+we study consider address present propose main contribution result
+"""
+
+LANGUAGE_QUERY = """
+implementation implemented code software library package framework toolbox
+python numpy scipy pytorch torch tensorflow jax matlab octave julia cuda gpu
+cpp fortran rust java cran rstudio openmp mathematica simulation experiments experimental benchmark
+"""
+
+PRIORITY_TITLES = {
+    "abstract", "introduction", "overview", "problem", "preliminaries",
+    "setup", "setting", "formulation", "model", "results",
+}
+
+
+def estimate_tokens(text: str) -> int:
+    return len(TOKEN_PATTERN.findall(text))
+
+
+def _terms(text: str) -> list:
+    return TERM_PATTERN.findall(text.lower())
+
+
+class ContextBuilder:
+    def __init__(self, budget_tokens: int = 6000, query: str = EXTRACTION_QUERY,
+                 chunk_words: int = 200, k1: float = 1.5, b: float = 0.75):
+        if budget_tokens <= 0:
+            raise ValueError("budget_tokens must be positive")
+        self.budget_tokens = budget_tokens
+        self.query = set(_terms(query))
+        self.chunk_words = chunk_words
+        self.k1 = k1
+        self.b = b
+
+    def select(self, sections: dict) -> dict:
+        chunks = self._chunks(sections)
+        if not chunks:
+            return {}
+
+        ranked = [index for _, index in self._rank(chunks) if index != 0]
+        remaining = self.budget_tokens
+        chosen = []
+        title, position, opening = chunks[0]
+        chunks[0] = (title, position, self._truncate(opening, remaining))
+        for index in [0] + ranked:
+            title, position, text = chunks[index]
+            cost = estimate_tokens(text)
+            if cost > remaining:
+                continue
+            chosen.append(index)
+            remaining -= cost
+
+        selected = {}
+        previous = None
+        for index in sorted(chosen):
+            title, position, text = chunks[index]
+            if title in selected:
+                gap = " ... " if previous is not None and index != previous + 1 else " "
+                selected[title]["text"] += gap + text
+            else:
+                selected[title] = {"text": text}
+            previous = index
+
+        return selected
+
+    def render(self, sections: dict) -> str:
+        return "\n\n".join(
+            f"## {title}\n{section['text']}" for title, section in sections.items()
+        )
+
+    def build(self, sections: dict) -> str:
+        return self.render(self.select(sections))
+
+    def _chunks(self, sections: dict) -> list:
+        chunks = []
+        for title, section in sections.items():
+            words = section["text"].split()
+            for position, start in enumerate(range(0, len(words), self.chunk_words)):
+                chunks.append((title, position, " ".join(words[start:start + self.chunk_words])))
+        return chunks
+
+    def _truncate(self, text: str, budget: int) -> str:
+        kept = []
+        for word in text.split():
+            budget -= estimate_tokens(word)
+            if budget < 0:
+                break
+            kept.append(word)
+        return " ".join(kept)
+
+    def _rank(self, chunks: list) -> list:
+        documents = [Counter(_terms(text)) for _, _, text in chunks]
+        lengths = [sum(doc.values()) for doc in documents]
+        average = sum(lengths) / len(lengths) or 1.0
+
+        frequency = Counter()
+        for doc in documents:
+            frequency.update(term for term in doc if term in self.query)
+
+        scores = []
+        for index, (title, position, _) in enumerate(chunks):
+            doc = documents[index]
+            score = 0.0
+            for term in self.query:
+                tf = doc.get(term, 0)
+                if not tf:
+                    continue
+                idf = math.log(1 + (len(chunks) - frequency[term] + 0.5) / (frequency[term] + 0.5))
+                score += idf * tf * (self.k1 + 1) / (
+                    tf + self.k1 * (1 - self.b + self.b * lengths[index] / average)
+                )
+
+            if PRIORITY_TITLES & set(_terms(title)):
+                score *= 1.5
+            if position == 0:
+                score *= 1.25
+            scores.append((score, -index))
+
+        return [(score, -negative) for score, negative in sorted(scores, reverse=True)]
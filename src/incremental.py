@@ -0,0 +1,63 @@
+import hashlib
+import json
+import os
+import tempfile
+
+
+DEFAULT_LINEAGE_DIR = os.path.join(".paper2prod", "lineage")
+
+
+def hash_json(data) -> str:
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Lineage:
+    def __init__(self, paper_name: str, root: str = DEFAULT_LINEAGE_DIR):
+        self.path = os.path.join(root, f"{paper_name}.json")
+        self.previous = self._load()
+        self.current = {"sections": {}, "stages": {}, "files": {}}
+        self.reused = []
+
+    def record_sections(self, fingerprints: dict) -> list:
+        self.current["sections"] = dict(fingerprints)
+        previous = self.previous.get("sections", {})
+        return sorted(
+            title for title in set(previous) | set(fingerprints)
+            if previous.get(title) != fingerprints.get(title)
+        )
+
+    def reuse(self, stage: str, key: str, fn, reusable=None):
+        previous = self.previous.get("stages", {}).get(stage)
+        if previous is not None and previous["key"] == key and (
+            reusable is None or reusable(previous["value"])
+        ):
+            value = previous["value"]
+            self.reused.append(stage)
+        else:
+            value = fn()
+
+        self.current["stages"][stage] = {"key": key, "value": value}
+        return value
+
+    def unchanged_files(self, keys: dict, output_dir: str) -> set:
+        previous = self.previous.get("files", {})
+        self.current["files"] = dict(keys)
+        return {
+            path for path, key in keys.items()
+            if previous.get(path) == key and os.path.exists(os.path.join(output_dir, path))
+        }
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self.current, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
@@ -1,6 +1,10 @@
-import json
+import math
 import re
-from src.problem_extractor import call_gemini
+from collections import Counter
+from dataclasses import asdict
+from src.context_builder import LANGUAGE_QUERY, ContextBuilder
+from src.models.language_choice import LanguageDetection
+from src.structured_output import request_structured
 
 
 SYSTEM_PROMPT = """
@@ -13,13 +17,107 @@ Rules:
 - Do NOT mention code structure
 - Return VALID JSON ONLY
 """
+LANGUAGE_SIGNALS = {
+    "python": {
+        "numpy": 2.0, "scipy": 2.0, "pytorch": 2.0, "torch": 1.5, "tensorflow": 2.0,
+        "keras": 2.0, "jax": 2.0, "sklearn": 2.0, "scikit-learn": 2.0, "pandas": 2.0,
+        "cvxpy": 2.0, "networkx": 2.0, "python": 2.0,
+    },
+    "matlab": {"matlab": 2.0, "octave": 1.5, "simulink": 2.0, "yalmip": 2.0, "cvx": 1.0},
+    "cuda": {"cuda": 2.0, "cublas": 2.0, "cudnn": 2.0, "nvidia": 1.0, "gpu": 0.5},
+    "julia": {"julia": 2.0, "jump.jl": 2.0, "flux.jl": 2.0},
+    "c++": {"c++": 2.0, "cpp": 1.5, "eigen": 0.5, "openmp": 1.0, "stl": 1.0},
+    "c": {"ansi c": 2.0, "pthreads": 1.0, "mpi": 0.5},
+    "fortran": {"fortran": 2.0, "lapack": 0.5, "blas": 0.3},
+    "r": {"cran": 2.0, "ggplot2": 2.0, "r package": 2.0, "rstudio": 2.0},
+    "rust": {"rust": 1.5, "cargo": 1.0},
+    "java": {"java": 2.0, "jvm": 1.5},
+}
+# Domain words only break the tie when a paper names no language or library at all.
+DOMAIN_PRIORS = {
+    "python": {
+        "optimization": 0.3, "gradient": 0.3, "algorithm": 0.3, "matrix": 0.3,
+        "learning": 0.3, "convex": 0.3, "iteration": 0.3, "stochastic": 0.3,
+    },
+}
+
+
+class HeuristicLanguageDetector:
+    def __init__(self, signals: dict = LANGUAGE_SIGNALS, priors: dict = DOMAIN_PRIORS):
+        self.signals = signals
+        self.priors = priors
+        self.patterns = {
+            keyword: re.compile(re.escape(keyword) + r"(?![\w+])")
+            for table in (signals, priors)
+            for terms in table.values()
+            for keyword in terms
+        }
+
+    def detect(self, sections: dict) -> dict:
+        text = "\n".join(section["text"] for section in sections.values()).lower()
+        counts = Counter()
+        for keyword, pattern in self.patterns.items():
+            if keyword in text:
+                counts[keyword] = sum(
+                    1 for match in pattern.finditer(text)
+                    if match.start() == 0 or not self._is_word_char(text[match.start() - 1])
+                )
+
+        scores, reasons = self._score(self.signals, counts)
+        if not scores:
+            scores, reasons = self._score(self.priors, counts)
+
+        total = sum(scores.values())
+        languages = [
+            {
+                "name": language,
+                "confidence": round((1 - math.exp(-score / 2)) * score / total, 3),
+                "reason": reasons[language],
+            }
+            for language, score in scores.items()
+        ]
+        return {
+            "languages": sorted(languages, key=lambda x: x["confidence"], reverse=True),
+            "source": "heuristic",
+        }
+
+    @staticmethod
+    def _score(signals: dict, counts: Counter) -> tuple[dict, dict]:
+        scores = {}
+        reasons = {}
+        for language, terms in signals.items():
+            hits = [(term, counts[term]) for term in terms if counts[term]]
+            if hits:
+                scores[language] = sum(terms[t] * (1 + math.log(n)) for t, n in hits)
+                hits.sort(key=lambda hit: hit[1], reverse=True)
+                reasons[language] = "mentions " + ", ".join(f"{t} ({n})" for t, n in hits[:4])
+        return scores, reasons
+
+    @staticmethod
+    def _is_word_char(char: str) -> bool:
+        return char.isalnum() or char in "_."
+
+
 class LanguageDetector:
+    def __init__(self, token_budget: int = 1000, threshold: float = 0.7):
+        self.context_builder = ContextBuilder(budget_tokens=token_budget, query=LANGUAGE_QUERY)
+        self.heuristic = HeuristicLanguageDetector()
+        self.threshold = threshold
 
-    def detect(self, paper_text:str) -> dict:
+    def detect_local(self, paper_text: str | dict) -> dict | None:
+        local = self.heuristic.detect(self._sections(paper_text))
+        if local["languages"] and local["languages"][0]["confidence"] >= self.threshold:
+            return local
+        return None
+
+    def detect(self, paper_text: str | dict) -> dict:
+        sections = self._sections(paper_text)
+        local = self.detect_local(sections)
+        if local is not None:
+            return local
+
+        context = self.context_builder.build(sections)
 
-        if not paper_text or not paper_text.strip():
-            raise ValueError("Empty paper text passed to LanguageDetector")
-        
         prompt = f"""
         Given the following research paper content, determine the most suitable
         programming language(s) for implementing the algorithms.
@@ -41,22 +139,25 @@ class LanguageDetector:
         }}
 
         PAPER TEXT:
-        {paper_text[:4000]}
+        {context}
         """
 
-        response = call_gemini(SYSTEM_PROMPT, prompt)
-        if not response or not response.strip():
-            raise RuntimeError("LLM returned empty response for language detection")
-
-        data = self._safe_json(response)
+        data = asdict(request_structured(SYSTEM_PROMPT, prompt, LanguageDetection))
         return self._normalize(data)
     
-    def _safe_json(self, text: str) -> dict:
-        text = re.sub(r"```json|```", "", text).strip()
-        match = re.search(r"\{.*\}", text, re.DOTALL)
-        if not match:
-            raise RuntimeError(f"No JSON found in LLM response:\n{text}")
-        return json.loads(match.group(0))
+    def _sections(self, paper_text: str | dict) -> dict:
+        if isinstance(paper_text, dict):
+            sections = paper_text
+        else:
+            sections = {
+                f"Part {i + 1}": {"text": part}
+                for i, part in enumerate(re.split(r"\n\s*\n", paper_text or ""))
+                if part.strip()
+            }
+
+        if not sections:
+            raise ValueError("Empty paper text passed to LanguageDetector")
+        return sections
 
     def _normalize(self, data: dict) -> dict:
         if "languages" not in data or not isinstance(data["languages"], list):
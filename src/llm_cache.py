@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "llm")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+
+def make_cache_key(model: str, system_prompt: str, user_prompt: str,
+                   temperature: float, max_output_tokens: int, *extra) -> str:
+    payload = json.dumps(
+        [model, system_prompt, user_prompt, temperature, max_output_tokens, *extra],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 ttl_seconds: float | None = DEFAULT_TTL_SECONDS, enabled: bool = True):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._index = None
+        self._total_bytes = 0
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        ttl = os.getenv("PAPER2PROD_CACHE_TTL")
+        return cls(
+            cache_dir=os.getenv("PAPER2PROD_CACHE_DIR", DEFAULT_CACHE_DIR),
+            max_bytes=int(os.getenv("PAPER2PROD_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+            ttl_seconds=float(ttl) if ttl else DEFAULT_TTL_SECONDS,
+            enabled=os.getenv("PAPER2PROD_CACHE", "1").lower() not in ("0", "false", "off", "no"),
+        )
+
+    def get(self, key: str) -> str | None:
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            self._load_index()
+            if key not in self._index:
+                self.misses += 1
+                return None
+
+            path = self._path(key)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                self._drop(key)
+                self.misses += 1
+                return None
+
+            if self._expired(entry):
+                self._drop(key)
+                self.misses += 1
+                return None
+
+            self._index.move_to_end(key)
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+
+            self.hits += 1
+            return entry["response"]
+
+    def put(self, key: str, response: str) -> None:
+        if not self.enabled:
+            return
+
+        data = json.dumps(
+            {"created_at": time.time(), "response": response},
+            ensure_ascii=False
+        ).encode("utf-8")
+
+        with self._lock:
+            self._load_index()
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+            self._total_bytes -= self._index.pop(key, 0)
+            self._index[key] = len(data)
+            self._total_bytes += len(data)
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._load_index()
+            for key in list(self._index):
+                self._drop(key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._load_index()
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._index),
+                "bytes": self._total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _expired(self, entry: dict) -> bool:
+        if self.ttl_seconds is None:
+            return False
+        return time.time() - entry.get("created_at", 0) > self.ttl_seconds
+
+    def _load_index(self) -> None:
+        if self._index is not None:
+            return
+
+        entries = []
+        if os.path.isdir(self.cache_dir):
+            for root, _, files in os.walk(self.cache_dir):
+                for name in files:
+                    if not name.endswith(".json"):
+                        continue
+                    st = os.stat(os.path.join(root, name))
+                    entries.append((st.st_mtime, name[:-len(".json")], st.st_size))
+
+        entries.sort()
+        self._index = OrderedDict((key, size) for _, key, size in entries)
+        self._total_bytes = sum(self._index.values())
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            key = next(iter(self._index))
+            self._drop(key)
+            self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        self._total_bytes -= self._index.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
@@ -0,0 +1,534 @@
+import asyncio
+import json
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from src.context_builder import estimate_tokens
+from src.llm_cache import ResponseCache, make_cache_key
+from src.telemetry import span
+
+
+MODEL = "gemini-2.5-flash"
+TEMPERATURE = 0.1
+MAX_OUTPUT_TOKENS = 8192
+CONTINUE_PROMPT = (
+    "Your previous response was cut off. Continue exactly where it stopped, "
+    "without repeating anything or adding commentary."
+)
+
+
+@dataclass(frozen=True)
+class LLMRequest:
+    system_prompt: str
+    user_prompt: str
+    model: str = MODEL
+    temperature: float = TEMPERATURE
+    max_output_tokens: int = MAX_OUTPUT_TOKENS
+    response_schema: str | None = None
+    continuation: str = ""
+
+    def cache_key(self) -> str:
+        extra = [self.response_schema, self.continuation] if self.response_schema or self.continuation else []
+        return make_cache_key(
+            self.model,
+            self.system_prompt,
+            self.user_prompt,
+            self.temperature,
+            self.max_output_tokens,
+            *extra
+        )
+
+    def estimated_tokens(self) -> int:
+        return sum(estimate_tokens(text) for text in (self.system_prompt, self.user_prompt, self.continuation))
+
+
+class RetryableError(Exception):
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class PartialResponseError(RuntimeError):
+    def __init__(self, message: str, partial: str):
+        super().__init__(message)
+        self.partial = partial
+
+
+class LLMBackend(ABC):
+    @abstractmethod
+    def generate(self, request: LLMRequest) -> str:
+        ...
+
+    async def agenerate(self, request: LLMRequest) -> str:
+        return await asyncio.to_thread(self.generate, request)
+
+    def stream(self, request: LLMRequest):
+        yield self.generate(request)
+
+
+class GeminiBackend(LLMBackend):
+    def __init__(self, api_key: str | None = None):
+        self.api_key = api_key or os.getenv("GEMINI_API_KEY")
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                from google import genai
+                self._client = genai.Client(api_key=self.api_key)
+            return self._client
+
+    def generate(self, request: LLMRequest) -> str:
+        try:
+            response = self.client.models.generate_content(
+                model=request.model,
+                contents=self._contents(request),
+                config=self._config(request)
+            )
+        except Exception as e:
+            raise self._translate(e) from e
+        return response.text
+
+    def stream(self, request: LLMRequest):
+        try:
+            for chunk in self.client.models.generate_content_stream(
+                model=request.model,
+                contents=self._contents(request),
+                config=self._config(request)
+            ):
+                if chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            raise self._translate(e) from e
+
+    async def agenerate(self, request: LLMRequest) -> str:
+        try:
+            response = await self.client.aio.models.generate_content(
+                model=request.model,
+                contents=self._contents(request),
+                config=self._config(request)
+            )
+        except Exception as e:
+            raise self._translate(e) from e
+        return response.text
+
+    def _contents(self, request: LLMRequest):
+        if not request.continuation:
+            return request.user_prompt
+
+        from google.genai import types
+        return [
+            types.Content(role="user", parts=[types.Part(text=request.user_prompt)]),
+            types.Content(role="model", parts=[types.Part(text=request.continuation)]),
+            types.Content(role="user", parts=[types.Part(text=CONTINUE_PROMPT)]),
+        ]
+
+    def _config(self, request: LLMRequest):
+        from google.genai import types
+        schema = {}
+        if request.response_schema and not request.continuation:
+            schema = {
+                "response_mime_type": "application/json",
+                "response_json_schema": json.loads(request.response_schema),
+            }
+        return types.GenerateContentConfig(
+            system_instruction=request.system_prompt,
+            temperature=request.temperature,
+            max_output_tokens=request.max_output_tokens,
+            **schema
+        )
+
+    def _translate(self, error: Exception) -> Exception:
+        from google.genai.errors import ClientError, ServerError
+
+        if isinstance(error, ServerError):
+            return RetryableError(str(error))
+        if isinstance(error, ClientError) and error.code == 429:
+            return RetryableError(str(error), retry_after=parse_retry_hint(error))
+        return error
+
+
+class FakeBackend(LLMBackend):
+    def __init__(self, responder=None, latency: float = 0.0, errors=None, chunk_size: int | None = None):
+        self.responder = responder or (lambda request: request.user_prompt)
+        self.latency = latency
+        self.chunk_size = chunk_size
+        self.errors = list(errors or [])
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def generate(self, request: LLMRequest) -> str:
+        error = self._record(request)
+        if self.latency:
+            time.sleep(self.latency)
+        if error is not None:
+            raise error
+        return self._respond(request)
+
+    async def agenerate(self, request: LLMRequest) -> str:
+        error = self._record(request)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if error is not None:
+            raise error
+        return self._respond(request)
+
+    def stream(self, request: LLMRequest):
+        text = self.generate(request)
+        size = self.chunk_size or len(text) or 1
+        for start in range(0, len(text), size):
+            yield text[start:start + size]
+
+    def _record(self, request):
+        with self._lock:
+            self.requests.append(request)
+            return self.errors.pop(0) if self.errors else None
+
+    def _respond(self, request):
+        if isinstance(self.responder, dict):
+            for marker, response in self.responder.items():
+                if marker in request.user_prompt:
+                    return response
+            raise KeyError("FakeBackend has no response for this prompt")
+        return self.responder(request)
+
+
+class CassetteMissError(KeyError):
+    pass
+
+
+class CassetteBackend(LLMBackend):
+    MODES = ("replay", "record", "auto")
+
+    def __init__(self, cassette_dir: str, mode: str = "replay", backend: LLMBackend | None = None,
+                 fallback: LLMBackend | None = None, replay_latency: bool = False):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.cassette_dir = cassette_dir
+        self.mode = mode
+        self.backend = backend
+        self.fallback = fallback
+        self.replay_latency = replay_latency
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, backend: LLMBackend | None = None) -> "CassetteBackend | None":
+        cassette_dir = os.getenv("PAPER2PROD_CASSETTES")
+        if not cassette_dir:
+            return None
+        return cls(cassette_dir, mode=os.getenv("PAPER2PROD_CASSETTE_MODE", "replay"), backend=backend)
+
+    def generate(self, request: LLMRequest) -> str:
+        cassette = None if self.mode == "record" else self._load(request)
+        if cassette is not None:
+            if self.replay_latency:
+                time.sleep(cassette.get("seconds", 0.0))
+            return cassette["response"]
+
+        backend = self._miss(request)
+        start = time.perf_counter()
+        text = backend.generate(request)
+        self._store(request, text, time.perf_counter() - start, backend)
+        return text
+
+    async def agenerate(self, request: LLMRequest) -> str:
+        cassette = None if self.mode == "record" else self._load(request)
+        if cassette is not None:
+            if self.replay_latency:
+                await asyncio.sleep(cassette.get("seconds", 0.0))
+            return cassette["response"]
+
+        backend = self._miss(request)
+        start = time.perf_counter()
+        text = await backend.agenerate(request)
+        self._store(request, text, time.perf_counter() - start, backend)
+        return text
+
+    def path(self, request: LLMRequest) -> str:
+        key = request.cache_key()
+        return os.path.join(self.cassette_dir, key[:2], f"{key}.json")
+
+    def _load(self, request: LLMRequest) -> dict | None:
+        try:
+            with open(self.path(request), "r", encoding="utf-8") as f:
+                cassette = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        with self._lock:
+            self.hits += 1
+        return cassette
+
+    def _miss(self, request: LLMRequest) -> LLMBackend:
+        with self._lock:
+            self.misses += 1
+        if self.mode == "replay":
+            if self.fallback is None:
+                raise CassetteMissError(f"No cassette recorded for prompt {request.cache_key()[:16]}")
+            return self.fallback
+        if self.backend is None:
+            raise ValueError("Recording cassettes requires a backend")
+        return self.backend
+
+    def _store(self, request: LLMRequest, text: str, seconds: float, backend: LLMBackend) -> None:
+        if backend is not self.backend or not text:
+            return
+
+        path = self.path(request)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({
+                "model": request.model,
+                "temperature": request.temperature,
+                "max_output_tokens": request.max_output_tokens,
+                "system_prompt": request.system_prompt,
+                "user_prompt": request.user_prompt,
+                "response": text,
+                "seconds": seconds,
+            }, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self.recorded += 1
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float, capacity: float | None = None):
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            self._tokens -= min(amount, self.capacity)
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class RateLimiter:
+    def __init__(self, requests_per_minute: float | None = None, tokens_per_minute: float | None = None):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        rpm = os.getenv("PAPER2PROD_REQUESTS_PER_MINUTE")
+        tpm = os.getenv("PAPER2PROD_TOKENS_PER_MINUTE")
+        return cls(
+            requests_per_minute=float(rpm) if rpm else None,
+            tokens_per_minute=float(tpm) if tpm else None,
+        )
+
+    def reserve(self, tokens: int) -> float:
+        wait = 0.0
+        if self.requests is not None:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.reserve(tokens))
+        return wait
+
+    def acquire(self, tokens: int) -> None:
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int) -> None:
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def parse_retry_hint(error: Exception) -> float | None:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    if headers.get("retry-after"):
+        try:
+            return float(headers["retry-after"])
+        except ValueError:
+            pass
+
+    match = re.search(r"retryDelay['\"]?\s*:\s*['\"]([0-9.]+)s", str(getattr(error, "details", error)))
+    if match:
+        return float(match.group(1))
+    return None
+
+
+def backoff_delay(attempt: int, base: float = 2.0, cap: float = 60.0, retry_after: float | None = None) -> float:
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    if retry_after is not None:
+        delay = max(delay, retry_after + random.uniform(0, base))
+    return delay
+
+
+def _call_attrs(request: LLMRequest) -> dict:
+    prompt_chars = len(request.system_prompt) + len(request.user_prompt)
+    return {
+        "model": request.model,
+        "prompt_chars": prompt_chars,
+        "prompt_tokens": request.estimated_tokens(),
+        "cached": False,
+        "retries": 0,
+    }
+
+
+def _record_response(event: dict, text: str, cached: bool = False) -> str:
+    event["cached"] = cached
+    event["response_chars"] = len(text or "")
+    event["response_tokens"] = estimate_tokens(text or "")
+    return text
+
+
+class LLMClient:
+    def __init__(self, backend: LLMBackend | None = None, cache: ResponseCache | None = None,
+                 rate_limiter: RateLimiter | None = None, retries: int = 5):
+        self.backend = backend or GeminiBackend()
+        self.cache = cache if cache is not None else ResponseCache(enabled=False)
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.retries = retries
+
+    @classmethod
+    def from_env(cls) -> "LLMClient":
+        backend = GeminiBackend()
+        return cls(
+            backend=CassetteBackend.from_env(backend) or backend,
+            cache=ResponseCache.from_env(),
+            rate_limiter=RateLimiter.from_env(),
+        )
+
+    def call(self, request: LLMRequest, use_cache: bool = True, retries: int | None = None) -> str:
+        with span("llm", "llm", **_call_attrs(request)) as event:
+            key = request.cache_key()
+            if use_cache:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    return _record_response(event, cached, cached=True)
+
+            retries = retries or self.retries
+            for attempt in range(retries):
+                event["retries"] = attempt
+                self.rate_limiter.acquire(request.estimated_tokens())
+                try:
+                    text = self.backend.generate(request)
+                    break
+                except RetryableError as e:
+                    if attempt == retries - 1:
+                        raise RuntimeError("Gemini API overloaded after retries") from e
+                    time.sleep(backoff_delay(attempt, retry_after=e.retry_after))
+
+            if use_cache and text:
+                self.cache.put(key, text)
+            return _record_response(event, text)
+
+    async def acall(self, request: LLMRequest, use_cache: bool = True, retries: int | None = None) -> str:
+        with span("llm", "llm", **_call_attrs(request)) as event:
+            key = request.cache_key()
+            if use_cache:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    return _record_response(event, cached, cached=True)
+
+            retries = retries or self.retries
+            for attempt in range(retries):
+                event["retries"] = attempt
+                await self.rate_limiter.aacquire(request.estimated_tokens())
+                try:
+                    text = await self.backend.agenerate(request)
+                    break
+                except RetryableError as e:
+                    if attempt == retries - 1:
+                        raise RuntimeError("Gemini API overloaded after retries") from e
+                    await asyncio.sleep(backoff_delay(attempt, retry_after=e.retry_after))
+
+            if use_cache and text:
+                self.cache.put(key, text)
+            return _record_response(event, text)
+
+
+    def stream(self, request: LLMRequest, on_chunk, use_cache: bool = True, retries: int | None = None) -> str:
+        with span("llm", "llm", streamed=True, **_call_attrs(request)) as event:
+            key = request.cache_key()
+            if use_cache:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    on_chunk(cached)
+                    return _record_response(event, cached, cached=True)
+
+            retries = retries or self.retries
+            parts = []
+            for attempt in range(retries):
+                event["retries"] = attempt
+                self.rate_limiter.acquire(request.estimated_tokens())
+                try:
+                    for chunk in self.backend.stream(request):
+                        parts.append(chunk)
+                        on_chunk(chunk)
+                    break
+                except RetryableError as e:
+                    if parts:
+                        raise PartialResponseError("Stream interrupted", "".join(parts)) from e
+                    if attempt == retries - 1:
+                        raise RuntimeError("Gemini API overloaded after retries") from e
+                    time.sleep(backoff_delay(attempt, retry_after=e.retry_after))
+
+            text = "".join(parts)
+            if use_cache and text:
+                self.cache.put(key, text)
+            return _record_response(event, text)
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def get_client() -> LLMClient:
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = LLMClient.from_env()
+        return _default_client
+
+
+def set_client(client: LLMClient | None) -> None:
+    global _default_client
+    with _default_lock:
+        _default_client = client
+
+
+def set_backend(backend: LLMBackend) -> LLMClient:
+    client = get_client()
+    client.backend = backend
+    return client
+
+
+def call_gemini(system_prompt: str, user_prompt: str, retries: int = 5, use_cache: bool = True) -> str:
+    return get_client().call(
+        LLMRequest(system_prompt, user_prompt),
+        use_cache=use_cache,
+        retries=retries
+    )
+
+
+async def acall_gemini(system_prompt: str, user_prompt: str, retries: int = 5, use_cache: bool = True) -> str:
+    return await get_client().acall(
+        LLMRequest(system_prompt, user_prompt),
+        use_cache=use_cache,
+        retries=retries
+    )
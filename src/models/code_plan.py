@@ -0,0 +1,17 @@
+from dataclasses import dataclass, field
+from typing import List
+
+
+@dataclass
+class PlannedFile:
+    path: str
+    purpose: str = ""
+
+
+@dataclass
+class CodePlan:
+    files: List[PlannedFile]
+    entry_point: str = ""
+    dependencies: List[str] = field(default_factory=list)
+    public_api: List[str] = field(default_factory=list)
+    test_strategy: str = ""
@@ -0,0 +1,14 @@
+from dataclasses import dataclass, field
+from typing import List
+
+
+@dataclass
+class LanguageChoice:
+    name: str
+    confidence: float = 0.0
+    reason: str = ""
+
+
+@dataclass
+class LanguageDetection:
+    languages: List[LanguageChoice] = field(default_factory=list)
@@ -0,0 +1,44 @@
+from dataclasses import dataclass, field
+from typing import List
+from src.models.language_choice import LanguageChoice
+
+
+@dataclass
+class Objective:
+    description: str = ""
+    type: str = "other"
+
+
+@dataclass
+class ProblemInput:
+    name: str
+    type: str = ""
+    description: str = ""
+    access: str = "explicit"
+
+
+@dataclass
+class ProblemOutput:
+    name: str
+    type: str = ""
+    description: str = ""
+
+
+@dataclass
+class SolutionQuality:
+    type: str = "approximate"
+    metric: str = "other"
+    tolerance: str | None = None
+
+
+@dataclass
+class ProblemSpec:
+    problem_name: str = "unknown_problem"
+    problem_type: str = "other"
+    objective: Objective = field(default_factory=Objective)
+    inputs: List[ProblemInput] = field(default_factory=list)
+    outputs: List[ProblemOutput] = field(default_factory=list)
+    constraints: List[str] = field(default_factory=list)
+    assumptions: List[str] = field(default_factory=list)
+    solution_quality: SolutionQuality = field(default_factory=SolutionQuality)
+    languages: List[LanguageChoice] = field(default_factory=list)
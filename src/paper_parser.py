@@ -1,54 +1,261 @@
+import hashlib
+import os
 import re
+import threading
+from collections import OrderedDict
+from src.pdf_reader import PdfTextExtractor
+
+
+class LatexTokenizer:
+    SECTION_PATTERN = re.compile(r'\\section{(.+?)}')
+    PREAMBLE_PATTERN = re.compile(
+        r'\\usepackage\{.*?\}|\\bibliography\{.*?\}|\\begin\{document\}|\\end\{document\}'
+    )
+    INLINE_PATTERN = re.compile(r'\\subsection\{.*?\}|\\cite\{.*?\}')
+    COMMENT_PATTERN = re.compile(r'(?<!\\)%')
+    PREAMBLE_MARKERS = ("\\usepackage", "\\bibliography", "{document}")
+
+    def __init__(self, lines, keep_raw: bool = True, cleaned: bool = False):
+        self.lines = lines
+        self.keep_raw = keep_raw
+        self.cleaned = cleaned
+        self.raw = []
+
+    @classmethod
+    def clean_line(cls, line: str) -> str:
+        if "%" in line:
+            match = cls.COMMENT_PATTERN.search(line)
+            if match:
+                line = line[:match.start()] + "\n"
+        if "\\" in line and any(marker in line for marker in cls.PREAMBLE_MARKERS):
+            line = cls.PREAMBLE_PATTERN.sub("", line)
+        return line
+
+    def cleaned_lines(self):
+        if self.cleaned:
+            for raw, line in self.lines:
+                if self.keep_raw:
+                    self.raw.append(raw)
+                yield line
+            return
+
+        for line in self.lines:
+            if self.keep_raw:
+                self.raw.append(line)
+            yield self.clean_line(line)
+
+    def sections(self):
+        title = None
+        parts = []
+
+        for line in self.cleaned_lines():
+            if "\\section{" not in line:
+                if title is not None:
+                    parts.append(line)
+                continue
+
+            pos = 0
+            for match in self.SECTION_PATTERN.finditer(line):
+                if title is not None:
+                    parts.append(line[pos:match.start()])
+                    yield title, self._finish(parts)
+                title = match.group(1).strip()
+                parts = []
+                pos = match.end()
+
+            if title is not None:
+                parts.append(line[pos:])
+
+        if title is not None:
+            yield title, self._finish(parts)
+
+    def full_text(self) -> str:
+        return "".join(self.raw)
+
+    @classmethod
+    def finish_text(cls, text: str) -> str:
+        if "\\cite{" in text or "\\subsection{" in text:
+            text = cls.INLINE_PATTERN.sub("", text)
+        return " ".join(text.split())
+
+    def _finish(self, parts) -> str:
+        return self.finish_text("".join(parts))
+
+
+class IncludeResolver:
+    INCLUDE_PATTERN = re.compile(r'\\(?:input|include)\s*\{([^}]+)\}')
+
+    def __init__(self, max_fragments: int = 256):
+        self.max_fragments = max_fragments
+        self.hits = 0
+        self.misses = 0
+        self._fragments = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lines(self, fName: str, root: str | None = None, stack: tuple = ()):
+        path = os.path.realpath(fName)
+        if path in stack:
+            chain = " -> ".join(os.path.basename(p) for p in stack + (path,))
+            raise ValueError(f"Circular \\input detected: {chain}")
+
+        root = root or os.path.dirname(path)
+        stack = stack + (path,)
+
+        for raw, cleaned, target in self.fragment(path):
+            if target is None:
+                yield raw, cleaned
+                continue
+
+            included = self.resolve(target, root)
+            if included is not None:
+                yield from self.lines(included, root, stack)
+
+    def dependencies(self, fName: str) -> list:
+        found = []
+        self._walk(os.path.realpath(fName), None, (), found)
+        return found
+
+    def resolve(self, target: str, root: str) -> str | None:
+        candidate = os.path.join(root, target.strip())
+        for path in (candidate, candidate + ".tex"):
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def fragment(self, path: str) -> tuple:
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            cached = self._fragments.get(path)
+            if cached is not None and cached[0] == version:
+                self._fragments.move_to_end(path)
+                self.hits += 1
+                return cached[1]
+
+        entries = self._tokenize(path)
+
+        with self._lock:
+            self.misses += 1
+            self._fragments[path] = (version, entries)
+            self._fragments.move_to_end(path)
+            while len(self._fragments) > self.max_fragments:
+                self._fragments.popitem(last=False)
+        return entries
+
+    def _tokenize(self, path: str) -> tuple:
+        entries = []
+        with open(path, "r", encoding="utf-8") as f:
+            for raw in f:
+                cleaned = LatexTokenizer.clean_line(raw)
+                if "\\input" not in cleaned and "\\include" not in cleaned:
+                    entries.append((raw, cleaned, None))
+                    continue
+
+                pos = 0
+                for match in self.INCLUDE_PATTERN.finditer(cleaned):
+                    before = cleaned[pos:match.start()]
+                    entries.append((before, before, None))
+                    entries.append(("", "", match.group(1)))
+                    pos = match.end()
+                rest = cleaned[pos:]
+                entries.append((rest if pos else raw, rest, None))
+        return tuple(entries)
+
+    def _walk(self, path, root, stack, found):
+        if path in stack:
+            chain = " -> ".join(os.path.basename(p) for p in stack + (path,))
+            raise ValueError(f"Circular \\input detected: {chain}")
+        if path not in found:
+            found.append(path)
+
+        root = root or os.path.dirname(path)
+        for _, _, target in self.fragment(path):
+            if target is None:
+                continue
+            included = self.resolve(target, root)
+            if included is not None:
+                self._walk(os.path.realpath(included), root, stack + (path,), found)
+
+
+DEFAULT_RESOLVER = IncludeResolver()
+
+
 class PaperParser:
+    SUPPORTED_EXTENSIONS = (".tex", ".pdf")
+
+    def __init__(self, resolver: IncludeResolver | None = None, pdf_extractor: PdfTextExtractor | None = None):
+        self.resolver = resolver or DEFAULT_RESOLVER
+        self.pdf_extractor = pdf_extractor or PdfTextExtractor()
+
     def parse(self, fName: str) -> dict:
-        split = fName.split(".")
-        if split[-1] == "tex":
-            return self.parseTex(fName) 
+        extension = self._extension(fName)
+        if extension == ".tex":
+            return self.parseTex(fName)
+        if extension == ".pdf":
+            return self.parsePdf(fName)
+        raise ValueError(f"Unsupported file type: {fName}")
 
     def parseTex(self, fName:str) -> dict:
-        with open(fName, "r", encoding="utf-8") as f:
-            tex = f.read()
-        
-        tex = self.cleanTex(tex)
+        return dict(self.iter_sections(fName))
 
+    def parsePdf(self, fName: str) -> dict:
+        return self._pdf_sections(self.pdf_extractor.pages(fName))
 
-        section_pattern = re.compile(r'\\section{(.+?)}')
+    def _pdf_sections(self, pages: list) -> dict:
         sections = {}
-        
-        matches = list(section_pattern.finditer(tex))
+        for title, section in self._sections(self.pdf_extractor.sections(pages)):
+            if title in sections:
+                sections[title]["text"] += " " + section["text"]
+            else:
+                sections[title] = section
+        return sections
 
+    def parse_with_text(self, fName: str) -> tuple:
+        if self._is_pdf(fName):
+            pages = self.pdf_extractor.pages(fName)
+            return " ".join(" ".join(pages).split()), self._pdf_sections(pages)
+        tokenizer = LatexTokenizer(self.resolver.lines(fName), cleaned=True)
+        sections = dict(self._sections(tokenizer.sections()))
+        return tokenizer.full_text(), sections
 
-        for i,match in enumerate(matches):
-            title = match.group(1).strip()
-            start = match.end()
-            end = matches[i + 1].start() if i + 1 < len(matches) else len(tex)
-            if title.strip().lower() == "acknowledgements":
-                continue
-            content = tex[start:end].strip()
-            content = self.cleanSectionText(content)
+    def iter_sections(self, fName: str):
+        if self._is_pdf(fName):
+            yield from self.parsePdf(fName).items()
+            return
+        tokenizer = LatexTokenizer(self.resolver.lines(fName), keep_raw=False, cleaned=True)
+        yield from self._sections(tokenizer.sections())
 
-            sections[title] = {
-                "text": content
-            }
+    def dependencies(self, fName: str) -> list:
+        if self._is_pdf(fName):
+            return [fName]
+        return self.resolver.dependencies(fName)
 
-        return sections
+    def _is_pdf(self, fName: str) -> bool:
+        return self._extension(fName) == ".pdf"
 
-    def cleanTex(self, tex: str) -> str:
-        tex = re.sub(r'%.*', '', tex)
-        tex = re.sub(r'\\usepackage\{.*?\}', '', tex)
-        tex = re.sub(r'\\bibliography\{.*?\}', '', tex)
-        tex = re.sub(r'\\begin\{document\}|\\end\{document\}', '', tex)
+    def _extension(self, fName: str) -> str:
+        return os.path.splitext(fName)[1].lower()
+
+    def _sections(self, sections):
+        for title, text in sections:
+            if title.lower() == "acknowledgements":
+                continue
+            yield title, {"text": text}
 
-        return tex
+    def cleanTex(self, tex: str) -> str:
+        return "".join(LatexTokenizer.clean_line(line) for line in tex.splitlines(keepends=True))
 
     def cleanSectionText(self, text: str) -> str:
-        text = re.sub(r'\\subsection\{.*?\}', '', text)
-        text = re.sub(r'\\cite\{.*?\}', '', text)
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
+        return LatexTokenizer.finish_text(text)
+
+    def fingerprint_sections(self, sections: dict) -> dict:
+        return {
+            title: hashlib.sha256(section["text"].encode("utf-8")).hexdigest()
+            for title, section in sections.items()
+        }
 
     def get_full_text(self, fileName: str) -> str:
-        if not fileName.endswith(".tex"):
+        if self._extension(fileName) != ".tex":
             raise ValueError("Unsupported file type")
-        with open(fileName, "r", encoding="utf-8") as f:
-            return f.read()
+        return self.parse_with_text(fileName)[0]
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import mmap
+import multiprocessing
+import os
+import re
+import tempfile
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+
+DEFAULT_PDF_CACHE_DIR = os.path.join(".cache", "pdf")
+
+HEADING_PATTERN = re.compile(r"^(\d{1,2})\.?\s+([A-Z][^\n]{2,80})$")
+NAMED_HEADINGS = {
+    "abstract": "Abstract",
+    "references": "References",
+    "bibliography": "References",
+    "acknowledgements": "Acknowledgements",
+    "acknowledgments": "Acknowledgements",
+    "appendix": "Appendix",
+}
+
+
+def _open_reader(path: str):
+    try:
+        from pypdf import PdfReader
+    except ImportError as e:
+        raise ImportError("PDF support requires pypdf: pip install pypdf") from e
+
+    f = open(path, "rb")
+    try:
+        view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    finally:
+        f.close()
+    return PdfReader(view), view
+
+
+def _extract_pages(path: str, start: int, stop: int) -> list:
+    reader, view = _open_reader(path)
+    try:
+        return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+    finally:
+        del reader
+        view.close()
+
+
+def hash_pdf(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return digest.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            digest.update(view)
+    return digest.hexdigest()
+
+
+class PdfTextExtractor:
+    def __init__(self, max_workers: int | None = None, pages_per_task: int = 4,
+                 cache_dir: str | None = DEFAULT_PDF_CACHE_DIR):
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.pages_per_task = pages_per_task
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    def pages(self, path: str) -> list:
+        cache_path = self._cache_path(hash_pdf(path)) if self.cache_dir else None
+        if cache_path:
+            try:
+                with open(cache_path, "r", encoding="utf-8") as f:
+                    pages = json.load(f)
+                self.hits += 1
+                return pages
+            except (OSError, json.JSONDecodeError):
+                pass
+
+        self.misses += 1
+        pages = self._extract(path)
+        if cache_path:
+            self._write(cache_path, json.dumps(pages, ensure_ascii=False))
+        return pages
+
+    def sections(self, pages: list):
+        title, parts, expected = None, [], 1
+        for line in self._lines(pages):
+            heading = self._heading(line, expected)
+            if heading is None:
+                if title is not None:
+                    parts.append(line)
+                continue
+
+            if title is not None:
+                yield title, self._clean(parts)
+            title, number = heading
+            if number is not None:
+                expected = number + 1
+            parts = []
+
+        if title is not None:
+            yield title, self._clean(parts)
+
+    def _extract(self, path: str) -> list:
+        reader, view = _open_reader(path)
+        try:
+            count = len(reader.pages)
+        finally:
+            del reader
+            view.close()
+
+        ranges = [(start, min(start + self.pages_per_task, count))
+                  for start in range(0, count, self.pages_per_task)]
+        if self.max_workers == 1 or len(ranges) <= 1:
+            return [page for start, stop in ranges for page in _extract_pages(path, start, stop)]
+
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(ranges)),
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            chunks = pool.map(_extract_pages, [path] * len(ranges), *zip(*ranges))
+            return [page for chunk in chunks for page in chunk]
+
+    def _lines(self, pages: list):
+        for page in pages:
+            for line in unicodedata.normalize("NFKC", page).splitlines():
+                line = line.strip()
+                if line:
+                    yield line
+
+    def _heading(self, line: str, expected: int):
+        named = NAMED_HEADINGS.get(line.lower().rstrip(".:"))
+        if named:
+            return named, None
+
+        match = HEADING_PATTERN.match(line)
+        if match and int(match.group(1)) == expected and not line.endswith((".", ",", ";")):
+            return match.group(2).strip(), int(match.group(1))
+        return None
+
+    def _clean(self, lines: list) -> str:
+        text = "\n".join(lines)
+        text = re.sub(r"(\w)-\n(\w)", r"\1\2", text)
+        return " ".join(text.split())
+
+    def _cache_path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.json")
+
+    def _write(self, path: str, content: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
@@ -5,36 +5,83 @@ from src.code_generator import CodeGenerator
 from src.validator import Validator
 from src.code_planner import CodePlanner
 from src.utils.spec_utils import is_valid_problem_spec, normalize_spec
-from src.problem_extractor import call_gemini
+from src.problem_extractor import SYSTEM_PROMPT
+from src.llm_client import call_gemini
 from src.language_detector import LanguageDetector
+from src.checkpoint import DEFAULT_RUNS_DIR, RunStore
+from src.incremental import DEFAULT_LINEAGE_DIR, Lineage, hash_json
+from src.scheduler import StageGraph
+from src.spec_index import DEFAULT_INDEX_DIR, SpecIndex
+from src.telemetry import Telemetry, traced
 class PaperToProdPipeline:
-    def run(self, fileName: str):
+    def __init__(self, max_workers: int = 4, output_root: str = "codes",
+                 resume: bool = False, runs_dir: str = DEFAULT_RUNS_DIR,
+                 lineage_dir: str = DEFAULT_LINEAGE_DIR, trace: bool = False,
+                 validate: bool = True, repair_rounds: int = 2,
+                 index_dir: str | None = DEFAULT_INDEX_DIR):
+        self.max_workers = max_workers
+        self.output_root = output_root
+        self.resume = resume
+        self.runs_dir = runs_dir
+        self.lineage_dir = lineage_dir
+        self.trace = trace
+        self.validate = validate
+        self.repair_rounds = repair_rounds
+        self.index_dir = index_dir
+        self.last_run = {}
+
+    def run(self, fileName: str, resume: bool | None = None, listener=None):
+        telemetry = Telemetry(listener=listener)
+        with telemetry.activate():
+            return self._run(fileName, resume, telemetry)
+
+    def _run(self, fileName: str, resume: bool | None, telemetry: Telemetry):
         parser = PaperParser()
         problem_extractor = ProblemExtractor()
         planner = CodePlanner()
-        generator = CodeGenerator()
+        generator = CodeGenerator(max_workers=self.max_workers)
         lang_detector = LanguageDetector()
-        
-
-        full_text = parser.get_full_text(fileName)
-        parsed = parser.parse(fileName)
+        validator = Validator(max_workers=self.max_workers)
+        store = RunStore(fileName, self.runs_dir, resume=self.resume if resume is None else resume,
+                         dependencies=parser.dependencies(fileName))
 
-        problem_spec = problem_extractor.extract(parsed)
-        problem_spec = normalize_spec(problem_spec)
+        paper_name = os.path.splitext(os.path.basename(fileName))[0]
+        lineage = Lineage(paper_name, self.lineage_dir)
+        index = SpecIndex(self.index_dir) if self.index_dir else None
+        output_dir = generator.paper_dir(paper_name, self.output_root)
+        state = {"match": None, "copied_files": []}
 
-        if not is_valid_problem_spec(problem_spec):
-            raise RuntimeError("No valid problem found in paper")
+        def parse():
+            parsed = store.stage("parse", lambda: parser.parse(fileName))
+            state["changed_sections"] = lineage.record_sections(parser.fingerprint_sections(parsed))
+            return parsed
 
-        plan = planner.plan(problem_spec, problem_spec["languages"][0]["name"])
-        paper_name = os.path.splitext(os.path.basename(fileName))[0]
-        output_dir = os.path.join("codes", paper_name)
+        def extract(parsed):
+            selected = problem_extractor.select_sections(parsed)
+            extract_key = hash_json([SYSTEM_PROMPT, selected])
+            return lineage.reuse("extract", extract_key, lambda: store.stage(
+                "extract", lambda: problem_extractor.extract(parsed, selected)
+            ))
 
+        def normalize(extracted):
+            problem_spec = store.stage("normalize", lambda: normalize_spec(extracted))
+            if not is_valid_problem_spec(problem_spec):
+                raise RuntimeError("No valid problem found in paper")
+            return problem_spec
 
-        generator.generate(problem_spec, plan, output_dir)
+        def plan(problem_spec, detected, parsed):
+            languages = (detected or {}).get("languages") or problem_spec.get("languages") or (
+                lang_detector.detect(parsed)["languages"]
+            )
+            language = state["language"] = languages[0]["name"]
+            if index is not None:
+                state["match"] = index.find(problem_spec, language, exclude=paper_name)
+            return lineage.reuse("plan", hash_json([problem_spec, language]), lambda: store.stage(
+                "plan", lambda: state["match"]["plan"] if state["match"] else planner.plan(problem_spec, language)
+            ))
 
-        readme_text = call_gemini(
-            system_prompt="You write concise, practical README files.",
-            user_prompt=CodeGenerator.build_paper_readme_prompt(
+        def draft_readme(problem_spec):
+            readme_prompt = CodeGenerator.build_paper_readme_prompt(
                 paper_name,
                 [
                     {
@@ -42,10 +89,99 @@ class PaperToProdPipeline:
                         "short_description": problem_spec.get("problem_description"),
                     }
                 ],
-            ),
-        )
+            )
+            return lineage.reuse("readme", hash_json(readme_prompt), lambda: store.artifact(
+                "README.md", lambda: call_gemini(
+                    system_prompt="You write concise, practical README files.",
+                    user_prompt=readme_prompt,
+                )
+            ))
+
+        def generate(problem_spec, code_plan):
+            unchanged_files = lineage.unchanged_files(
+                generator.fingerprints(problem_spec, code_plan, paper_name, readme=False), output_dir
+            )
+            match = state["match"]
+            if match and match["exact"] and match["plan"] == code_plan:
+                state["copied_files"] = index.copy_modules(match, generator.writer(output_dir), [
+                    file["path"] for file in code_plan["files"] if file["path"] not in unchanged_files
+                ])
+                unchanged_files |= set(state["copied_files"])
+            return generator.generate(problem_spec, code_plan, paper_name, self.output_root,
+                                      store=store, skip=unchanged_files, readme=False)
+
+        def validate(problem_spec, code_plan, paper_dir):
+            def validate_and_repair():
+                report = validator.validate(paper_dir)
+                repairs = []
+                for attempt in range(1, self.repair_rounds + 1):
+                    feedback = {result.path: result.feedback for result in report.failures()}
+                    repaired = generator.repair(problem_spec, code_plan, paper_dir, feedback,
+                                                attempt=attempt, store=store)
+                    if not repaired:
+                        break
+                    repairs.append(repaired)
+                    recheck = set(repaired) | {r.path for r in report.results if r.kind == "test"}
+                    report = report.merge(validator.validate(paper_dir, paths=recheck))
+                return {**report.to_dict(), "repairs": repairs}
+
+            return lineage.reuse("validate", hash_json(lineage.current["files"]), validate_and_repair,
+                                 reusable=lambda report: report["ok"])
+
+        def write_readme(paper_dir, readme_text):
+            writer = generator.writer(paper_dir)
+            writer.write("README.md", readme_text)
+            writer.save()
+
+        graph = StageGraph(max_workers=self.max_workers)
+        stages = [
+            ("parse", parse, []),
+            ("detect_language", lang_detector.detect_local, ["parse"]),
+            ("extract", extract, ["parse"]),
+            ("normalize", normalize, ["extract"]),
+            ("plan", plan, ["normalize", "detect_language", "parse"]),
+            ("readme", draft_readme, ["normalize"]),
+            ("generate", generate, ["normalize", "plan"]),
+            ("write_readme", write_readme, ["generate", "readme"]),
+        ]
+        if self.validate:
+            stages.append(("validate", validate, ["normalize", "plan", "generate"]))
+        for name, fn, deps in stages:
+            graph.add(name, traced(name, fn), deps=deps)
 
-        with open(os.path.join(output_dir, "README.md"), "w", encoding="utf-8") as f:
-            f.write(readme_text)
+        telemetry_path = os.path.join(store.run_dir, "telemetry.jsonl")
+        trace_path = os.path.join(store.run_dir, "trace.json") if self.trace else None
+        try:
+            graph.run()
+            lineage.save()
+            validation = graph.results["validate"].value if self.validate else None
+            if index is not None and (validation is None or validation["ok"]):
+                index.add(paper_name, graph.results["normalize"].value, state["language"],
+                          graph.results["plan"].value, output_dir)
+        finally:
+            telemetry.write_jsonl(telemetry_path)
+            if trace_path:
+                telemetry.write_chrome_trace(trace_path)
+        self.last_run = {
+            "changed_sections": state["changed_sections"],
+            "reused_stages": lineage.reused,
+            "regenerated_files": sorted(generator.file_timings),
+            "repaired_files": sorted(generator.repair_timings),
+            "written_files": sorted(set(generator.writer(output_dir).written)),
+            "unchanged_writes": sorted(set(generator.writer(output_dir).unchanged)),
+            "stage_seconds": graph.timings(),
+            "critical_path": graph.critical_path(),
+            "validation": validation,
+            "index_match": {
+                "paper": state["match"]["paper"],
+                "score": state["match"]["score"],
+                "exact": state["match"]["exact"],
+                "copied_files": state["copied_files"],
+            } if state["match"] else None,
+            "telemetry": telemetry.totals(),
+            "telemetry_path": telemetry_path,
+            "trace_path": trace_path,
+            "summary": telemetry.summary(),
+        }
 
         return output_dir
@@ -1,42 +1,11 @@
-import json
-import os
-import re
-import time
-from src.paper_parser import PaperParser
-from google import genai
-from google.genai import types
-from google.genai.errors import ServerError
+from dataclasses import asdict
+from src.context_builder import ContextBuilder
+from src.models.problem_spec import ProblemSpec
+from src.structured_output import request_structured
 
 from dotenv import load_dotenv
 load_dotenv() 
 
-client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
-
-def call_gemini(system_prompt: str, user_prompt: str,retries: int = 5) -> str:
-    delay = 2  # seconds
-
-    for attempt in range(retries):
-        try:
-            response = client.models.generate_content(
-                model="gemini-2.5-flash",
-                contents=user_prompt,
-                config=types.GenerateContentConfig(
-                    system_instruction=system_prompt,
-                    temperature=0.1,
-                    max_output_tokens=8192
-                )
-            )
-            return response.text
-
-        except ServerError as e:
-            if attempt == retries - 1:
-                raise RuntimeError("Gemini API overloaded after retries") from e
-
-            time.sleep(delay)
-            delay *= 2  
-
-    return response.text
-
 SYSTEM_PROMPT = """
 You are a research engineer.
 
@@ -53,9 +22,16 @@ Return VALID JSON ONLY.
 """
 
 class ProblemExtractor:
-    def extract(self, parsed_paper: dict) -> dict:
+    IGNORED_SECTIONS = ("acknowledgements", "acknowledgments", "references", "bibliography")
+
+    def __init__(self, token_budget: int = 6000):
+        self.context_builder = ContextBuilder(budget_tokens=token_budget)
+
+    def extract(self, parsed_paper: dict, selected: dict | None = None) -> dict:
+        if selected is None:
+            selected = self.select_sections(parsed_paper)
+        paper_text = self.context_builder.render(selected)
 
-        
         user_prompt = f"""
         Extract the CORE PROBLEM DEFINITION.
         For language detection, consider Domain, Libraries, and mathematical vs systems orientation for guidance
@@ -110,25 +86,19 @@ class ProblemExtractor:
         }}
 
         PAPER TEXT:
-        {parsed_paper}
+        {paper_text}
 """
-        response = call_gemini(SYSTEM_PROMPT, user_prompt)
-        return self._safe_json(response)
-
-    def _safe_json(self, text: str) -> dict:
-        text = re.sub(r"```json|```", "", text).strip()
-
-        match = re.search(r"\{[\s\S]*\}", text)
-        if not match:
-            raise RuntimeError("No JSON object found")
-
-        try:
-            return json.loads(match.group(0))
-        except json.JSONDecodeError as e:
-            raise RuntimeError(
-                "Invalid JSON returned by LLM (likely truncated). "
-                "Reduce output size or split extraction stages."
-            ) from e
+        return asdict(request_structured(SYSTEM_PROMPT, user_prompt, ProblemSpec))
+
+    def relevant_sections(self, parsed_paper: dict) -> dict:
+        return {
+            title: section
+            for title, section in parsed_paper.items()
+            if title.strip().lower() not in self.IGNORED_SECTIONS
+        }
+
+    def select_sections(self, parsed_paper: dict) -> dict:
+        return self.context_builder.select(self.relevant_sections(parsed_paper))
 
     
 
@@ -0,0 +1,126 @@
+import contextvars
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Stage:
+    name: str
+    fn: object
+    deps: tuple = ()
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str = "pending"
+    value: object = None
+    error: BaseException | None = None
+    start: float = 0.0
+    end: float = 0.0
+    deps: tuple = field(default_factory=tuple)
+
+    @property
+    def seconds(self) -> float:
+        return self.end - self.start
+
+
+class StageGraph:
+    def __init__(self, max_workers: int = 4):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.stages = {}
+        self.results = {}
+        self.started_at = 0.0
+        self.finished_at = 0.0
+
+    def add(self, name: str, fn, deps=()) -> None:
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        for dep in deps:
+            if dep not in self.stages:
+                raise ValueError(f"Stage {name} depends on unknown stage {dep}")
+        self.stages[name] = Stage(name, fn, tuple(deps))
+
+    def run(self) -> dict:
+        self.results = {name: StageResult(name, deps=stage.deps) for name, stage in self.stages.items()}
+        self.started_at = time.perf_counter()
+        failures = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            running = {}
+            while True:
+                for name in self._ready():
+                    result = self.results[name]
+                    result.status = "running"
+                    args = [self.results[dep].value for dep in self.stages[name].deps]
+                    running[pool.submit(
+                        contextvars.copy_context().run, self._execute, result, self.stages[name].fn, args
+                    )] = name
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    if self.results[name].status == "failed":
+                        failures.append(self.results[name].error)
+                        self._skip_dependents(name)
+
+        self.finished_at = time.perf_counter()
+        if failures:
+            raise failures[0]
+        return {name: result.value for name, result in self.results.items()}
+
+    def timings(self) -> dict:
+        return {
+            name: result.seconds
+            for name, result in self.results.items()
+            if result.status in ("ok", "failed")
+        }
+
+    def critical_path(self) -> dict:
+        finished = [r for r in self.results.values() if r.status in ("ok", "failed")]
+        if not finished:
+            return {"path": [], "seconds": 0.0, "wall_seconds": 0.0}
+
+        path = []
+        current = max(finished, key=lambda r: r.end)
+        while current is not None:
+            path.append(current.name)
+            deps = [self.results[dep] for dep in current.deps if self.results[dep].status == "ok"]
+            current = max(deps, key=lambda r: r.end) if deps else None
+
+        path.reverse()
+        return {
+            "path": path,
+            "seconds": sum(self.results[name].seconds for name in path),
+            "wall_seconds": self.finished_at - self.started_at,
+        }
+
+    def _ready(self) -> list:
+        return [
+            name for name, stage in self.stages.items()
+            if self.results[name].status == "pending"
+            and all(self.results[dep].status == "ok" for dep in stage.deps)
+        ]
+
+    def _execute(self, result: StageResult, fn, args) -> None:
+        result.start = time.perf_counter()
+        try:
+            result.value = fn(*args)
+            result.status = "ok"
+        except Exception as e:
+            result.error = e
+            result.status = "failed"
+        finally:
+            result.end = time.perf_counter()
+
+    def _skip_dependents(self, name: str) -> None:
+        for other, stage in self.stages.items():
+            if name in stage.deps and self.results[other].status == "pending":
+                self.results[other].status = "skipped"
+                self._skip_dependents(other)
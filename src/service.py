@@ -0,0 +1,312 @@
+import json
+import os
+import queue
+import socketserver
+import stat
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from src.llm_client import get_client
+from src.paper_parser import PaperParser
+from src.pipeline import PaperToProdPipeline
+from src.spec_index import DEFAULT_INDEX_DIR
+
+
+DEFAULT_JOBS_DIR = os.path.join(".paper2prod", "jobs")
+FINISHED = ("succeeded", "failed")
+
+
+@dataclass
+class Job:
+    id: str
+    paper: str
+    resume: bool = False
+    status: str = "queued"
+    created_at: float = 0.0
+    started_at: float | None = None
+    finished_at: float | None = None
+    output_dir: str | None = None
+    error: str | None = None
+    attempts: int = 0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class JobStore:
+    def __init__(self, root: str = DEFAULT_JOBS_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+
+    def save(self, job: Job) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(job.to_dict(), f, indent=2)
+        os.replace(tmp_path, os.path.join(self.root, f"{job.id}.json"))
+
+    def append_event(self, job_id: str, event: dict) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        with self._lock, open(os.path.join(self.root, f"{job_id}.events.jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps(event) + "\n")
+
+    def events(self, job_id: str) -> list:
+        try:
+            with open(os.path.join(self.root, f"{job_id}.events.jsonl"), "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except OSError:
+            return []
+
+        events = []
+        for line in lines:
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+        return events
+
+    def load(self) -> list:
+        if not os.path.isdir(self.root):
+            return []
+
+        names = {f.name for f in fields(Job)}
+        jobs = []
+        for name in os.listdir(self.root):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.root, name), "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                jobs.append(Job(**{k: v for k, v in data.items() if k in names}))
+            except (OSError, json.JSONDecodeError, TypeError):
+                continue
+        return sorted(jobs, key=lambda job: job.created_at)
+
+
+class PaperService:
+    def __init__(self, workers: int = 2, max_workers: int = 4, output_root: str = "codes",
+                 jobs_dir: str = DEFAULT_JOBS_DIR, trace: bool = False, validate: bool = True,
+                 repair_rounds: int = 2, index_dir: str | None = DEFAULT_INDEX_DIR, pipeline_factory=None):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+        self.store = JobStore(jobs_dir)
+        self.pipeline_factory = pipeline_factory or (
+            lambda: PaperToProdPipeline(max_workers=max_workers, output_root=output_root, trace=trace,
+                                        validate=validate, repair_rounds=repair_rounds, index_dir=index_dir)
+        )
+        self.jobs = {}
+        self._events = {}
+        self._queue = queue.Queue()
+        self._threads = []
+        self._changed = threading.Condition()
+
+    def start(self) -> "PaperService":
+        get_client()
+        for job in self.store.load():
+            self.jobs[job.id] = job
+            self._events[job.id] = self.store.events(job.id)
+            if not job.finished:
+                job.resume = job.resume or job.status == "running"
+                job.status = "queued"
+                self.store.save(job)
+                self._emit(job, {"type": "recovered"})
+                self._queue.put(job.id)
+
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"paper-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout: float | None = None) -> None:
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, paper: str, resume: bool = False) -> Job:
+        if os.path.splitext(paper)[1].lower() not in PaperParser.SUPPORTED_EXTENSIONS:
+            raise ValueError(f"Unsupported paper type: {paper}")
+        if not os.path.isfile(paper):
+            raise ValueError(f"Paper not found: {paper}")
+
+        job = Job(uuid.uuid4().hex[:12], os.path.abspath(paper), resume=resume, created_at=time.time())
+        with self._changed:
+            self.jobs[job.id] = job
+            self._events[job.id] = []
+        self.store.save(job)
+        self._emit(job, {"type": "queued", "paper": job.paper})
+        self._queue.put(job.id)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self.jobs.get(job_id)
+
+    def list_jobs(self) -> list:
+        return sorted(self.jobs.values(), key=lambda job: job.created_at)
+
+    def events(self, job_id: str, since: int = 0, timeout: float | None = None) -> list:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._changed:
+            while True:
+                events = self._events.get(job_id, [])
+                job = self.jobs.get(job_id)
+                if len(events) > since or job is None or job.finished:
+                    return events[since:]
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return []
+                self._changed.wait(remaining)
+
+    def _work(self) -> None:
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+            self._run(self.jobs[job_id])
+
+    def _run(self, job: Job) -> None:
+        attempt = job.attempts + 1
+        self._emit(job, {"type": "started", "attempt": attempt},
+                   status="running", started_at=time.time(), attempts=attempt)
+        self.store.save(job)
+
+        def listener(phase, event):
+            if event["cat"] in ("stage", "file", "repair"):
+                self._emit(job, {
+                    "type": "stage" if event["cat"] == "stage" else event["cat"],
+                    "phase": phase,
+                    "name": event["name"],
+                    "status": event["status"] if phase == "end" else "running",
+                    "seconds": event.get("seconds"),
+                })
+
+        try:
+            output_dir = self.pipeline_factory().run(job.paper, resume=job.resume, listener=listener)
+            status, error = "succeeded", None
+        except Exception as e:
+            output_dir, status, error = None, "failed", f"{type(e).__name__}: {e}"
+
+        finished_at = time.time()
+        self._emit(job, {"type": "finished", "status": status, "output_dir": output_dir, "error": error,
+                         "seconds": finished_at - job.started_at},
+                   status=status, error=error, output_dir=output_dir, finished_at=finished_at)
+        self.store.save(job)
+
+    def _emit(self, job: Job, event: dict, **updates) -> None:
+        event = {"job": job.id, "time": time.time(), **event}
+        self.store.append_event(job.id, event)
+        with self._changed:
+            for name, value in updates.items():
+                setattr(job, name, value)
+            self._events.setdefault(job.id, []).append(event)
+            self._changed.notify_all()
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    server_version = "paper2prod"
+    poll_seconds = 15.0
+
+    @property
+    def service(self) -> PaperService:
+        return self.server.service
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        query = parse_qs(url.query)
+
+        if parts == ["health"]:
+            return self._send(200, {"status": "ok", "queued": self.service._queue.qsize()})
+        if parts == ["jobs"]:
+            return self._send(200, {"jobs": [job.to_dict() for job in self.service.list_jobs()]})
+        if len(parts) in (2, 3) and parts[0] == "jobs":
+            job = self.service.get(parts[1])
+            if job is None:
+                return self._send(404, {"error": f"Unknown job: {parts[1]}"})
+            if len(parts) == 2:
+                return self._send(200, job.to_dict())
+            if parts[2] == "events":
+                try:
+                    since = max(0, int(query.get("since", ["0"])[0]))
+                except ValueError:
+                    return self._send(400, {"error": "since must be an integer"})
+                return self._stream(job, since, query.get("follow", ["1"])[0] != "0")
+        return self._send(404, {"error": f"Not found: {url.path}"})
+
+    def do_POST(self):
+        if urlparse(self.path).path.rstrip("/") != "/jobs":
+            return self._send(404, {"error": f"Not found: {self.path}"})
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            job = self.service.submit(body["paper"], resume=bool(body.get("resume", False)))
+        except (KeyError, TypeError, json.JSONDecodeError):
+            return self._send(400, {"error": 'Expected a JSON body like {"paper": "path/to/paper.tex"}'})
+        except ValueError as e:
+            return self._send(400, {"error": str(e)})
+        return self._send(202, job.to_dict())
+
+    def _stream(self, job: Job, since: int, follow: bool) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        try:
+            while True:
+                events = self.service.events(job.id, since, timeout=self.poll_seconds if follow else 0)
+                for event in events:
+                    self.wfile.write((json.dumps(event) + "\n").encode("utf-8"))
+                self.wfile.flush()
+                since += len(events)
+                if not follow or (job.finished and not events):
+                    return
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+    def _send(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        return self.client_address[0] if self.client_address else "unix"
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        try:
+            mode = os.lstat(self.server_address).st_mode
+        except FileNotFoundError:
+            mode = None
+        if mode is not None:
+            if not stat.S_ISSOCK(mode):
+                raise FileExistsError(f"{self.server_address} exists and is not a socket")
+            os.remove(self.server_address)
+        super().server_bind()
+        self.server_name, self.server_port = "localhost", 0
+
+
+def make_server(service: PaperService, host: str = "127.0.0.1", port: int = 8765,
+                socket_path: str | None = None):
+    if socket_path:
+        server = UnixHTTPServer(socket_path, ServiceHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), ServiceHandler)
+    server.service = service
+    return server
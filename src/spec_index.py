@@ -0,0 +1,137 @@
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from src.incremental import hash_json
+
+
+DEFAULT_INDEX_DIR = os.path.join(".paper2prod", "index")
+
+WORD_PATTERN = re.compile(r"[a-z][a-z0-9]+")
+STOP_WORDS = {
+    "the", "and", "for", "with", "from", "that", "this", "over", "into", "under", "given",
+    "using", "based", "its", "are", "all", "any", "some", "find", "finding", "compute", "computing",
+    "problem", "method", "approach", "algorithm",
+}
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def _words(text) -> list:
+    words = []
+    for word in WORD_PATTERN.findall(str(text or "").lower()):
+        if word in STOP_WORDS:
+            continue
+        if len(word) > 4 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(word)
+    return words
+
+
+def spec_terms(spec: dict) -> list:
+    objective = spec.get("objective") or {}
+    quality = spec.get("solution_quality") or {}
+    terms = {
+        f"type:{str(spec.get('problem_type', '')).lower()}",
+        f"objective:{str(objective.get('type', '')).lower()}",
+        f"metric:{str(quality.get('metric', '')).lower()}",
+    }
+    terms.update(f"name:{word}" for word in _words(spec.get("problem_name")))
+    terms.update(f"goal:{word}" for word in _words(objective.get("description")))
+    for key, prefix in (("inputs", "in"), ("outputs", "out")):
+        for item in spec.get(key) or []:
+            if isinstance(item, dict):
+                terms.add(f"{prefix}:{str(item.get('type', '')).lower()}")
+                terms.update(f"{prefix}:{word}" for word in _words(item.get("name")))
+            else:
+                terms.update(f"{prefix}:{word}" for word in _words(item))
+    for key, prefix in (("constraints", "con"), ("assumptions", "asm")):
+        for item in spec.get(key) or []:
+            terms.update(f"{prefix}:{word}" for word in _words(item))
+    return sorted(term for term in terms if not term.endswith(":"))
+
+
+def spec_signature(spec: dict) -> str:
+    return hash_json(spec_terms(spec))
+
+
+def jaccard(a, b) -> float:
+    a, b = set(a), set(b)
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class SpecIndex:
+    def __init__(self, root: str = DEFAULT_INDEX_DIR, threshold: float = 0.75):
+        self.path = os.path.join(root, "index.json")
+        self.threshold = threshold
+        self.entries = self._load()
+
+    def find(self, spec: dict, language: str, exclude: str | None = None) -> dict | None:
+        terms = spec_terms(spec)
+        signature = hash_json(terms)
+        best, best_score = None, 0.0
+        for entry in self.entries.values():
+            if entry["paper"] == exclude or entry["language"] != language:
+                continue
+            score = 1.0 if entry["signature"] == signature else jaccard(terms, entry["terms"])
+            if score >= self.threshold and score > best_score:
+                best, best_score = entry, score
+
+        if best is None:
+            return None
+        return {**best, "score": best_score, "exact": best["signature"] == signature}
+
+    def add(self, paper: str, spec: dict, language: str, plan: dict, output_dir: str) -> None:
+        terms = spec_terms(spec)
+        entry = {
+            "paper": paper,
+            "signature": hash_json(terms),
+            "terms": terms,
+            "language": language,
+            "spec": spec,
+            "plan": plan,
+            "output_dir": os.path.abspath(output_dir),
+            "updated_at": time.time(),
+        }
+        with self._lock():
+            self.entries = self._load()
+            self.entries[paper] = entry
+            self._save()
+
+    def copy_modules(self, match: dict, writer, paths) -> list:
+        source_dir = match["output_dir"]
+        if os.path.abspath(writer.output_dir) == source_dir:
+            return []
+
+        copied = []
+        for path in paths:
+            source = os.path.join(source_dir, path)
+            if not os.path.isfile(source):
+                continue
+            with open(source, "r", encoding="utf-8", newline="") as f:
+                writer.write(path, f.read())
+            copied.append(path)
+        return sorted(copied)
+
+    def _lock(self) -> threading.Lock:
+        with _locks_guard:
+            return _locks.setdefault(os.path.abspath(self.path), threading.Lock())
+
+    def _save(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
@@ -0,0 +1,231 @@
+import dataclasses
+import json
+import re
+import types
+import typing
+from dataclasses import replace
+from src.llm_client import LLMRequest, PartialResponseError, get_client
+
+
+SPECIAL_CHARS = re.compile(r'[{}\[\]"\\]')
+CLOSERS = {"{": "}", "[": "]"}
+FENCE = "```json"
+
+
+class StructuredOutputError(RuntimeError):
+    pass
+
+
+def json_schema(tp) -> dict:
+    if dataclasses.is_dataclass(tp):
+        hints = typing.get_type_hints(tp)
+        fields = dataclasses.fields(tp)
+        return {
+            "type": "object",
+            "properties": {f.name: json_schema(hints[f.name]) for f in fields},
+            "required": [f.name for f in fields],
+        }
+
+    origin, args = typing.get_origin(tp), typing.get_args(tp)
+    if origin in (typing.Union, types.UnionType):
+        options = [json_schema(arg) for arg in args if arg is not type(None)]
+        schema = options[0] if len(options) == 1 else {"anyOf": options}
+        if type(None) in args:
+            schema = {"anyOf": [schema, {"type": "null"}]}
+        return schema
+    if origin is list or tp is list:
+        return {"type": "array", "items": json_schema(args[0]) if args else {}}
+    if origin is dict or tp is dict:
+        return {"type": "object"}
+    return {str: {"type": "string"}, int: {"type": "integer"}, float: {"type": "number"},
+            bool: {"type": "boolean"}}.get(tp, {})
+
+
+def from_dict(tp, data, path: str = "$"):
+    if dataclasses.is_dataclass(tp):
+        fields = dataclasses.fields(tp)
+        if isinstance(data, str) and fields:
+            data = {fields[0].name: data}
+        if not isinstance(data, dict):
+            raise StructuredOutputError(f"{path}: expected an object, got {type(data).__name__}")
+
+        hints = typing.get_type_hints(tp)
+        values = {}
+        for f in fields:
+            if data.get(f.name) is not None:
+                values[f.name] = from_dict(hints[f.name], data[f.name], f"{path}.{f.name}")
+            elif f.default is dataclasses.MISSING and f.default_factory is dataclasses.MISSING:
+                raise StructuredOutputError(f"{path}.{f.name} is required")
+        return tp(**values)
+
+    origin, args = typing.get_origin(tp), typing.get_args(tp)
+    if origin in (typing.Union, types.UnionType):
+        if data is None and type(None) in args:
+            return None
+        for arg in args:
+            if arg is type(None):
+                continue
+            try:
+                return from_dict(arg, data, path)
+            except StructuredOutputError:
+                continue
+        raise StructuredOutputError(f"{path}: {data!r} does not match {tp}")
+    if origin is list or tp is list:
+        items = data if isinstance(data, list) else [data]
+        return [from_dict(args[0], item, f"{path}[{i}]") if args else item for i, item in enumerate(items)]
+    if origin is dict or tp is dict:
+        if not isinstance(data, dict):
+            raise StructuredOutputError(f"{path}: expected an object, got {type(data).__name__}")
+        return data
+    if tp is str:
+        if isinstance(data, (dict, list)):
+            return json.dumps(data, ensure_ascii=False)
+        return str(data)
+    if tp in (int, float):
+        try:
+            return tp(data)
+        except (TypeError, ValueError) as e:
+            raise StructuredOutputError(f"{path}: expected a number, got {data!r}") from e
+    if tp is bool:
+        if isinstance(data, str):
+            return data.strip().lower() in ("true", "yes", "1")
+        return bool(data)
+    return data
+
+
+class StreamingJSONParser:
+    def __init__(self, openers: str = "{["):
+        self.openers = openers
+        self.text = ""
+        self.start = -1
+        self.end = -1
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._pos = 0
+        self._value = None
+        self._rejected = None
+
+    @property
+    def done(self) -> bool:
+        return self.end >= 0
+
+    @property
+    def started(self) -> bool:
+        return self.start >= 0
+
+    def feed(self, chunk: str) -> bool:
+        self.text += chunk
+        if self.done:
+            return True
+
+        text, pos = self.text, self._pos
+        if not self.started:
+            pos = self._find_start(text, pos)
+            if not self.started:
+                self._pos = pos
+                return False
+        if self._escape and pos < len(text):
+            self._escape = False
+            pos += 1
+
+        while True:
+            match = SPECIAL_CHARS.search(text, pos)
+            if match is None:
+                break
+            char, index = match.group(0), match.start()
+            pos = index + 1
+
+            if self._in_string:
+                if char == "\\":
+                    if pos >= len(text):
+                        self._escape = True
+                    pos += 1
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in CLOSERS:
+                self._stack.append(char)
+            elif char in "}]":
+                self._stack.pop()
+                if self._stack:
+                    continue
+                try:
+                    self._value = json.loads(text[self.start:pos])
+                    self.end = pos
+                    break
+                except json.JSONDecodeError as e:
+                    self._rejected = (e, text[self.start:pos])
+                    restart, self.start = self.start + 1, -1
+                    pos = self._find_start(text, restart)
+                    if not self.started:
+                        break
+
+        self._pos = min(pos, len(text))
+        return self.done
+
+    def _find_start(self, text: str, pos: int) -> int:
+        fence = text.find(FENCE, pos)
+        if fence >= 0:
+            pos = fence + len(FENCE)
+        starts = [index for index in (text.find(opener, pos) for opener in self.openers) if index >= 0]
+        if not starts:
+            return max(pos, len(text) - len(FENCE) + 1)
+        self.start = min(starts)
+        self._stack.append(text[self.start])
+        return self.start + 1
+
+    def value(self):
+        if self.done:
+            return self._value
+        if not self.started and self._rejected:
+            error, raw = self._rejected
+            raise StructuredOutputError(f"Invalid JSON: {error}\nRAW RESPONSE:\n{raw}") from error
+        if not self.started:
+            raise StructuredOutputError("No JSON object found")
+        raise StructuredOutputError("JSON response is truncated")
+
+    def partial(self):
+        if not self.started:
+            return None
+        if self.done:
+            return self.value()
+
+        text = self.text[self.start:].rstrip()
+        if self._in_string:
+            text += '"'
+        text = re.sub(r'[,:]\s*$|,\s*"[^"]*"\s*$', "", text)
+        try:
+            return json.loads(text + "".join(CLOSERS[c] for c in reversed(self._stack)))
+        except json.JSONDecodeError:
+            return None
+
+
+def request_structured(system_prompt: str, user_prompt: str, schema=None, max_continuations: int = 2,
+                       client=None):
+    client = client or get_client()
+    schema_json = json_schema(schema) if schema else {}
+    request = LLMRequest(
+        system_prompt,
+        user_prompt,
+        response_schema=json.dumps(schema_json, sort_keys=True) if schema else None,
+    )
+
+    parser = StreamingJSONParser("{" if schema_json.get("type") == "object" else "{[")
+    for _ in range(max_continuations + 1):
+        try:
+            client.stream(request, parser.feed)
+        except PartialResponseError:
+            pass
+
+        if parser.done or not parser.started:
+            break
+        request = replace(request, continuation=parser.text)
+
+    if not parser.text.strip():
+        raise StructuredOutputError("LLM returned an empty response")
+    data = parser.value()
+    return from_dict(schema, data) if schema else data
@@ -0,0 +1,174 @@
+import contextvars
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+
+_current = contextvars.ContextVar("paper2prod_telemetry", default=None)
+_span = contextvars.ContextVar("paper2prod_span", default=None)
+
+
+def current():
+    return _current.get()
+
+
+def span(name: str, category: str = "stage", **attrs):
+    telemetry = _current.get()
+    if telemetry is None:
+        return nullcontext({})
+    return telemetry.span(name, category, **attrs)
+
+
+def record_bytes(content) -> None:
+    telemetry = _current.get()
+    if telemetry is None:
+        return
+    size = len(content.encode("utf-8")) if isinstance(content, str) else len(content)
+    telemetry.add_bytes(size)
+
+
+def traced(name: str, fn, category: str = "stage"):
+    def run(*args):
+        with span(name, category):
+            return fn(*args)
+    return run
+
+
+class Telemetry:
+    def __init__(self, listener=None):
+        self.events = []
+        self.listener = listener
+        self.origin = time.perf_counter()
+        self.started_at = time.time()
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def activate(self):
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+    @contextmanager
+    def span(self, name: str, category: str = "stage", **attrs):
+        parent = _span.get()
+        event = {
+            "name": name,
+            "cat": category,
+            "parent": parent["name"] if parent else None,
+            "thread": threading.get_ident(),
+            "start": time.perf_counter() - self.origin,
+            "status": "ok",
+            "bytes_written": 0,
+            **attrs,
+        }
+        token = _span.set(event)
+        self._notify("start", event)
+        try:
+            yield event
+        except BaseException as e:
+            event["status"] = "failed"
+            event["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _span.reset(token)
+            event["seconds"] = time.perf_counter() - self.origin - event["start"]
+            with self._lock:
+                self.events.append(event)
+            self._notify("end", event)
+
+    def add_bytes(self, size: int) -> None:
+        event = _span.get()
+        with self._lock:
+            if event is not None:
+                event["bytes_written"] += size
+            else:
+                self.events.append({
+                    "name": "write", "cat": "io", "parent": None,
+                    "thread": threading.get_ident(),
+                    "start": time.perf_counter() - self.origin, "seconds": 0.0,
+                    "status": "ok", "bytes_written": size,
+                })
+
+    def _notify(self, phase: str, event: dict) -> None:
+        if self.listener is None:
+            return
+        try:
+            self.listener(phase, dict(event))
+        except Exception:
+            pass
+
+    def totals(self) -> dict:
+        with self._lock:
+            events = list(self.events)
+
+        calls = [e for e in events if e["cat"] == "llm"]
+        return {
+            "wall_seconds": time.perf_counter() - self.origin,
+            "stages": {e["name"]: e["seconds"] for e in events if e["cat"] == "stage"},
+            "llm_calls": len(calls),
+            "llm_seconds": sum(e["seconds"] for e in calls),
+            "cache_hits": sum(1 for e in calls if e.get("cached")),
+            "retries": sum(e.get("retries", 0) for e in calls),
+            "prompt_chars": sum(e.get("prompt_chars", 0) for e in calls),
+            "prompt_tokens": sum(e.get("prompt_tokens", 0) for e in calls),
+            "response_chars": sum(e.get("response_chars", 0) for e in calls),
+            "response_tokens": sum(e.get("response_tokens", 0) for e in calls),
+            "bytes_written": sum(e["bytes_written"] for e in events),
+        }
+
+    def summary(self) -> str:
+        totals = self.totals()
+        lines = [f"Run finished in {totals['wall_seconds']:.2f}s"]
+        for name, seconds in sorted(totals["stages"].items(), key=lambda item: -item[1]):
+            lines.append(f"  {name:<16} {seconds:8.2f}s")
+        lines.append(
+            f"LLM: {totals['llm_calls']} calls ({totals['cache_hits']} cached, "
+            f"{totals['retries']} retries) in {totals['llm_seconds']:.2f}s"
+        )
+        lines.append(
+            f"Tokens: ~{totals['prompt_tokens']} prompt / ~{totals['response_tokens']} response "
+            f"({totals['prompt_chars']} / {totals['response_chars']} chars)"
+        )
+        lines.append(f"Written: {totals['bytes_written']} bytes")
+        return "\n".join(lines)
+
+    def write_jsonl(self, path: str) -> None:
+        with self._lock:
+            events = sorted(self.events, key=lambda e: e["start"])
+        self._write(path, "".join(json.dumps(e, default=str) + "\n" for e in events))
+
+    def write_chrome_trace(self, path: str) -> None:
+        with self._lock:
+            events = sorted(self.events, key=lambda e: e["start"])
+
+        trace = [
+            {
+                "name": e["name"],
+                "cat": e["cat"],
+                "ph": "X",
+                "ts": e["start"] * 1e6,
+                "dur": e["seconds"] * 1e6,
+                "pid": self.pid,
+                "tid": e["thread"],
+                "args": {
+                    k: v for k, v in e.items()
+                    if k not in ("name", "cat", "start", "seconds", "thread")
+                },
+            }
+            for e in events
+        ]
+        self._write(path, json.dumps({"traceEvents": trace, "displayTimeUnit": "ms"}, default=str))
+
+    def _write(self, path: str, content: str) -> None:
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
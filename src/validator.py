@@ -1,14 +1,210 @@
-import numpy as np
+import os
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+
+
+WORKER = """
+import sys
+memory, cpu, kind, target = int(sys.argv[1]), int(sys.argv[2]), sys.argv[3], sys.argv[4]
+try:
+    import resource
+    if memory:
+        resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+    if cpu:
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu))
+except (ImportError, ValueError, OSError):
+    pass
+sys.path[:0] = sys.argv[5:]
+if kind == "test":
+    try:
+        import pytest
+    except ImportError:
+        import importlib.util
+        import unittest
+        spec = importlib.util.spec_from_file_location("__validated_test__", target)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        suite = unittest.defaultTestLoader.loadTestsFromModule(module)
+        if not suite.countTestCases():
+            sys.exit(6)
+        sys.exit(0 if unittest.TextTestRunner().run(suite).wasSuccessful() else 1)
+    sys.exit(pytest.main(["-q", "-p", "no:cacheprovider", target]))
+import importlib
+importlib.import_module(target)
+"""
+
+NO_TESTS_COLLECTED = 5
+PYTEST_UNAVAILABLE = 6
+
+
+@dataclass
+class FileResult:
+    path: str
+    kind: str
+    status: str
+    seconds: float = 0.0
+    error: str | None = None
+    output: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ("passed", "skipped")
+
+    @property
+    def feedback(self) -> str:
+        return f"{self.status}: {self.error}\n{self.output}".strip()
+
+
+@dataclass
+class ValidationReport:
+    paper_dir: str
+    results: list = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return all(result.ok for result in self.results)
+
+    def failures(self) -> list:
+        return [result for result in self.results if not result.ok]
+
+    def merge(self, other: "ValidationReport") -> "ValidationReport":
+        results = {result.path: result for result in self.results}
+        results.update({result.path: result for result in other.results})
+        return ValidationReport(
+            self.paper_dir, [results[path] for path in sorted(results)], self.seconds + other.seconds
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "paper_dir": self.paper_dir,
+            "ok": self.ok,
+            "seconds": self.seconds,
+            "results": [asdict(result) for result in self.results],
+        }
+
 
 class Validator:
-    def validate(self, code: str) -> bool:
-        """
-        Basic sanity validation.
-        """
-        local_env = {}
-        exec(code, local_env)
+    def __init__(self, max_workers: int = 4, timeout: float = 60.0, memory_mb: int = 2048,
+                 cpu_seconds: int | None = None, output_chars: int = 4000):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.cpu_seconds = cpu_seconds if cpu_seconds is not None else int(timeout)
+        self.output_chars = output_chars
+
+    def validate(self, paper_dir: str, paths=None) -> ValidationReport:
+        start = time.perf_counter()
+        files = sorted(paths) if paths is not None else self.discover(paper_dir)
+        roots = self._roots(paper_dir)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = list(pool.map(lambda path: self._check(paper_dir, path, roots), files))
+
+        return ValidationReport(paper_dir, results, time.perf_counter() - start)
+
+    def discover(self, paper_dir: str) -> list:
+        files = []
+        for directory, dirnames, filenames in os.walk(paper_dir):
+            dirnames[:] = sorted(d for d in dirnames if d != "__pycache__" and not d.startswith("."))
+            for name in filenames:
+                if name.endswith(".py"):
+                    files.append(os.path.relpath(os.path.join(directory, name), paper_dir).replace(os.sep, "/"))
+        return sorted(files)
+
+    def is_test(self, path: str) -> bool:
+        parts = path.split("/")
+        name = parts[-1]
+        return name.startswith("test_") or name.endswith("_test.py") or "tests" in parts[:-1]
+
+    def _check(self, paper_dir: str, path: str, roots: list) -> FileResult:
+        kind = "test" if self.is_test(path) else "module"
+        start = time.perf_counter()
+
+        try:
+            with open(os.path.join(paper_dir, path), "r", encoding="utf-8") as f:
+                compile(f.read(), path, "exec")
+        except (OSError, SyntaxError, ValueError) as e:
+            return FileResult(path, kind, "error", time.perf_counter() - start, f"{type(e).__name__}: {e}")
+
+        target = os.path.join(paper_dir, path) if kind == "test" else self._module_name(path, roots, paper_dir)
+        if not target:
+            return FileResult(path, kind, "skipped", time.perf_counter() - start)
+
+        status, error, output = self._run(paper_dir, kind, target, roots)
+        return FileResult(path, kind, status, time.perf_counter() - start, error, output)
+
+    def _run(self, paper_dir: str, kind: str, target: str, roots: list):
+        command = [
+            sys.executable, "-c", WORKER,
+            str(self.memory_mb * 1024 * 1024 if self.memory_mb else 0),
+            str(self.cpu_seconds or 0), kind, os.path.abspath(target) if kind == "test" else target,
+            *roots,
+        ]
+        env = {k: v for k, v in os.environ.items() if k != "PYTHONPATH"}
+        env.update({"OPENBLAS_NUM_THREADS": "1", "OMP_NUM_THREADS": "1", "MKL_NUM_THREADS": "1",
+                    "PYTHONDONTWRITEBYTECODE": "1", "PYTHONPATH": os.pathsep.join(roots)})
+
+        process = subprocess.Popen(
+            command, cwd=paper_dir, env=env, stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+            start_new_session=os.name == "posix",
+        )
+        try:
+            output, _ = process.communicate(timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            self._kill(process)
+            output, _ = process.communicate()
+            return "timeout", f"Timed out after {self.timeout:g}s", self._tail(output)
+
+        output = self._tail(output)
+        if process.returncode == 0:
+            return "passed", None, output
+        if kind == "test" and process.returncode == NO_TESTS_COLLECTED:
+            return "skipped", None, output
+        if kind == "test" and process.returncode == PYTEST_UNAVAILABLE:
+            return "skipped", "pytest is not installed; only unittest cases were run", output
+        if process.returncode < 0 and -process.returncode == getattr(signal, "SIGXCPU", None):
+            return "timeout", f"CPU limit of {self.cpu_seconds}s exceeded", output
+        return "failed", self._last_error(output, process.returncode), output
+
+    def _kill(self, process) -> None:
+        try:
+            if os.name == "posix":
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def _roots(self, paper_dir: str) -> list:
+        roots = [os.path.abspath(paper_dir)]
+        src = os.path.join(paper_dir, "src")
+        if os.path.isdir(src):
+            roots.append(os.path.abspath(src))
+        return roots
+
+    def _module_name(self, path: str, roots: list, paper_dir: str) -> str:
+        absolute = os.path.abspath(os.path.join(paper_dir, path))
+        root = max((r for r in roots if absolute.startswith(r + os.sep)), key=len)
+        parts = os.path.relpath(absolute, root)[:-len(".py")].split(os.sep)
+        if parts[-1] == "__init__":
+            parts = parts[:-1]
+        return ".".join(parts)
 
-        def grad(w): return 2 * w
-        result = local_env["gradient_descent"](grad, 10.0)
+    def _tail(self, output: str | None) -> str:
+        output = output or ""
+        return output[-self.output_chars:]
 
-        return abs(result) < 1e-2
+    def _last_error(self, output: str, returncode: int) -> str:
+        lines = [line for line in output.strip().splitlines() if line.strip()]
+        for line in reversed(lines):
+            if "Error" in line or "Exception" in line or line.startswith("FAILED"):
+                return line.strip()
+        return lines[-1].strip() if lines else f"Exited with status {returncode}"
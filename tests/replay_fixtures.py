@@ -0,0 +1,41 @@
+import json
+
+
+PROBLEM_SPEC = {
+    "problem_name": "Root finding",
+    "problem_type": "optimization",
+    "objective": {"description": "Find a stationary point", "type": "minimize"},
+    "inputs": [{"name": "f", "type": "function", "description": "objective", "access": "oracle"}],
+    "outputs": [{"name": "x", "type": "vector", "description": "minimizer"}],
+    "constraints": [],
+    "assumptions": [],
+    "solution_quality": {"type": "approximate", "metric": "error", "tolerance": "1e-6"},
+    "languages": [{"name": "python", "confidence": 0.9, "reason": "numerical"}],
+}
+
+CODE_PLAN = {
+    "files": [
+        {"path": "newton/solver.py", "purpose": "solver"},
+        {"path": "newton/functions.py", "purpose": "test functions"},
+        {"path": "tests/test_solver.py", "purpose": "tests"},
+    ],
+    "entry_point": "newton/solver.py",
+    "dependencies": ["numpy"],
+    "public_api": ["newtons_method"],
+    "test_strategy": "pytest",
+}
+
+
+def pipeline_responder(request):
+    prompt = request.user_prompt
+    if "Extract the CORE PROBLEM DEFINITION" in prompt:
+        return json.dumps(PROBLEM_SPEC)
+    if "Plan a production-quality implementation" in prompt:
+        return "```json\n" + json.dumps(CODE_PLAN) + "\n```"
+    if "Write a README.md" in prompt:
+        return "# Generated\n"
+    if "Write production-quality code." in prompt:
+        return '```python\n"""Generated module."""\n\nVALUE = 1\n```'
+    if "determine the most suitable" in prompt:
+        return json.dumps({"languages": PROBLEM_SPEC["languages"]})
+    raise KeyError("Unexpected prompt")
@@ -0,0 +1,77 @@
+import json
+import os
+import src.llm_client as llm_client
+from src.artifact_writer import MANIFEST_NAME, ArtifactWriter
+from src.llm_client import FakeBackend, LLMClient
+from src.pipeline import PaperToProdPipeline
+from tests.replay_fixtures import pipeline_responder
+
+
+def test_unchanged_content_is_not_rewritten(tmp_path):
+    writer = ArtifactWriter(str(tmp_path))
+    assert writer.write("pkg/solver.py", "VALUE = 1\n")
+    writer.save()
+    mtime = os.stat(tmp_path / "pkg" / "solver.py").st_mtime_ns
+
+    writer = ArtifactWriter(str(tmp_path))
+    assert not writer.write("pkg/solver.py", "VALUE = 1\n")
+    assert writer.write("pkg/other.py", "OTHER = 2\n")
+    writer.save()
+
+    assert writer.unchanged == ["pkg/solver.py"]
+    assert writer.written == ["pkg/other.py"]
+    assert os.stat(tmp_path / "pkg" / "solver.py").st_mtime_ns == mtime
+    with open(tmp_path / MANIFEST_NAME, encoding="utf-8") as f:
+        assert sorted(json.load(f)["files"]) == ["pkg/other.py", "pkg/solver.py"]
+
+
+def test_edited_file_is_rewritten(tmp_path):
+    writer = ArtifactWriter(str(tmp_path))
+    writer.write("solver.py", "VALUE = 1\n")
+    writer.save()
+    (tmp_path / "solver.py").write_text("VALUE = 9\n", encoding="utf-8")
+
+    writer = ArtifactWriter(str(tmp_path))
+    assert writer.write("solver.py", "VALUE = 1\n")
+    assert (tmp_path / "solver.py").read_text(encoding="utf-8") == "VALUE = 1\n"
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_new_files_follow_umask_and_rewrites_keep_their_mode(tmp_path):
+    umask = os.umask(0o022)
+    try:
+        writer = ArtifactWriter(str(tmp_path))
+        writer.write("run.sh", "echo 1\n")
+        os.chmod(tmp_path / "run.sh", 0o750)
+        writer.write("run.sh", "echo 2\n")
+        writer.write("new.py", "VALUE = 1\n")
+    finally:
+        os.umask(umask)
+
+    assert os.stat(tmp_path / "run.sh").st_mode & 0o777 == 0o750
+    assert os.stat(tmp_path / "new.py").st_mode & 0o777 == 0o644
+
+
+def test_pipeline_writes_one_readme_and_skips_identical_output(tmp_path):
+    paper = tmp_path / "newton.tex"
+    paper.write_text("\\section{Method}\nNewton's method.\n", encoding="utf-8")
+    backend = FakeBackend(responder=pipeline_responder)
+    llm_client.set_client(LLMClient(backend=backend))
+    try:
+        for lineage in ("first", "second"):
+            pipeline = PaperToProdPipeline(
+                output_root=str(tmp_path / "codes"),
+                runs_dir=str(tmp_path / "runs"),
+                lineage_dir=str(tmp_path / lineage),
+                index_dir=None,
+                validate=False,
+            )
+            pipeline.run(str(paper))
+    finally:
+        llm_client.set_client(None)
+
+    readme_prompts = [r for r in backend.requests if "Write a README.md" in r.user_prompt]
+    assert len(readme_prompts) == 2
+    assert all(r.system_prompt == "You write concise, practical README files." for r in readme_prompts)
+    assert pipeline.last_run["written_files"] == []
+    assert "README.md" in pipeline.last_run["unchanged_writes"]
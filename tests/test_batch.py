@@ -0,0 +1,45 @@
+import json
+import os
+from src.batch import BatchRunner
+
+
+class StubPipeline:
+    def run(self, fileName: str):
+        if "broken" in fileName:
+            raise RuntimeError("No valid problem found in paper")
+        return os.path.splitext(fileName)[0] + "_out"
+
+
+def make_papers(tmp_path):
+    papers = tmp_path / "papers"
+    papers.mkdir()
+    for name in ["a.tex", "b.tex", "broken.tex", "notes.txt"]:
+        (papers / name).write_text("\\section{Intro} text", encoding="utf-8")
+    return papers
+
+
+def test_discover_filters_supported_files(tmp_path):
+    papers = make_papers(tmp_path)
+    runner = BatchRunner(pipeline_factory=StubPipeline)
+
+    found = runner.discover(str(papers), str(papers / "*.tex"))
+
+    assert [os.path.basename(p) for p in found] == ["a.tex", "b.tex", "broken.tex"]
+
+
+def test_failures_are_isolated_and_recorded(tmp_path):
+    papers = make_papers(tmp_path)
+    manifest_path = tmp_path / "manifest.json"
+    runner = BatchRunner(workers=2, pipeline_factory=StubPipeline)
+
+    manifest = runner.run(str(papers), manifest_path=str(manifest_path))
+
+    assert manifest["succeeded"] == 2
+    assert manifest["failed"] == 1
+    statuses = {os.path.basename(p["paper"]): p for p in manifest["papers"]}
+    assert statuses["broken.tex"]["status"] == "failed"
+    assert "No valid problem" in statuses["broken.tex"]["error"]
+    assert statuses["a.tex"]["output_dir"].endswith("a_out")
+
+    with open(manifest_path, encoding="utf-8") as f:
+        assert json.load(f)["failed"] == 1
@@ -0,0 +1,73 @@
+import os
+import shutil
+import pytest
+import src.llm_client as llm_client
+from src.checkpoint import RunStore
+from src.llm_client import FakeBackend, LLMClient
+from src.pipeline import PaperToProdPipeline
+from tests.replay_fixtures import pipeline_responder
+
+
+@pytest.fixture
+def paper(tmp_path):
+    path = tmp_path / "lec21.tex"
+    shutil.copy(os.path.join("samples", "lec21.tex"), path)
+    return str(path)
+
+
+def use_backend(responder):
+    backend = FakeBackend(responder=responder)
+    llm_client.set_client(LLMClient(backend=backend))
+    return backend
+
+
+@pytest.fixture(autouse=True)
+def reset_client():
+    yield
+    llm_client.set_client(None)
+
+
+def test_stage_is_loaded_on_resume(tmp_path, paper):
+    RunStore(paper, str(tmp_path / "runs")).save("plan", {"files": []})
+    store = RunStore(paper, str(tmp_path / "runs"), resume=True)
+
+    assert store.stage("plan", lambda: pytest.fail("stage should be skipped")) == {"files": []}
+    assert store.skipped == ["plan"]
+
+
+def test_artifact_paths_cannot_escape_run_dir(tmp_path, paper):
+    store = RunStore(paper, str(tmp_path / "runs"))
+
+    with pytest.raises(ValueError):
+        store.artifact("../outside.py", lambda: "")
+
+
+def test_resume_only_regenerates_missing_artifacts(tmp_path, paper):
+    def failing_responder(request):
+        if "newton/functions.py" in request.user_prompt:
+            raise RuntimeError("connection reset")
+        return pipeline_responder(request)
+
+    pipeline = PaperToProdPipeline(
+        output_root=str(tmp_path / "codes"),
+        runs_dir=str(tmp_path / "runs"),
+        lineage_dir=str(tmp_path / "lineage"),
+        index_dir=str(tmp_path / "index"),
+    )
+
+    use_backend(failing_responder)
+    with pytest.raises(RuntimeError):
+        pipeline.run(paper)
+
+    store = RunStore(paper, str(tmp_path / "runs"))
+    completed = sum(len(files) for _, _, files in os.walk(os.path.join(store.run_dir, "artifacts")))
+
+    backend = use_backend(pipeline_responder)
+    output_dir = pipeline.run(paper, resume=True)
+
+    prompts = [r.user_prompt for r in backend.requests]
+    assert len(prompts) == 4 - completed
+    assert any("newton/functions.py" in p for p in prompts)
+    assert not any("Extract the CORE PROBLEM" in p or "Plan a production" in p for p in prompts)
+    assert os.path.exists(os.path.join(output_dir, "newton", "functions.py"))
+    assert os.path.exists(os.path.join(output_dir, "README.md"))
@@ -0,0 +1,56 @@
+import os
+import threading
+import pytest
+import src.llm_client as llm_client
+from src.code_generator import CodeGenerator
+from src.llm_client import FakeBackend, LLMClient
+
+
+@pytest.fixture
+def fake_backend():
+    backend = FakeBackend(responder=lambda request: "```python\nVALUE = 1\n```", latency=0.1)
+    llm_client.set_client(LLMClient(backend=backend))
+    yield backend
+    llm_client.set_client(None)
+
+
+def test_files_are_generated_concurrently(tmp_path):
+    plan = {"files": [{"path": f"src/module_{i}.py", "purpose": "demo"} for i in range(8)]}
+    generator = CodeGenerator(max_workers=9)
+    # Every call waits for all nine, so the barrier only releases if the calls overlap.
+    barrier = threading.Barrier(9, timeout=10)
+
+    def responder(request):
+        barrier.wait()
+        return "```python\nVALUE = 1\n```"
+
+    backend = FakeBackend(responder=responder)
+    llm_client.set_client(LLMClient(backend=backend))
+    try:
+        paper_dir = generator.generate({"problem_name": "demo"}, plan, "demo.tex", str(tmp_path))
+    finally:
+        llm_client.set_client(None)
+
+    assert len(backend.requests) == 9
+    assert sorted(generator.file_timings) == sorted(
+        [f"src/module_{i}.py" for i in range(8)] + ["README.md"]
+    )
+    with open(os.path.join(paper_dir, "src", "module_0.py"), encoding="utf-8") as f:
+        assert f.read() == "VALUE = 1"
+
+
+def test_repair_only_reprompts_failing_files(tmp_path, fake_backend):
+    plan = {"files": [{"path": f"src/module_{i}.py", "purpose": "demo"} for i in range(3)]}
+    generator = CodeGenerator(max_workers=4)
+    paper_dir = generator.generate({"problem_name": "demo"}, plan, "demo.tex", str(tmp_path))
+    before = len(fake_backend.requests)
+
+    repaired = generator.repair({"problem_name": "demo"}, plan, paper_dir, {
+        "src/module_1.py": "failed: NameError: name 'x' is not defined",
+        "__init__.py": "failed: not part of the plan",
+    })
+
+    assert repaired == ["src/module_1.py"]
+    prompts = [request.user_prompt for request in fake_backend.requests[before:]]
+    assert len(prompts) == 1
+    assert "NameError" in prompts[0] and "VALUE = 1" in prompts[0]
@@ -0,0 +1,70 @@
+import src.llm_client as llm_client
+from src.context_builder import EXTRACTION_QUERY, LANGUAGE_QUERY, TERM_PATTERN, ContextBuilder, estimate_tokens
+from src.llm_client import FakeBackend, LLMClient
+from src.paper_parser import PaperParser
+from src.problem_extractor import ProblemExtractor
+from tests.replay_fixtures import pipeline_responder
+
+
+def filler(word, count):
+    return " ".join([word] * count)
+
+
+def test_estimate_tokens_splits_long_words_and_symbols():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("a b c") == 3
+    assert estimate_tokens("optimization") == 2
+    assert estimate_tokens("$x^2$") == 5
+
+
+def test_query_terms_can_all_match():
+    for query in (EXTRACTION_QUERY, LANGUAGE_QUERY):
+        assert all(TERM_PATTERN.fullmatch(term) for term in query.split())
+
+
+def test_selection_respects_budget_and_keeps_order():
+    sections = {
+        "Introduction": {"text": "We study the problem of finding an approximate equilibrium."},
+        "History": {"text": filler("anecdote", 400)},
+        "Setup": {"text": "The input is a payoff matrix and the output an epsilon solution subject to constraints."},
+    }
+    builder = ContextBuilder(budget_tokens=60, chunk_words=50)
+
+    selected = builder.select(sections)
+
+    assert list(selected) == ["Introduction", "Setup"]
+    assert estimate_tokens(builder.render(selected)) <= 60 + 10
+
+
+def test_opening_chunk_is_always_kept():
+    sections = {
+        "Overview": {"text": "Lecture notes on descent methods."},
+        "Body": {"text": "objective constraints inputs outputs epsilon tolerance " * 5},
+    }
+
+    selected = ContextBuilder(budget_tokens=100).select(sections)
+
+    assert selected["Overview"]["text"] == "Lecture notes on descent methods."
+
+
+def test_oversized_opening_chunk_is_truncated_to_budget():
+    sections = {"Abstract": {"text": filler("equilibrium", 300)}}
+
+    selected = ContextBuilder(budget_tokens=50, chunk_words=300).select(sections)
+
+    assert selected["Abstract"]["text"].startswith("equilibrium equilibrium")
+    assert estimate_tokens(selected["Abstract"]["text"]) <= 50
+
+
+def test_extraction_prompt_fits_budget():
+    backend = FakeBackend(responder=pipeline_responder)
+    llm_client.set_client(LLMClient(backend=backend))
+    try:
+        parsed = PaperParser().parse("samples/second_paper_main-arxiv-010526.tex")
+        ProblemExtractor(token_budget=2000).extract(parsed)
+    finally:
+        llm_client.set_client(None)
+
+    prompt = backend.requests[0].user_prompt
+    assert estimate_tokens(prompt) < 2000 + 600
+    assert "matrix games" in prompt
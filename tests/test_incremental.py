@@ -0,0 +1,58 @@
+import pytest
+import src.llm_client as llm_client
+from src.llm_client import FakeBackend, LLMClient
+from src.pipeline import PaperToProdPipeline
+from tests.replay_fixtures import pipeline_responder
+
+
+PAPER = r"""
+\documentclass{article}
+\begin{document}
+\section{Introduction}
+We study Newton's method for unconstrained minimization.
+\section{Method}
+Each step solves a linear system with the Hessian.
+\section{Acknowledgments}
+We thank the reviewers.
+\end{document}
+"""
+
+
+@pytest.fixture
+def backend():
+    backend = FakeBackend(responder=pipeline_responder)
+    llm_client.set_client(LLMClient(backend=backend))
+    yield backend
+    llm_client.set_client(None)
+
+
+def run_and_count(pipeline, paper, backend):
+    before = len(backend.requests)
+    pipeline.run(str(paper))
+    return len(backend.requests) - before
+
+
+def test_only_changed_inputs_are_regenerated(tmp_path, backend):
+    paper = tmp_path / "newton.tex"
+    paper.write_text(PAPER, encoding="utf-8")
+    pipeline = PaperToProdPipeline(
+        output_root=str(tmp_path / "codes"),
+        runs_dir=str(tmp_path / "runs"),
+        lineage_dir=str(tmp_path / "lineage"),
+        index_dir=str(tmp_path / "index"),
+    )
+
+    assert run_and_count(pipeline, paper, backend) == 6
+
+    assert run_and_count(pipeline, paper, backend) == 0
+    assert pipeline.last_run["changed_sections"] == []
+    assert pipeline.last_run["regenerated_files"] == []
+
+    paper.write_text(PAPER.replace("the reviewers", "our reviewers"), encoding="utf-8")
+    assert run_and_count(pipeline, paper, backend) == 0
+    assert pipeline.last_run["changed_sections"] == ["Acknowledgments"]
+
+    paper.write_text(PAPER.replace("linear system", "linear sytem"), encoding="utf-8")
+    assert run_and_count(pipeline, paper, backend) == 1
+    assert pipeline.last_run["changed_sections"] == ["Acknowledgments", "Method"]
+    assert "plan" in pipeline.last_run["reused_stages"]
@@ -0,0 +1,82 @@
+import time
+import src.llm_client as llm_client
+from src.language_detector import HeuristicLanguageDetector, LanguageDetector
+from src.llm_client import FakeBackend, LLMClient
+from src.paper_parser import PaperParser
+from src.pipeline import PaperToProdPipeline
+from tests.replay_fixtures import pipeline_responder
+
+
+def sections(text):
+    return {"Experiments": {"text": text}}
+
+
+def test_library_mentions_pick_the_language():
+    result = HeuristicLanguageDetector().detect(sections(
+        "We implement the method in PyTorch and compare with NumPy and SciPy baselines. "
+        "Our PyTorch code runs on a single GPU."
+    ))
+
+    assert result["languages"][0]["name"] == "python"
+    assert "pytorch (2)" in result["languages"][0]["reason"]
+    assert result["source"] == "heuristic"
+
+
+def test_keywords_need_word_boundaries():
+    result = HeuristicLanguageDetector().detect(sections("A robust and trusted method, see javascript."))
+
+    assert result["languages"] == []
+
+
+def test_confident_local_result_skips_llm():
+    backend = FakeBackend()
+    llm_client.set_client(LLMClient(backend=backend))
+    try:
+        parsed = PaperParser().parse("samples/lec21.tex")
+        start = time.perf_counter()
+        result = LanguageDetector().detect(parsed)
+        elapsed = time.perf_counter() - start
+    finally:
+        llm_client.set_client(None)
+
+    assert result["languages"][0]["name"] == "python"
+    assert backend.requests == []
+    assert elapsed < 0.05
+
+
+def test_low_confidence_falls_back_to_llm():
+    backend = FakeBackend(responder=lambda request: '{"languages": [{"name": "Julia", "confidence": 0.8, "reason": "x"}]}')
+    llm_client.set_client(LLMClient(backend=backend))
+    try:
+        result = LanguageDetector().detect("We present a new proof technique.")
+    finally:
+        llm_client.set_client(None)
+
+    assert len(backend.requests) == 1
+    assert result["languages"][0]["name"] == "julia"
+
+
+def test_explicit_mention_outweighs_domain_words():
+    result = HeuristicLanguageDetector().detect(sections(
+        "We implement the convex optimization algorithm in MATLAB, taking a stochastic gradient "
+        "step on the payoff matrix at every iteration of learning."
+    ))
+
+    assert [language["name"] for language in result["languages"]] == ["matlab"]
+
+
+def test_confident_local_detection_overrides_extracted_languages(tmp_path):
+    paper = tmp_path / "solver.tex"
+    paper.write_text("\\section{Method}\nOur MATLAB code uses MATLAB toolboxes and YALMIP.\n", encoding="utf-8")
+    backend = FakeBackend(responder=pipeline_responder)
+    llm_client.set_client(LLMClient(backend=backend))
+    try:
+        PaperToProdPipeline(output_root=str(tmp_path / "codes"), runs_dir=str(tmp_path / "runs"),
+                            lineage_dir=str(tmp_path / "lineage"), index_dir=None,
+                            validate=False).run(str(paper))
+    finally:
+        llm_client.set_client(None)
+
+    plan_prompt = next(r.user_prompt for r in backend.requests if "Plan a production-quality" in r.user_prompt)
+    assert "matlab" in plan_prompt
+    assert not any("determine the most suitable" in r.user_prompt for r in backend.requests)
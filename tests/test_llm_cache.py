@@ -0,0 +1,63 @@
+import os
+import time
+from src.llm_cache import ResponseCache, make_cache_key
+
+
+def test_cache_key_depends_on_every_field():
+    base = make_cache_key("gemini-2.5-flash", "sys", "user", 0.1, 8192)
+
+    assert base == make_cache_key("gemini-2.5-flash", "sys", "user", 0.1, 8192)
+    assert base != make_cache_key("gemini-2.5-pro", "sys", "user", 0.1, 8192)
+    assert base != make_cache_key("gemini-2.5-flash", "sys2", "user", 0.1, 8192)
+    assert base != make_cache_key("gemini-2.5-flash", "sys", "user2", 0.1, 8192)
+    assert base != make_cache_key("gemini-2.5-flash", "sys", "user", 0.2, 8192)
+    assert base != make_cache_key("gemini-2.5-flash", "sys", "user", 0.1, 4096)
+
+
+def test_hit_and_miss_are_counted(tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path))
+
+    assert cache.get("a" * 64) is None
+    cache.put("a" * 64, "response")
+    assert cache.get("a" * 64) == "response"
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+
+
+def test_entries_persist_across_instances(tmp_path):
+    ResponseCache(cache_dir=str(tmp_path)).put("b" * 64, "persisted")
+
+    assert ResponseCache(cache_dir=str(tmp_path)).get("b" * 64) == "persisted"
+
+
+def test_expired_entries_are_dropped(tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path), ttl_seconds=0.01)
+    cache.put("c" * 64, "stale")
+    time.sleep(0.05)
+
+    assert cache.get("c" * 64) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path), max_bytes=250)
+    cache.put("d" * 64, "x" * 50)
+    cache.put("e" * 64, "y" * 50)
+    cache.get("d" * 64)
+    cache.put("f" * 64, "z" * 50)
+
+    assert cache.get("e" * 64) is None
+    assert cache.get("d" * 64) == "x" * 50
+    assert cache.get("f" * 64) == "z" * 50
+    assert cache.stats()["evictions"] == 1
+
+
+def test_disabled_cache_never_stores(tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path), enabled=False)
+    cache.put("g" * 64, "ignored")
+
+    assert cache.get("g" * 64) is None
+    assert os.listdir(tmp_path) == []
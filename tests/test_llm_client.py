@@ -0,0 +1,116 @@
+import asyncio
+import time
+import pytest
+import src.llm_client as llm_client
+from src.llm_cache import ResponseCache
+from src.llm_client import (
+    FakeBackend,
+    LLMBackend,
+    LLMClient,
+    LLMRequest,
+    RateLimiter,
+    RetryableError,
+    TokenBucket,
+    parse_retry_hint,
+)
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    delays = []
+    monkeypatch.setattr(llm_client.time, "sleep", delays.append)
+    return delays
+
+
+def test_fake_backend_answers_through_client():
+    backend = FakeBackend(responder={"PLAN": '{"files": []}'})
+    client = LLMClient(backend=backend)
+
+    assert client.call(LLMRequest("sys", "PLAN this")) == '{"files": []}'
+    assert len(backend.requests) == 1
+
+
+def test_backend_must_implement_generate():
+    class Incomplete(LLMBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_cached_response_skips_backend(tmp_path):
+    backend = FakeBackend()
+    client = LLMClient(backend=backend, cache=ResponseCache(cache_dir=str(tmp_path)))
+
+    client.call(LLMRequest("sys", "same prompt"))
+    client.call(LLMRequest("sys", "same prompt"))
+    client.call(LLMRequest("sys", "same prompt"), use_cache=False)
+
+    assert len(backend.requests) == 2
+    assert client.cache.hits == 1
+
+
+def test_retry_honours_retry_hint(no_sleep):
+    backend = FakeBackend(errors=[RetryableError("429", retry_after=7.0)])
+    client = LLMClient(backend=backend)
+
+    assert client.call(LLMRequest("sys", "hello")) == "hello"
+    assert len(backend.requests) == 2
+    assert no_sleep[0] >= 7.0
+
+
+def test_retries_are_exhausted(no_sleep):
+    backend = FakeBackend(errors=[RetryableError("503")] * 3)
+    client = LLMClient(backend=backend, retries=3)
+
+    with pytest.raises(RuntimeError):
+        client.call(LLMRequest("sys", "hello"))
+    assert len(backend.requests) == 3
+
+
+def test_async_calls_fan_out_concurrently():
+    backend = FakeBackend(latency=0.1)
+    client = LLMClient(backend=backend)
+
+    async def run():
+        return await asyncio.gather(*[
+            client.acall(LLMRequest("sys", f"prompt {i}")) for i in range(10)
+        ])
+
+    start = time.perf_counter()
+    results = asyncio.run(run())
+
+    assert results == [f"prompt {i}" for i in range(10)]
+    assert time.perf_counter() - start < 0.5
+
+
+def test_acall_gemini_uses_configured_client():
+    llm_client.set_client(LLMClient(backend=FakeBackend(responder=lambda r: "async ok")))
+    try:
+        assert asyncio.run(llm_client.acall_gemini("sys", "user")) == "async ok"
+        assert llm_client.call_gemini("sys", "user") == "async ok"
+    finally:
+        llm_client.set_client(None)
+
+
+def test_token_bucket_reports_wait_once_exhausted():
+    bucket = TokenBucket(per_minute=60, capacity=2)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(1.0, abs=0.05)
+
+
+def test_rate_limiter_combines_request_and_token_limits():
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=60)
+
+    assert limiter.reserve(60) == 0.0
+    assert limiter.reserve(30) == pytest.approx(30.0, abs=0.1)
+
+
+def test_parse_retry_hint_from_error_details():
+    class QuotaError(Exception):
+        details = {"error": {"details": [{"retryDelay": "12s"}]}}
+
+    assert parse_retry_hint(QuotaError()) == 12.0
+    assert parse_retry_hint(Exception("boom")) is None
@@ -0,0 +1,108 @@
+import os
+import pytest
+from src.paper_parser import IncludeResolver, LatexTokenizer, PaperParser
+
+
+TEX = r"""\documentclass{article}
+\usepackage{amsmath} % math
+\begin{document}
+Preamble text is dropped.
+\section{Introduction}
+We cite prior work \cite{smith20} here. % a comment
+Costs rose by 5\% this year.
+\subsection{Setting}
+Second   paragraph.
+\section{Acknowledgements}
+Thanks.
+\section{Method} Inline start.
+\bibliography{refs}
+\end{document}
+"""
+
+
+def test_sections_are_streamed_in_order():
+    sections = list(LatexTokenizer(TEX.splitlines(keepends=True)).sections())
+
+    assert [title for title, _ in sections] == ["Introduction", "Acknowledgements", "Method"]
+    assert sections[0][1] == "We cite prior work here. Costs rose by 5\\% this year. Second paragraph."
+    assert sections[2][1] == "Inline start."
+
+
+def test_parse_with_text_reads_once(tmp_path):
+    paper = tmp_path / "paper.tex"
+    paper.write_text(TEX, encoding="utf-8")
+    parser = PaperParser()
+
+    full_text, sections = parser.parse_with_text(str(paper))
+
+    assert full_text == TEX
+    assert sections == parser.parseTex(str(paper))
+    assert list(sections) == ["Introduction", "Method"]
+
+
+def test_legacy_cleaners_follow_tokenizer_rules():
+    parser = PaperParser()
+
+    assert parser.cleanTex("Costs rose by 5\\% this year. % note\n\\usepackage{x}\n") == \
+        "Costs rose by 5\\% this year. \n\n"
+    assert parser.cleanSectionText("We cite \\cite{a}  it.\n") == "We cite it."
+
+
+def test_fingerprints_track_section_text(tmp_path):
+    parser = PaperParser()
+    before = parser.fingerprint_sections({"Intro": {"text": "a"}, "Method": {"text": "b"}})
+    after = parser.fingerprint_sections({"Intro": {"text": "a"}, "Method": {"text": "c"}})
+
+    assert before["Intro"] == after["Intro"]
+    assert before["Method"] != after["Method"]
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_inputs_are_resolved_relative_to_main_file(tmp_path):
+    main = write(tmp_path / "main.tex", "\\input{macros}\n\\section{Intro}\nIntro text.\n\\include{chapters/method}\n")
+    write(tmp_path / "macros.tex", "\\newcommand{\\R}{\\mathbb{R}} % macros\n")
+    write(tmp_path / "chapters" / "method.tex", "\\section{Method}\nSee \\input{chapters/detail}.\n")
+    write(tmp_path / "chapters" / "detail.tex", "the detail")
+    parser = PaperParser(resolver=IncludeResolver())
+
+    sections = parser.parseTex(main)
+
+    assert sections["Method"]["text"] == "See the detail."
+    assert [os.path.basename(p) for p in parser.dependencies(main)] == [
+        "main.tex", "macros.tex", "method.tex", "detail.tex"
+    ]
+
+
+def test_missing_inputs_are_skipped(tmp_path):
+    main = write(tmp_path / "main.tex", "\\section{Intro}\nA \\input{missing} B\n")
+
+    assert PaperParser(resolver=IncludeResolver()).parseTex(main)["Intro"]["text"] == "A B"
+
+
+def test_circular_inputs_are_rejected(tmp_path):
+    main = write(tmp_path / "a.tex", "\\section{A}\n\\input{b}\n")
+    write(tmp_path / "b.tex", "\\input{a}\n")
+
+    with pytest.raises(ValueError, match="Circular"):
+        PaperParser(resolver=IncludeResolver()).parseTex(main)
+
+
+def test_fragments_are_cached_until_modified(tmp_path):
+    write(tmp_path / "macros.tex", "\\section{Shared}\nold\n")
+    first = write(tmp_path / "first.tex", "\\input{macros}\n")
+    second = write(tmp_path / "second.tex", "\\input{macros}\n")
+    resolver = IncludeResolver()
+    parser = PaperParser(resolver=resolver)
+
+    parser.parseTex(first)
+    parser.parseTex(second)
+    assert resolver.misses == 3
+    assert resolver.hits == 1
+
+    write(tmp_path / "macros.tex", "\\section{Shared}\nnew text\n")
+    assert parser.parseTex(second)["Shared"]["text"] == "new text"
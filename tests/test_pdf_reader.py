@@ -0,0 +1,61 @@
+import pytest
+from src.paper_parser import PaperParser
+from src.pdf_reader import PdfTextExtractor
+
+
+PAGES = [
+    "A Study of Descent\nJane Doe\nAbstract\nWe study descent methods.\n1 Introduction\nGradient de-\nscent is simple.",
+    "2 Apples are counted here, but numbering jumps.\n2 Method\nWe take steps.\n2.1 Step size\nSmall steps.\n"
+    "Acknowledgments\nThanks to everyone.\nReferences\n[1] A paper.",
+]
+
+
+def test_sections_follow_numbered_and_named_headings():
+    sections = dict(PdfTextExtractor(cache_dir=None).sections(PAGES))
+
+    assert list(sections) == ["Abstract", "Introduction", "Method", "Acknowledgements", "References"]
+    assert sections["Introduction"] == "Gradient descent is simple. 2 Apples are counted here, but numbering jumps."
+    assert sections["Method"] == "We take steps. 2.1 Step size Small steps."
+
+
+def test_parser_rejects_unknown_extensions():
+    with pytest.raises(ValueError):
+        PaperParser().parse("paper.docx")
+    assert PaperParser().dependencies("samples/GradientDescentOverview.pdf") == ["samples/GradientDescentOverview.pdf"]
+
+
+def test_extensions_are_case_insensitive(tmp_path):
+    paper = tmp_path / "Paper.TEX"
+    paper.write_text("\\section{Method}\nSteps.\n", encoding="utf-8")
+
+    assert PaperParser().parse(str(paper)) == {"Method": {"text": "Steps."}}
+
+
+def test_parse_with_text_extracts_pdf_pages_once():
+    class CountingExtractor(PdfTextExtractor):
+        calls = 0
+
+        def pages(self, path):
+            CountingExtractor.calls += 1
+            return PAGES
+
+    parser = PaperParser(pdf_extractor=CountingExtractor(cache_dir=None))
+    full_text, sections = parser.parse_with_text("paper.PDF")
+
+    assert CountingExtractor.calls == 1
+    assert full_text.startswith("A Study of Descent")
+    assert list(sections) == ["Abstract", "Introduction", "Method", "References"]
+
+
+def test_pdf_text_is_cached_by_content_hash(tmp_path):
+    pytest.importorskip("pypdf")
+    extractor = PdfTextExtractor(max_workers=2, pages_per_task=4, cache_dir=str(tmp_path))
+    parser = PaperParser(pdf_extractor=extractor)
+
+    first = parser.parse("samples/SimpleStochasticGradientDescentAlgo.pdf")
+    second = parser.parse("samples/SimpleStochasticGradientDescentAlgo.pdf")
+
+    assert first == second
+    assert (extractor.misses, extractor.hits) == (1, 1)
+    assert "Introduction" in first and "Acknowledgements" not in first
+    assert "pairwise learning" in first["Abstract"]["text"].lower()
@@ -0,0 +1,55 @@
+import asyncio
+import os
+import pytest
+import src.llm_client as llm_client
+from src.llm_client import CassetteBackend, CassetteMissError, FakeBackend, LLMClient, LLMRequest
+from benchmarks.bench_pipeline import compare, make_backend, run
+
+
+def test_recorded_cassettes_replay_without_backend(tmp_path):
+    recorder = CassetteBackend(str(tmp_path), mode="record", backend=FakeBackend(lambda r: "recorded"))
+    request = LLMRequest("system", "user")
+
+    assert recorder.generate(request) == "recorded"
+    assert os.path.exists(recorder.path(request))
+
+    replay = CassetteBackend(str(tmp_path))
+    assert replay.generate(request) == "recorded"
+    assert asyncio.run(replay.agenerate(request)) == "recorded"
+    assert replay.hits == 2
+
+    with pytest.raises(CassetteMissError):
+        replay.generate(LLMRequest("system", "other"))
+
+
+def test_auto_mode_records_only_misses(tmp_path):
+    backend = FakeBackend(lambda r: r.user_prompt.upper())
+    cassettes = CassetteBackend(str(tmp_path), mode="auto", backend=backend)
+
+    for _ in range(3):
+        assert cassettes.generate(LLMRequest("system", "ping")) == "PING"
+
+    assert len(backend.requests) == 1
+    assert cassettes.recorded == 1
+
+
+def test_client_from_env_uses_cassettes(monkeypatch, tmp_path):
+    monkeypatch.setenv("PAPER2PROD_CASSETTES", str(tmp_path))
+    monkeypatch.setenv("PAPER2PROD_CACHE", "0")
+
+    client = LLMClient.from_env()
+
+    assert isinstance(client.backend, CassetteBackend)
+    assert client.backend.mode == "replay"
+
+
+def test_benchmark_runs_offline(tmp_path):
+    backend = make_backend(str(tmp_path), "replay", replay_latency=False)
+    results = run(["samples/lec21.tex"], backend, repeat=1)
+
+    paper = results["papers"]["lec21"]
+    assert paper["parse"]["sections"] > 0
+    assert paper["memory"]["peak_bytes"] > 0
+    assert paper["pipeline"]["prompts"]["extract"]["tokens"] > 0
+    assert llm_client._default_client is None
+    assert len(compare(results, results)) > 1
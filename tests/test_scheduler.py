@@ -0,0 +1,62 @@
+import threading
+import time
+import pytest
+from src.scheduler import StageGraph
+
+
+def test_independent_stages_overlap():
+    barrier = threading.Barrier(2, timeout=2)
+
+    def branch(value):
+        barrier.wait()
+        return value + 1
+
+    graph = StageGraph(max_workers=2)
+    graph.add("source", lambda: 1)
+    graph.add("left", branch, deps=["source"])
+    graph.add("right", branch, deps=["source"])
+    graph.add("join", lambda left, right: left + right, deps=["left", "right"])
+
+    assert graph.run()["join"] == 4
+
+
+def test_failure_skips_dependents_and_reraises():
+    def broken():
+        raise KeyError("missing")
+
+    graph = StageGraph()
+    graph.add("broken", broken)
+    graph.add("after", lambda value: pytest.fail("dependent should not run"), deps=["broken"])
+    graph.add("last", lambda value: value, deps=["after"])
+    graph.add("independent", lambda: "done")
+
+    with pytest.raises(KeyError):
+        graph.run()
+
+    assert graph.results["after"].status == "skipped"
+    assert graph.results["last"].status == "skipped"
+    assert graph.results["independent"].value == "done"
+
+
+def test_unknown_and_duplicate_stages_are_rejected():
+    graph = StageGraph()
+    graph.add("a", lambda: None)
+
+    with pytest.raises(ValueError):
+        graph.add("a", lambda: None)
+    with pytest.raises(ValueError):
+        graph.add("b", lambda value: None, deps=["missing"])
+
+
+def test_critical_path_follows_slowest_chain():
+    graph = StageGraph(max_workers=2)
+    graph.add("parse", lambda: None)
+    graph.add("slow", lambda _: time.sleep(0.05), deps=["parse"])
+    graph.add("fast", lambda _: None, deps=["parse"])
+    graph.add("join", lambda a, b: None, deps=["fast", "slow"])
+    graph.run()
+
+    critical = graph.critical_path()
+    assert critical["path"] == ["parse", "slow", "join"]
+    assert critical["seconds"] >= 0.05
+    assert set(graph.timings()) == {"parse", "slow", "fast", "join"}
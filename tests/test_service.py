@@ -0,0 +1,123 @@
+import json
+import threading
+import urllib.request
+import pytest
+import src.llm_client as llm_client
+from src.llm_client import FakeBackend, LLMClient
+from src.service import Job, JobStore, PaperService, make_server
+from src.telemetry import Telemetry, span
+
+
+class StubPipeline:
+    runs = []
+
+    def run(self, fileName: str, resume: bool = False, listener=None):
+        StubPipeline.runs.append((fileName, resume))
+        with Telemetry(listener=listener).activate():
+            with span("parse"):
+                pass
+            if "broken" in fileName:
+                raise RuntimeError("No valid problem found in paper")
+        return fileName[:-len(".tex")] + "_out"
+
+
+@pytest.fixture(autouse=True)
+def client():
+    StubPipeline.runs = []
+    llm_client.set_client(LLMClient(backend=FakeBackend()))
+    yield
+    llm_client.set_client(None)
+
+
+def wait_for(service, job):
+    events = service.events(job.id)
+    while events[-1]["type"] != "finished":
+        events += service.events(job.id, since=len(events), timeout=5)
+    return events
+
+
+def test_jobs_run_on_workers_and_persist(tmp_path):
+    papers = [tmp_path / "a.tex", tmp_path / "broken.tex"]
+    for paper in papers:
+        paper.write_text("\\section{Intro} text", encoding="utf-8")
+    service = PaperService(workers=2, jobs_dir=str(tmp_path / "jobs"), pipeline_factory=StubPipeline).start()
+
+    try:
+        jobs = [service.submit(str(paper)) for paper in papers]
+        events = [wait_for(service, job) for job in jobs]
+    finally:
+        service.stop()
+
+    assert [job.status for job in jobs] == ["succeeded", "failed"]
+    assert "No valid problem" in jobs[1].error
+    assert [e["type"] for e in events[0]] == ["queued", "started", "stage", "stage", "finished"]
+    assert events[0][3]["name"] == "parse" and events[0][3]["status"] == "ok"
+
+    stored = {job.id: job for job in JobStore(str(tmp_path / "jobs")).load()}
+    assert stored[jobs[0].id].output_dir.endswith("a_out")
+    assert JobStore(str(tmp_path / "jobs")).events(jobs[1].id)[-1]["status"] == "failed"
+
+    with pytest.raises(ValueError):
+        service.submit(str(tmp_path / "notes.txt"))
+
+
+def test_unfinished_jobs_resume_after_restart(tmp_path):
+    paper = tmp_path / "a.tex"
+    paper.write_text("\\section{Intro} text", encoding="utf-8")
+    store = JobStore(str(tmp_path / "jobs"))
+    store.save(Job("interrupted", str(paper), status="running", created_at=1.0, attempts=1))
+    store.save(Job("done", str(paper), status="succeeded", created_at=2.0))
+
+    service = PaperService(jobs_dir=str(tmp_path / "jobs"), pipeline_factory=StubPipeline).start()
+    try:
+        events = wait_for(service, service.get("interrupted"))
+    finally:
+        service.stop()
+
+    assert StubPipeline.runs == [(str(paper), True)]
+    assert events[0]["type"] == "recovered"
+    assert service.get("interrupted").status == "succeeded"
+    assert service.get("interrupted").attempts == 2
+
+
+def test_http_api_streams_job_events(tmp_path):
+    paper = tmp_path / "a.tex"
+    paper.write_text("\\section{Intro} text", encoding="utf-8")
+    service = PaperService(jobs_dir=str(tmp_path / "jobs"), pipeline_factory=StubPipeline).start()
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    try:
+        request = urllib.request.Request(f"{base}/jobs", data=json.dumps({"paper": str(paper)}).encode(),
+                                         headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=5) as response:
+            assert response.status == 202
+            job = json.load(response)
+
+        with urllib.request.urlopen(f"{base}/jobs/{job['id']}/events", timeout=5) as response:
+            events = [json.loads(line) for line in response]
+        with urllib.request.urlopen(f"{base}/jobs/{job['id']}", timeout=5) as response:
+            final = json.load(response)
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.stop()
+
+    assert events[0]["type"] == "queued" and events[-1]["type"] == "finished"
+    assert final["status"] == "succeeded"
+
+
+def test_socket_path_only_replaces_stale_sockets(tmp_path):
+    service = PaperService(jobs_dir=str(tmp_path / "jobs"), pipeline_factory=StubPipeline)
+    notes = tmp_path / "notes.txt"
+    notes.write_text("keep me", encoding="utf-8")
+
+    with pytest.raises(FileExistsError):
+        make_server(service, socket_path=str(notes))
+    assert notes.read_text(encoding="utf-8") == "keep me"
+
+    socket_path = str(tmp_path / "service.sock")
+    make_server(service, socket_path=socket_path).server_close()
+    server = make_server(service, socket_path=socket_path)
+    server.server_close()
@@ -0,0 +1,64 @@
+import copy
+import json
+import src.llm_client as llm_client
+from src.artifact_writer import MANIFEST_NAME
+from src.llm_client import FakeBackend, LLMClient
+from src.pipeline import PaperToProdPipeline
+from src.spec_index import SpecIndex, spec_signature
+from tests.replay_fixtures import CODE_PLAN, PROBLEM_SPEC, pipeline_responder
+
+
+def test_near_duplicate_specs_share_a_plan(tmp_path):
+    index = SpecIndex(str(tmp_path))
+    index.add("paper_a", PROBLEM_SPEC, "python", CODE_PLAN, str(tmp_path / "a"))
+
+    variant = copy.deepcopy(PROBLEM_SPEC)
+    variant["problem_name"] = "Root-finding problem"
+    assert spec_signature(variant) == spec_signature(PROBLEM_SPEC)
+
+    constrained = copy.deepcopy(variant)
+    constrained["assumptions"] = ["f is smooth"]
+    assert spec_signature(constrained) != spec_signature(PROBLEM_SPEC)
+    assert not index.find(constrained, "python")["exact"]
+
+    variant["outputs"].append({"name": "iterations", "type": "scalar"})
+    match = SpecIndex(str(tmp_path)).find(variant, "python")
+    assert match["paper"] == "paper_a"
+    assert not match["exact"] and match["score"] >= 0.75
+
+    assert index.find(variant, "julia") is None
+    assert index.find(PROBLEM_SPEC, "python", exclude="paper_a") is None
+
+    unrelated = {"problem_name": "Image segmentation", "problem_type": "learning",
+                 "inputs": [{"name": "image", "type": "matrix"}], "outputs": [{"name": "mask", "type": "matrix"}]}
+    assert index.find(unrelated, "python") is None
+
+
+def test_second_paper_reuses_plan_and_modules(tmp_path):
+    backend = FakeBackend(responder=pipeline_responder)
+    llm_client.set_client(LLMClient(backend=backend))
+    pipeline = PaperToProdPipeline(
+        output_root=str(tmp_path / "codes"),
+        runs_dir=str(tmp_path / "runs"),
+        lineage_dir=str(tmp_path / "lineage"),
+        index_dir=str(tmp_path / "index"),
+    )
+
+    try:
+        for name in ("first", "second"):
+            paper = tmp_path / f"{name}.tex"
+            paper.write_text(f"\\section{{Method}}\nNewton's method, {name} variant.\n", encoding="utf-8")
+            before = len(backend.requests)
+            pipeline.run(str(paper))
+    finally:
+        llm_client.set_client(None)
+
+    prompts = [request.user_prompt for request in backend.requests[before:]]
+    match = pipeline.last_run["index_match"]
+    assert match["paper"] == "first" and match["exact"]
+    assert match["copied_files"] == sorted(file["path"] for file in CODE_PLAN["files"])
+    assert not any("Plan a production-quality implementation" in prompt for prompt in prompts)
+    assert not any("Write production-quality code." in prompt for prompt in prompts)
+    assert (tmp_path / "codes" / "second" / "newton" / "solver.py").exists()
+    with open(tmp_path / "codes" / "second" / MANIFEST_NAME, encoding="utf-8") as f:
+        assert set(match["copied_files"]) <= set(json.load(f)["files"])
@@ -0,0 +1,112 @@
+import json
+import pytest
+from src.llm_client import FakeBackend, LLMBackend, LLMClient, RetryableError
+from src.models.code_plan import CodePlan
+from src.models.problem_spec import ProblemSpec
+from src.structured_output import (
+    StreamingJSONParser,
+    StructuredOutputError,
+    from_dict,
+    json_schema,
+    request_structured,
+)
+from tests.replay_fixtures import CODE_PLAN, PROBLEM_SPEC
+
+
+def test_parser_handles_fences_strings_and_split_escapes():
+    text = '```json\n{"a": "brace } and \\" quote", "b": [1, {"c": "\\\\"}]}\n```\ntrailing {'
+    parser = StreamingJSONParser()
+
+    for char in text:
+        parser.feed(char)
+
+    assert parser.done
+    assert parser.value() == {"a": 'brace } and " quote', "b": [1, {"c": "\\"}]}
+
+
+def test_parser_skips_prose_before_the_json():
+    fenced = StreamingJSONParser("{")
+    for char in 'As in {ref} and see [1]:\n```json\n{"a": ["b"]}\n```':
+        fenced.feed(char)
+    bare = StreamingJSONParser("{")
+    bare.feed('See [1] for details. {"a": [1]}')
+
+    assert fenced.value() == {"a": ["b"]}
+    assert bare.value() == {"a": [1]}
+
+
+def test_response_without_json_is_not_continued():
+    backend = FakeBackend(responder=lambda request: "I could not find a problem in this paper [1].")
+
+    with pytest.raises(StructuredOutputError, match="No JSON"):
+        request_structured("system", "extract", ProblemSpec, client=LLMClient(backend=backend))
+    assert len(backend.requests) == 1
+
+
+def test_parser_reports_truncation_and_partial_value():
+    parser = StreamingJSONParser()
+    parser.feed('{"files": [{"path": "a.py"}, {"path": "b')
+
+    assert not parser.done
+    assert parser.partial() == {"files": [{"path": "a.py"}, {"path": "b"}]}
+    with pytest.raises(StructuredOutputError):
+        parser.value()
+
+
+def test_schema_coercion_fills_defaults_and_rejects_missing_fields():
+    spec = from_dict(ProblemSpec, {"problem_name": "GD", "inputs": ["learning rate"],
+                                   "solution_quality": {"tolerance": 1e-6}})
+
+    assert spec.inputs[0].name == "learning rate"
+    assert spec.solution_quality.tolerance == "1e-06"
+    assert spec.outputs == []
+
+    with pytest.raises(StructuredOutputError, match=r"files\[0\]\.path"):
+        from_dict(CodePlan, {"files": [{"purpose": "no path"}]})
+
+
+def test_json_schema_lists_nested_fields():
+    schema = json_schema(CodePlan)
+
+    assert schema["properties"]["files"]["items"]["properties"]["path"] == {"type": "string"}
+    assert "entry_point" in schema["required"]
+
+
+def test_truncated_response_requests_only_a_continuation():
+    full = json.dumps(PROBLEM_SPEC)
+
+    def responder(request):
+        return full[len(request.continuation):] if request.continuation else full[:60]
+
+    backend = FakeBackend(responder=responder, chunk_size=7)
+    spec = request_structured("system", "extract", ProblemSpec, client=LLMClient(backend=backend))
+
+    assert spec.problem_name == PROBLEM_SPEC["problem_name"]
+    assert len(backend.requests) == 2
+    assert backend.requests[0].response_schema is not None
+    assert backend.requests[1].continuation == full[:60]
+
+
+def test_interrupted_stream_is_continued():
+    full = json.dumps(CODE_PLAN)
+
+    class FlakyBackend(LLMBackend):
+        def __init__(self):
+            self.requests = []
+
+        def generate(self, request):
+            raise NotImplementedError
+
+        def stream(self, request):
+            self.requests.append(request)
+            if request.continuation:
+                yield full[len(request.continuation):]
+                return
+            yield full[:40]
+            raise RetryableError("connection reset")
+
+    backend = FlakyBackend()
+    plan = request_structured("system", "plan", CodePlan, client=LLMClient(backend=backend))
+
+    assert [f.path for f in plan.files] == [f["path"] for f in CODE_PLAN["files"]]
+    assert len(backend.requests) == 2
@@ -0,0 +1,80 @@
+import json
+import os
+import shutil
+import pytest
+import src.llm_client as llm_client
+from src.context_builder import estimate_tokens
+from src.llm_cache import ResponseCache
+from src.llm_client import FakeBackend, LLMClient, LLMRequest, RetryableError
+from src.pipeline import PaperToProdPipeline
+from src.telemetry import Telemetry, span
+from tests.replay_fixtures import pipeline_responder
+
+
+@pytest.fixture(autouse=True)
+def reset_client():
+    yield
+    llm_client.set_client(None)
+
+
+def test_spans_are_noops_without_active_telemetry():
+    with span("parse") as event:
+        assert event == {}
+
+
+def test_llm_calls_record_retries_sizes_and_cache_hits(monkeypatch, tmp_path):
+    monkeypatch.setattr(llm_client.time, "sleep", lambda seconds: None)
+    client = LLMClient(
+        backend=FakeBackend(responder=lambda request: "pong", errors=[RetryableError("busy")]),
+        cache=ResponseCache(cache_dir=str(tmp_path)),
+    )
+    request = LLMRequest("system", "ping" * 10)
+
+    telemetry = Telemetry()
+    with telemetry.activate():
+        client.call(request)
+        client.call(request)
+
+    first, second = telemetry.events
+    assert first["retries"] == 1 and not first["cached"]
+    assert first["prompt_chars"] == 46
+    assert first["response_chars"] == 4
+    assert first["prompt_tokens"] == estimate_tokens("system") + estimate_tokens("ping" * 10)
+    assert first["response_tokens"] == estimate_tokens("pong")
+    assert second["cached"]
+
+    totals = telemetry.totals()
+    assert totals["llm_calls"] == 2
+    assert totals["cache_hits"] == 1
+
+
+def test_pipeline_writes_report_and_trace(tmp_path):
+    paper = tmp_path / "lec21.tex"
+    shutil.copy(os.path.join("samples", "lec21.tex"), paper)
+    llm_client.set_client(LLMClient(backend=FakeBackend(responder=pipeline_responder)))
+
+    pipeline = PaperToProdPipeline(
+        output_root=str(tmp_path / "codes"),
+        runs_dir=str(tmp_path / "runs"),
+        lineage_dir=str(tmp_path / "lineage"),
+        index_dir=str(tmp_path / "index"),
+        trace=True,
+    )
+    pipeline.run(str(paper))
+    report = pipeline.last_run
+
+    with open(report["telemetry_path"], encoding="utf-8") as f:
+        events = [json.loads(line) for line in f]
+    files = [e for e in events if e["cat"] == "file"]
+    calls = [e for e in events if e["cat"] == "llm"]
+
+    assert {e["name"] for e in events if e["cat"] == "stage"} >= {"parse", "extract", "generate"}
+    assert all(e["parent"] == "generate" for e in files)
+    assert {e["parent"] for e in calls} >= {"extract", "plan"}
+    assert report["telemetry"]["llm_calls"] == len(calls)
+    assert report["telemetry"]["bytes_written"] > 0
+    assert "LLM:" in report["summary"]
+
+    with open(report["trace_path"], encoding="utf-8") as f:
+        trace = json.load(f)
+    assert all(event["ph"] == "X" for event in trace["traceEvents"])
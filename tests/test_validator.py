@@ -0,0 +1,131 @@
+import time
+import src.llm_client as llm_client
+from src.llm_client import FakeBackend, LLMClient
+from src.pipeline import PaperToProdPipeline
+from src.validator import Validator
+from tests.replay_fixtures import pipeline_responder
+
+
+def write(root, path, text):
+    target = root / path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(text, encoding="utf-8")
+
+
+def test_results_are_reported_per_file(tmp_path):
+    write(tmp_path, "__init__.py", "")
+    write(tmp_path, "solver/core.py", "def double(x):\n    return 2 * x\n")
+    write(tmp_path, "solver/broken.py", "raise ImportError('numpy is missing')\n")
+    write(tmp_path, "solver/typo.py", "def f(:\n")
+    write(tmp_path, "tests/test_core.py",
+          "from solver.core import double\n\n\ndef test_double():\n    assert double(2) == 4\n")
+    write(tmp_path, "tests/test_wrong.py",
+          "from solver.core import double\n\n\ndef test_double():\n    assert double(2) == 5\n")
+
+    report = Validator().validate(str(tmp_path))
+    statuses = {result.path: result.status for result in report.results}
+
+    assert statuses == {
+        "__init__.py": "skipped",
+        "solver/broken.py": "failed",
+        "solver/core.py": "passed",
+        "solver/typo.py": "error",
+        "tests/test_core.py": "passed",
+        "tests/test_wrong.py": "failed",
+    }
+    assert not report.ok
+    assert "numpy is missing" in next(r.error for r in report.results if r.path == "solver/broken.py")
+    assert report.to_dict()["results"][0]["path"] == "__init__.py"
+
+
+def test_runaway_code_is_killed(tmp_path):
+    write(tmp_path, "loop.py", "while True:\n    pass\n")
+    write(tmp_path, "fine.py", "VALUE = 1\n")
+
+    start = time.perf_counter()
+    report = Validator(timeout=1.0).validate(str(tmp_path))
+
+    assert time.perf_counter() - start < 10
+    assert [r.status for r in report.results] == ["passed", "timeout"]
+
+
+def test_src_layout_is_importable(tmp_path):
+    write(tmp_path, "src/pkg/__init__.py", "from .impl import VALUE\n")
+    write(tmp_path, "src/pkg/impl.py", "VALUE = 3\n")
+    write(tmp_path, "tests/test_pkg.py", "from pkg import VALUE\n\n\ndef test_value():\n    assert VALUE == 3\n")
+
+    assert Validator().validate(str(tmp_path)).ok
+
+
+def test_tests_fall_back_to_unittest_without_pytest(tmp_path):
+    write(tmp_path, "pytest.py", "raise ImportError('pytest is not installed')\n")
+    write(tmp_path, "tests/test_case.py",
+          "import unittest\n\n\nclass Case(unittest.TestCase):\n    def test_ok(self):\n        self.assertTrue(True)\n")
+    write(tmp_path, "tests/test_plain.py", "def test_plain():\n    assert True\n")
+
+    report = Validator().validate(str(tmp_path), ["tests/test_case.py", "tests/test_plain.py"])
+    results = {result.path: result for result in report.results}
+
+    assert results["tests/test_case.py"].status == "passed"
+    assert results["tests/test_plain.py"].status == "skipped"
+    assert "pytest is not installed" in results["tests/test_plain.py"].error
+
+
+def test_pipeline_repairs_only_broken_files(tmp_path):
+    def responder(request):
+        if "newton/solver.py" in request.user_prompt and "VALIDATION ERROR" not in request.user_prompt:
+            return "def newtons_method(:\n"
+        return pipeline_responder(request)
+
+    backend = FakeBackend(responder=responder)
+    llm_client.set_client(LLMClient(backend=backend))
+    paper = tmp_path / "newton.tex"
+    paper.write_text("\\section{Method}\nNewton's method for minimization.\n", encoding="utf-8")
+    pipeline = PaperToProdPipeline(
+        output_root=str(tmp_path / "codes"),
+        runs_dir=str(tmp_path / "runs"),
+        lineage_dir=str(tmp_path / "lineage"),
+        index_dir=str(tmp_path / "index"),
+    )
+
+    try:
+        pipeline.run(str(paper))
+    finally:
+        llm_client.set_client(None)
+
+    validation = pipeline.last_run["validation"]
+    repairs = [r for r in backend.requests if "VALIDATION ERROR" in r.user_prompt]
+    assert validation["ok"]
+    assert validation["repairs"] == [["newton/solver.py"]]
+    assert len(repairs) == 1
+    assert "SyntaxError" in repairs[0].user_prompt
+
+
+def test_failed_validation_is_retried_on_rerun(tmp_path):
+    def responder(request):
+        if "newton/solver.py" in request.user_prompt:
+            return "def newtons_method(:\n"
+        return pipeline_responder(request)
+
+    backend = FakeBackend(responder=responder)
+    llm_client.set_client(LLMClient(backend=backend))
+    paper = tmp_path / "newton.tex"
+    paper.write_text("\\section{Method}\nNewton's method for minimization.\n", encoding="utf-8")
+    pipeline = PaperToProdPipeline(
+        output_root=str(tmp_path / "codes"),
+        runs_dir=str(tmp_path / "runs"),
+        lineage_dir=str(tmp_path / "lineage"),
+        index_dir=str(tmp_path / "index"),
+        repair_rounds=1,
+    )
+
+    try:
+        pipeline.run(str(paper))
+        pipeline.run(str(paper))
+    finally:
+        llm_client.set_client(None)
+
+    repairs = [r for r in backend.requests if "VALIDATION ERROR" in r.user_prompt]
+    assert not pipeline.last_run["validation"]["ok"]
+    assert "validate" not in pipeline.last_run["reused_stages"]
+    assert len(repairs) == 2